@@ -3,12 +3,10 @@ import sys
 from flask import Flask, jsonify, request
 # from flask_cors import CORS  # Removed - using manual CORS headers
 from dotenv import load_dotenv
-from flasgger import Swagger
 from .config import config
 from .extensions import db, migrate, jwt
-# from .websocket import socketio, init_socketio  # Commented out - websocket module missing
 from .services.database import check_database_connection
-from .services.auth import seed_admin_user
+from .services.startup import StartupProfiler, run_deferred
 from app.config.email_config import EmailConfig
 
 def configure_cors(app):
@@ -60,6 +58,9 @@ def configure_cors(app):
 
 def configure_swagger(app):
     """Configure Swagger UI for API documentation"""
+    # flasgger pulls in jsonschema, yaml and mistune; only import it when docs are served
+    from flasgger import Swagger
+
     swagger_config = {
         "headers": [],
         "specs": [
@@ -126,7 +127,15 @@ def configure_swagger(app):
         ]
     }
 
-    Swagger(app, config=swagger_config, template=swagger_template)
+    # Kept for warm_swagger_spec (flasgger doesn't register itself)
+    app.extensions['swagger'] = Swagger(app, config=swagger_config, template=swagger_template)
+
+def warm_swagger_spec(app):
+    """Build /apispec.json once so the first docs request doesn't pay for it"""
+    swagger = app.extensions.get('swagger')
+    # flasgger rebuilds the spec on every request in debug mode, nothing to cache
+    if swagger is not None and not app.debug:
+        swagger.get_apispecs('apispec')
 
 def register_blueprints(app):
     """Register all blueprints"""
@@ -140,6 +149,8 @@ def register_blueprints(app):
     from .admin.match_routes import admin_match_bp
     from .admin.donation_routes import donation_bp
     from .api.health import health_bp
+    from .api.diagnostics import diagnostics_bp
+    from .api.metrics import metrics_bp
     from .homepage.routes import homepage_bp
     from .ml.routes import ml_bp
     from .staff.routes import staff_bp
@@ -156,14 +167,19 @@ def register_blueprints(app):
     app.register_blueprint(admin_match_bp)
     app.register_blueprint(donation_bp)  # The donation blueprint has its own url_prefix
     app.register_blueprint(health_bp)
+    app.register_blueprint(diagnostics_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(homepage_bp)
     app.register_blueprint(seeker_bp)
 
     app.register_blueprint(ml_bp)
     app.register_blueprint(staff_bp, url_prefix='/api/staff')
 
+# Models the matching endpoints need on their first request
+PRELOAD_MODELS = ('donor_seeker_match', 'donor_availability')
+
 def initialize_ml_models(app):
-    """Initialize ML model client"""
+    """Initialize ML model client (reads model_map.json, loads no models)"""
     with app.app_context():
         try:
             from pathlib import Path
@@ -176,18 +192,29 @@ def initialize_ml_models(app):
 
             # Initialize model client
             model_client.initialize(str(artifacts_dir), str(model_map_path))
-
-            # Optionally preload critical models
-            try:
-                model_client.load_model('donor_seeker_match')
-                model_client.load_model('donor_availability')
-                print("[ML] Critical models preloaded successfully")
-            except Exception as e:
-                print(f"[ML] Warning: Could not preload models: {e}")
+            return True
 
         except Exception as e:
             print(f"[ML] Model initialization error: {e}")
             print("[ML] ML features will be unavailable")
+            return False
+
+def warm_email_templates(app):
+    """Compile the email templates before the first send"""
+    from .services.email_renderer import email_renderer
+    count = email_renderer.warm()
+    app.logger.info(f"[EMAIL] Compiled {count} email templates")
+
+def preload_ml_models(app):
+    """Load the critical models into the ModelClient cache (needs an app context)"""
+    from app.ml.model_client import model_client
+
+    try:
+        for model_key in PRELOAD_MODELS:
+            model_client.load_model(model_key)
+        print("[ML] Critical models preloaded successfully")
+    except Exception as e:
+        print(f"[ML] Warning: Could not preload models: {e}")
 
 def initialize_database(app):
     # Initialize database
@@ -241,18 +268,84 @@ def list_routes():
         print("-"*50 + "\n")
         _routes_listed = True
 
-def create_app(config_name='default'):
-    """Application factory pattern"""
+def create_app(config_name='default', background_init=None):
+    """
+    Application factory pattern
+
+    Args:
+        config_name: Key into app.config.config
+        background_init: Preload models / warm the Swagger spec on a thread
+            (None = STARTUP_BACKGROUND_INIT). Celery workers pass False so
+            prefork children inherit loaded models instead of a half-done thread.
+    """
     # Load environment variables from .env file
     load_dotenv()
 
     app = Flask(__name__, static_folder=None)
     app.config.from_object(config[config_name])
-
-    # Initialize extensions
-    db.init_app(app)
-    migrate.init_app(app, db)
-    jwt.init_app(app)
+    profiler = StartupProfiler(app.config.get('STARTUP_PROFILE', False))
+    if background_init is None:
+        background_init = app.config.get('STARTUP_BACKGROUND_INIT', True)
+
+    with profiler.phase('extensions'):
+        # Metrics hooks (before db.init_app so the engine gets the timed pool)
+        from .services.metrics import metrics
+        metrics.init_app(app)
+
+        # Initialize extensions
+        db.init_app(app)
+        migrate.init_app(app, db)
+        jwt.init_app(app)
+
+        # Buffered ML prediction log writer
+        from .services.prediction_log_service import prediction_log_service
+        prediction_log_service.init_app(app)
+
+        # Pooled SMTP sessions and background email queue
+        from .services.email_delivery import email_delivery
+        email_delivery.init_app(app)
+
+        # Concurrent, rate-limited SMS dispatch
+        from .services.sms_service import sms_service
+        from .services.sms_dispatcher import sms_dispatcher
+        sms_dispatcher.init_app(app, sms_service)
+
+        # Certificate rendering on a background process pool
+        from .services.certificate_jobs import certificate_jobs
+        certificate_jobs.init_app(app)
+
+        # Certificate/profile picture downloads (ETag, Range, X-Accel-Redirect)
+        from .services.file_serving import file_server
+        file_server.init_app(app)
+
+        # Profile picture storage and background thumbnails
+        from .services.profile_pictures import profile_pictures
+        profile_pictures.init_app(app)
+
+        # Socket.IO rooms for live match progress (SSE is served by the requests blueprint)
+        from .websocket import init_socketio
+        init_socketio(app)
+
+        # Notification inbox (its ORM listeners keep unread counters up to date)
+        from .services.notification_inbox import notification_inbox
+        notification_inbox.init_app(app)
+
+        # Register ORM listeners that keep donor_features up to date
+        from .ml import feature_store  # noqa: F401
+
+        # Client address from X-Forwarded-For when behind trusted proxies (rate-limit keys)
+        proxy_count = app.config.get('TRUSTED_PROXY_COUNT', 0)
+        if proxy_count:
+            from werkzeug.middleware.proxy_fix import ProxyFix
+            app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
+
+        # Rate-limit policies and backend (checked before views touch the DB)
+        from .services.rate_limiter import rate_limiter
+        rate_limiter.init_app(app)
+
+        # Per-request / per-task SQL statement counts and N+1 warnings
+        from .services.sql_diagnostics import sql_diagnostics
+        sql_diagnostics.init_app(app)
 
     # Register the route listing function to run once on first request
     @app.before_request
@@ -292,6 +385,13 @@ def create_app(config_name='default'):
             "message": str(e) if app.debug else "You don't have permission to access this resource"
         }), 403
 
+    @app.errorhandler(413)
+    def request_too_large_error(e):
+        return jsonify({
+            "error": "Request Entity Too Large",
+            "message": f"Request body exceeds {app.config.get('MAX_CONTENT_LENGTH')} bytes"
+        }), 413
+
     # Validate email (SMTP) configuration early and warn if missing
     try:
         print("\n" + "="*60)
@@ -304,26 +404,43 @@ def create_app(config_name='default'):
     configure_cors(app)
 
     # Configure Swagger UI
-    configure_swagger(app)
+    if app.config.get('SWAGGER_ENABLED', True):
+        with profiler.phase('swagger'):
+            configure_swagger(app)
 
     # Register blueprints
-    register_blueprints(app)
+    with profiler.phase('blueprints'):
+        register_blueprints(app)
 
     # Check database connection at startup
     with app.app_context():
-        if not check_database_connection():
-            print("Failed to connect to database. Please check your DATABASE_URL and ensure PostgreSQL is running.")
-            sys.exit(1)
+        with profiler.phase('database check'):
+            if not check_database_connection():
+                print("Failed to connect to database. Please check your DATABASE_URL and ensure PostgreSQL is running.")
+                sys.exit(1)
 
         # Initialize database and create tables if they don't exist
-        initialize_database(app)
+        if app.config.get('DB_INIT_ON_STARTUP', True):
+            with profiler.phase('database init'):
+                initialize_database(app)
 
         # Initialize ML models
-        initialize_ml_models(app)
+        with profiler.phase('ml init'):
+            ml_ready = initialize_ml_models(app)
 
     # Register main routes
     @app.route("/")
     def index():
         return {"status":"ok","service":"SmartBlood backend"}
 
-    return app
\ No newline at end of file
+    # Deferred work: runs on a thread unless this process is about to fork
+    if ml_ready and app.config.get('ML_PRELOAD_MODELS', True):
+        with profiler.phase('ml preload'):
+            run_deferred(app, 'ml preload', preload_ml_models, background=background_init)
+    if 'swagger' in app.extensions:
+        run_deferred(app, 'swagger spec', warm_swagger_spec, background=background_init)
+    run_deferred(app, 'email templates', warm_email_templates, background=background_init)
+
+    profiler.report(app)
+
+    return app
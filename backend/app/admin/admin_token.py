@@ -2,18 +2,22 @@
 
 from datetime import datetime, timedelta
 from threading import Lock
-from typing import Dict, Optional
+from typing import Optional
 import logging
 
+from app.services.expiring_store import get_expiring_store
+
 logger = logging.getLogger(__name__)
 
+NAMESPACE = 'admin_refresh'
+
 class AdminTokenStore:
     _instance = None
     _lock = Lock()
 
     def __init__(self):
-        self._tokens: Dict[str, Dict] = {}  # refresh_token -> metadata
-    
+        self._store = get_expiring_store()
+
     @classmethod
     def get_instance(cls):
         if not cls._instance:
@@ -21,63 +25,75 @@ class AdminTokenStore:
                 if not cls._instance:
                     cls._instance = cls()
         return cls._instance
-    
-    def _cleanup(self):
-        """Remove expired tokens."""
-        now = datetime.utcnow()
-        expired = [token for token, meta in self._tokens.items() 
-                  if now > meta['expires_at']]
-        for token in expired:
-            del self._tokens[token]
-    
+
     def create_token(self, user_id: int, expires_in_days: int = 7) -> str:
         """Create a new refresh token."""
         from secrets import token_urlsafe
-        
-        self._cleanup()
+
         token = token_urlsafe(32)
-        self._tokens[token] = {
+        expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
+        self._store.put(NAMESPACE, token, {
             'user_id': user_id,
             'created_at': datetime.utcnow(),
-            'expires_at': datetime.utcnow() + timedelta(days=expires_in_days),
+            'expires_at': expires_at,
             'revoked': False
-        }
+        }, expires_at, indexes=[f"user:{user_id}"])
         return token
-    
+
     def validate_token(self, token: str) -> Optional[int]:
         """Validate a token and return user_id if valid."""
-        self._cleanup()
-        meta = self._tokens.get(token)
+        meta = self._store.get(NAMESPACE, token)
         if not meta or meta['revoked']:
             return None
-        if datetime.utcnow() > meta['expires_at']:
-            del self._tokens[token]
-            return None
         return meta['user_id']
-    
+
     def revoke_token(self, token: str) -> bool:
         """Revoke a specific token."""
-        if token in self._tokens:
-            self._tokens[token]['revoked'] = True
-            return True
-        return False
-    
+        def revoke(meta):
+            meta['revoked'] = True
+            return meta['user_id']
+
+        user_id = self._store.update(NAMESPACE, token, revoke)
+        if user_id is None:
+            return False
+        self._store.publish('tokens_revoked', {'user_id': user_id})
+        return True
+
     def revoke_all_user_tokens(self, user_id: int):
         """Revoke all tokens for a user."""
-        for meta in self._tokens.values():
-            if meta['user_id'] == user_id:
-                meta['revoked'] = True
-    
+        def revoke(meta):
+            meta['revoked'] = True
+
+        for token in self._store.keys_for(NAMESPACE, f"user:{user_id}"):
+            self._store.update(NAMESPACE, token, revoke)
+        self._store.publish('tokens_revoked', {'user_id': user_id})
+
+    def block_user(self, user_id: int):
+        """Revoke the admin's refresh tokens and block their access tokens."""
+        from app.auth.token_store import TokenStore
+
+        self.revoke_all_user_tokens(user_id)
+        TokenStore.get_instance().block_user(user_id)
+
+    def unblock_user(self, user_id: int) -> bool:
+        """Lift a live access-token block (the admin is active again in the DB)."""
+        from app.auth.token_store import TokenStore
+
+        token_store = TokenStore.get_instance()
+        if not token_store.has_block(user_id):
+            return False
+        token_store.unblock_user(user_id)
+        return True
+
     def get_user_tokens(self, user_id: int) -> list:
         """Get all tokens for a user."""
-        self._cleanup()
+        keys = self._store.keys_for(NAMESPACE, f"user:{user_id}")
         user_tokens = []
-        for token, meta in self._tokens.items():
-            if meta['user_id'] == user_id:
-                user_tokens.append({
-                    'token': token,
-                    'created_at': meta['created_at'],
-                    'expires_at': meta['expires_at'],
-                    'revoked': meta['revoked']
-                })
-        return sorted(user_tokens, key=lambda x: x['created_at'], reverse=True)
\ No newline at end of file
+        for token, meta in self._store.get_many(NAMESPACE, keys).items():
+            user_tokens.append({
+                'token': token,
+                'created_at': meta['created_at'],
+                'expires_at': meta['expires_at'],
+                'revoked': meta['revoked']
+            })
+        return sorted(user_tokens, key=lambda x: x['created_at'], reverse=True)
@@ -13,12 +13,15 @@ from app.extensions import db
 from app.services.auth import verify_password, hash_password
 from app.services.email_service import email_service
 from app.config.email_config import EmailConfig
+from app.services.rate_limiter import rate_limiter, json_field
 from datetime import timedelta, datetime
 import secrets
 
 admin_auth_bp = Blueprint("admin_auth", __name__, url_prefix="/api/admin/auth")
 
 @admin_auth_bp.route("/forgot-password", methods=["POST"])
+@rate_limiter.limit("password_reset")
+@rate_limiter.limit("otp_identity", key=json_field("email"))
 def admin_forgot_password():
     """Send admin password reset email with time-limited link"""
     import logging
@@ -71,6 +74,7 @@ def admin_forgot_password():
 
 
 @admin_auth_bp.route("/reset-password", methods=["POST"])
+@rate_limiter.limit("password_reset")
 def admin_reset_password():
     """Reset admin password using token"""
     import logging
@@ -136,6 +140,8 @@ def admin_login_options():
     return response
 
 @admin_auth_bp.route("/login", methods=["POST"])
+@rate_limiter.limit("login")
+@rate_limiter.limit("login_identity", key=json_field("email"))
 def admin_login():
     """
     Admin Login
@@ -250,6 +256,9 @@ def admin_login():
         elif admin_user.status != "active":
             return jsonify({"error": "Account is deactivated"}), 401
         
+        # Active again after an earlier blocked login: clear that block if still live
+        AdminTokenStore.get_instance().unblock_user(admin_user.id)
+        
         # Create JWT access token using configured expiry
         access_minutes = int(current_app.config.get("ACCESS_EXPIRES_MINUTES", 60))
         access_token = create_access_token(
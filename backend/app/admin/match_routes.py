@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.extensions import db
 from app.models import Request, Donor, Match, Hospital, User
+from app.services.notification_inbox import notification_inbox
 from datetime import datetime
 from sqlalchemy import and_, or_, desc, func
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -232,7 +233,7 @@ def generate_matches():
         )[:top_n]
 
         # Create match records
-        created = 0
+        created = []
         for rank, (donor, score) in enumerate(sorted_candidates, start=1):
             match = Match(
                 request_id=req.id,
@@ -242,14 +243,20 @@ def generate_matches():
                 notified_at=datetime.utcnow()
             )
             db.session.add(match)
-            created += 1
+            created.append((donor, match))
+        db.session.flush()  # match ids for the inbox entries
 
+        hospital = Hospital.query.get(req.hospital_id) if req.hospital_id else None
+        for donor, match in created:
+            notification_inbox.add_match_notification(
+                donor.user_id, match, req, hospital.name if hospital else None
+            )
         db.session.commit()
 
         return jsonify({
-            "matched": created,
+            "matched": len(created),
             "request_id": req_id,
-            "message": f"Successfully generated {created} matches"
+            "message": f"Successfully generated {len(created)} matches"
         }), 201
 
     except Exception as e:
@@ -2952,6 +2952,12 @@ def assign_donor_to_request(request_id):
         donor_user = User.query.get(donor.user_id)
         hospital = Hospital.query.get(request_obj.hospital_id) if request_obj.hospital_id else None
         
+        # Inbox entry (the donor notification feed only lists notification rows)
+        from app.services.notification_inbox import notification_inbox
+        notification_inbox.add_match_notification(
+            donor.user_id, match, request_obj, hospital.name if hospital else None
+        )
+        
         if donor_user:
             # Send notification to donor
             try:
@@ -2972,33 +2978,18 @@ def assign_donor_to_request(request_id):
                 
                 # Send email notification
                 if donor_user.email and donor_user.is_email_verified:
-                    email_html = f"""
-                    <h2>Urgent Blood Request</h2>
-                    <p>A patient urgently needs <strong>{request_obj.blood_group}</strong> blood.</p>
-                    <ul>
-                        <li>Patient: {request_obj.patient_name}</li>
-                        <li>Blood Group: {request_obj.blood_group}</li>
-                        <li>Units Needed: {request_obj.units_required}</li>
-                        <li>Urgency: {request_obj.urgency.upper()}</li>
-                        <li>Hospital: {hospital.name if hospital else 'N/A'}</li>
-                        <li>Required By: {request_obj.required_by.strftime('%Y-%m-%d %H:%M') if request_obj.required_by else 'ASAP'}</li>
-                    </ul>
-                    <p>
-                        <a href="{accept_url}" style="background:#4CAF50;color:white;padding:12px 24px;text-decoration:none;border-radius:4px;display:inline-block;margin-right:10px;">
-                            Accept Request
-                        </a>
-                        <a href="{reject_url}" style="background:#f44336;color:white;padding:12px 24px;text-decoration:none;border-radius:4px;display:inline-block;">
-                            Decline Request
-                        </a>
-                    </p>
-                    <p>Thank you for saving lives!</p>
-                    <p><small>Smart Blood Connect</small></p>
-                    """
-                    
-                    email_service.send_email(
+                    email_service.send_template(
                         to=donor_user.email,
                         subject=f'Urgent: {request_obj.blood_group} Blood Needed for {request_obj.patient_name}',
-                        html=email_html
+                        template='urgent_donor_request',
+                        patient_name=request_obj.patient_name,
+                        blood_group=request_obj.blood_group,
+                        units_required=request_obj.units_required,
+                        urgency=request_obj.urgency,
+                        hospital_name=hospital.name if hospital else None,
+                        required_by=request_obj.required_by.strftime('%Y-%m-%d %H:%M') if request_obj.required_by else 'ASAP',
+                        accept_url=accept_url,
+                        reject_url=reject_url
                     )
                 
                 # Send SMS notification (guarded by feature flag)
@@ -3268,4 +3259,104 @@ def admin_test_sms():
 
     except Exception as e:
         current_app.logger.exception("admin_test_sms failed")
-        return jsonify({"error": "Failed to send test SMS", "details": str(e) if current_app.debug else None}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to send test SMS", "details": str(e) if current_app.debug else None}), 500
+
+@admin_bp.route("/certificates/bulk", methods=["POST"])
+@jwt_required()
+def bulk_generate_certificates():
+    """
+    Admin-only: Generate certificates for every completed donation at a hospital
+    (e.g. a donation camp) and/or in a date range, in parallel.
+    Body: { "hospital_id": 3, "date_from": "2025-01-01", "date_to": "2025-01-31", "regenerate": false }
+    Returns 202 with a job; poll status_url for progress.
+    """
+    try:
+        # Verify admin user
+        current_user_id = get_jwt_identity()
+        admin_user = User.query.filter_by(id=current_user_id, role="admin").first()
+        if not admin_user:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        data = request.get_json() or {}
+        hospital_id = data.get("hospital_id")
+        try:
+            date_from = datetime.fromisoformat(data["date_from"]) if data.get("date_from") else None
+            date_to = datetime.fromisoformat(data["date_to"]) if data.get("date_to") else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "date_from and date_to must be ISO dates (YYYY-MM-DD)"}), 400
+
+        if not hospital_id and not (date_from and date_to):
+            return jsonify({"error": "hospital_id or both date_from and date_to are required"}), 400
+
+        # Donation, donor, user and hospital in one query
+        query = db.session.query(DonationHistory, Donor, User, Hospital)\
+            .join(Donor, Donor.id == DonationHistory.donor_id)\
+            .join(User, User.id == Donor.user_id)\
+            .outerjoin(Hospital, Hospital.id == DonationHistory.hospital_id)\
+            .filter(DonationHistory.status == "completed")
+        if hospital_id:
+            query = query.filter(DonationHistory.hospital_id == hospital_id)
+        if date_from:
+            query = query.filter(DonationHistory.donation_date >= date_from)
+        if date_to:
+            # Date-only bounds include the whole last day
+            if len(data["date_to"]) == 10:
+                date_to = date_to.replace(hour=23, minute=59, second=59)
+            query = query.filter(DonationHistory.donation_date <= date_to)
+        if not data.get("regenerate"):
+            query = query.filter(DonationHistory.certificate_url.is_(None))
+
+        limit = current_app.config.get("CERTIFICATE_BULK_MAX", 2000)
+        rows = query.order_by(DonationHistory.id).limit(limit + 1).all()
+        if len(rows) > limit:
+            return jsonify({"error": f"More than {limit} donations match; narrow the date range"}), 400
+
+        from app.services.certificate_jobs import certificate_jobs
+        from app.services.certificate_service import build_donation_data
+
+        items = [build_donation_data(donation, donor, user, hospital) for donation, donor, user, hospital in rows]
+        job = certificate_jobs.submit(items, requested_by=admin_user.id, kind="bulk")
+
+        return jsonify({
+            "message": f"Generating {job['total']} certificates",
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "total": job["total"],
+            "status_url": f"/api/admin/certificates/jobs/{job['job_id']}"
+        }), 202
+
+    except Exception as e:
+        current_app.logger.exception("bulk_generate_certificates failed")
+        return jsonify({"error": "Failed to start certificate generation", "details": str(e)}), 500
+
+
+@admin_bp.route("/certificates/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def certificate_job_status(job_id):
+    """
+    Admin-only: Progress of a certificate job (failed certificates are listed with their error)
+    """
+    current_user_id = get_jwt_identity()
+    admin_user = User.query.filter_by(id=current_user_id, role="admin").first()
+    if not admin_user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    from app.services.certificate_jobs import certificate_jobs
+    job = certificate_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify({
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "total": job["total"],
+        "done": job["done"],
+        "failed": job["failed"],
+        "errors": [
+            {"donation_id": int(donation_id), "error": c["error"]}
+            for donation_id, c in job["certificates"].items() if c["status"] == "failed"
+        ],
+        "created_at": job["created_at"].isoformat(),
+        "completed_at": job["completed_at"].isoformat() if job["completed_at"] else None
+    }), 200
@@ -0,0 +1,48 @@
+"""
+Diagnostics API endpoints
+"""
+from flask import Blueprint, jsonify, request
+from ..auth.middleware import admin_required
+from ..services.sql_diagnostics import sql_diagnostics
+
+diagnostics_bp = Blueprint('diagnostics', __name__, url_prefix='/api/debug')
+
+
+@diagnostics_bp.route('/sql', methods=['GET'])
+@admin_required()
+def recent_sql():
+    """
+    Recent SQL activity per request and task
+    ---
+    tags:
+      - Health
+    summary: Statement counts, DB time, slowest statements and N+1 suspects
+    security:
+      - Bearer: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        default: 50
+      - name: n_plus_one
+        in: query
+        type: boolean
+        description: Only return entries with repeated statements
+    responses:
+      200:
+        description: Recent summaries, newest first
+      404:
+        description: SQL diagnostics are disabled
+    """
+    if not sql_diagnostics.enabled:
+        return jsonify({"error": "SQL diagnostics are disabled"}), 404
+
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    summaries = sql_diagnostics.recent_summaries(limit)
+    if request.args.get('n_plus_one', '').lower() in ('1', 'true', 'yes'):
+        summaries = [s for s in summaries if s['n_plus_one']]
+
+    return jsonify({
+        "threshold": sql_diagnostics.threshold,
+        "requests": summaries
+    })
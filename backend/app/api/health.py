@@ -1,12 +1,23 @@
 """
 Health check API endpoints
 """
-from flask import Blueprint, jsonify
-from ..services.database import check_database_connection
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from ..services.health import health_service, STATUS_ERROR
 import os
 
 health_bp = Blueprint('health', __name__, url_prefix='/api')
 
+
+def _is_admin() -> bool:
+    """True when the request carries a valid admin access token"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt().get('role') == 'admin'
+    except Exception:
+        return False
+
+
 @health_bp.route('/health')
 def health():
     """
@@ -15,7 +26,7 @@ def health():
     tags:
       - Health
     summary: Check system health and database connectivity
-    description: Returns the current health status of the SmartBlood API including database connectivity
+    description: Readiness check using a pooled database connection (no new engine per probe)
     produces:
       - application/json
     responses:
@@ -33,16 +44,77 @@ def health():
               type: boolean
               example: true
               description: Database connection status
+            db_latency_ms:
+              type: number
+              example: 0.8
             env:
               type: string
               example: development
               description: Current environment (development/production)
     """
-    db_connected = check_database_connection()
+    database = health_service.readiness()['components']['database']
+    db_connected = database['status'] != STATUS_ERROR
     status = "ok" if db_connected else "degraded"
     
     return jsonify({
         "status": status,
         "db_connected": db_connected,
+        "db_latency_ms": database['latency_ms'],
         "env": os.getenv('FLASK_ENV', 'dev')
     })
+
+@health_bp.route('/health/live')
+def liveness():
+    """
+    Liveness probe
+    ---
+    tags:
+      - Health
+    summary: Process is up (no database or network I/O)
+    responses:
+      200:
+        description: Alive
+    """
+    return jsonify(health_service.liveness())
+
+@health_bp.route('/health/ready')
+def readiness():
+    """
+    Readiness probe
+    ---
+    tags:
+      - Health
+    summary: Instance can serve traffic (pooled database connection works)
+    responses:
+      200:
+        description: Ready
+      503:
+        description: Database unavailable
+    """
+    result = health_service.readiness()
+    return jsonify(result), (503 if result['status'] == STATUS_ERROR else 200)
+
+@health_bp.route('/health/deep')
+def deep():
+    """
+    Deep health check
+    ---
+    tags:
+      - Health
+    summary: Database, Redis broker, ML models and SMTP, with per-component latency
+    description: Result is cached for HEALTH_DEEP_CACHE_SECONDS; admins can pass refresh=true to re-run the checks
+    parameters:
+      - name: refresh
+        in: query
+        type: boolean
+        default: false
+    responses:
+      200:
+        description: All components ok, or degraded (non-critical component failing)
+      503:
+        description: A critical component (database) is failing
+    """
+    # Anonymous probes always get the cached result, so they cannot force the checks
+    refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes') and _is_admin()
+    result = health_service.deep(refresh=refresh)
+    return jsonify(result), (503 if result['status'] == STATUS_ERROR else 200)
@@ -0,0 +1,25 @@
+"""
+Metrics API endpoint
+"""
+from flask import Blueprint, Response
+from ..services.metrics import metrics, CONTENT_TYPE
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api')
+
+
+@metrics_bp.route('/metrics')
+def prometheus_metrics():
+    """
+    Prometheus metrics
+    ---
+    tags:
+      - Health
+    summary: Request latency, DB pool, model, task, SMS/email and cache metrics
+    description: Prometheus text exposition format, merged across worker processes when METRICS_MULTIPROC_DIR is set
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Metrics in Prometheus text format
+    """
+    return Response(metrics.render(), mimetype=None, content_type=CONTENT_TYPE)
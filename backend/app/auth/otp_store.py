@@ -1,21 +1,26 @@
-"""In-memory OTP store with cleanup for development purposes."""
+"""OTP store backed by the shared expiring store (memory or Redis)."""
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from threading import Lock
 from typing import Dict
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
 import logging
 
+from app.services.expiring_store import get_expiring_store
+from .utils import otp_hash, verify_otp
+
 logger = logging.getLogger(__name__)
 
+NAMESPACE = 'otp'
+MAX_ATTEMPTS = 3
+
 class OTPStore:
     _instance = None
     _lock = Lock()
 
     def __init__(self):
-        self._otps: Dict[str, Dict] = {}  # key -> metadata
-        self._last_cleanup = datetime.utcnow()
-    
+        self._store = get_expiring_store()
+
     @classmethod
     def get_instance(cls):
         if not cls._instance:
@@ -23,72 +28,52 @@ class OTPStore:
                 if not cls._instance:
                     cls._instance = cls()
         return cls._instance
-    
-    def _cleanup(self):
-        """Remove expired OTPs. Called periodically."""
-        now = datetime.utcnow()
-        if (now - self._last_cleanup) < timedelta(minutes=5):
-            return  # Only cleanup every 5 minutes
-            
-        expired = []
-        for key, meta in self._otps.items():
-            if now > meta['expires_at']:
-                expired.append(key)
-                
-        for key in expired:
-            del self._otps[key]
-            
-        self._last_cleanup = now
-    
+
     def add_otp(self, user_id: int, channel: str, destination: str, otp: str, expires_at: datetime):
         """Add a new OTP session."""
-        self._cleanup()
         key = f"{user_id}:{channel}:{destination}"
-        self._otps[key] = {
+        self._store.put(NAMESPACE, key, {
             'user_id': user_id,
             'channel': channel,
             'destination': destination,
-            'otp_hash': generate_password_hash(otp),
+            'otp_hash': otp_hash(otp, context=key),
             'expires_at': expires_at,
             'attempts': 0,
             'used': False,
             'created_at': datetime.utcnow()
-        }
+        }, expires_at, indexes=[f"{user_id}:{channel}"])
         return key
-    
+
     def verify_otp(self, key: str, otp: str) -> bool:
         """Verify an OTP and mark it as used if correct."""
-        self._cleanup()
-        if key not in self._otps:
-            return False
-            
-        meta = self._otps[key]
-        if meta['used'] or datetime.utcnow() > meta['expires_at']:
-            return False
-            
-        meta['attempts'] += 1
-        if meta['attempts'] > 3:  # Max attempts
-            return False
-            
-        if check_password_hash(meta['otp_hash'], otp):
+        max_attempts = current_app.config.get('OTP_MAX_ATTEMPTS', MAX_ATTEMPTS)
+        secret = current_app.config.get('OTP_SECRET', 'otp-secret')
+
+        def attempt(meta):
+            if meta['used']:
+                return False
+            meta['attempts'] += 1
+            if meta['attempts'] > max_attempts:
+                return False
+            if not verify_otp(otp, meta['otp_hash'], context=key, secret=secret):
+                return False
             meta['used'] = True
             return True
-            
-        return False
-    
+
+        # Counting the attempt, checking the code and consuming it happen in
+        # one atomic update (the HMAC is cheap enough to run under the lock)
+        verified = bool(self._store.update(NAMESPACE, key, attempt))
+        if not verified:
+            logger.info(f"[OTP] Verification failed for {key.split(':', 1)[0]}")
+        return verified
+
     def get_latest_unused(self, user_id: int, channel: str) -> Dict:
         """Get the latest unused OTP session for a user/channel."""
-        self._cleanup()
-        latest = None
-        latest_time = None
-        
-        for key, meta in self._otps.items():
-            if (meta['user_id'] == user_id and 
-                meta['channel'] == channel and 
-                not meta['used'] and 
-                datetime.utcnow() <= meta['expires_at']):
-                if not latest_time or meta['created_at'] > latest_time:
-                    latest = meta
-                    latest_time = meta['created_at']
-        
-        return latest or {}
\ No newline at end of file
+        keys = self._store.keys_for(NAMESPACE, f"{user_id}:{channel}")
+        sessions = [
+            meta for meta in self._store.get_many(NAMESPACE, keys).values()
+            if not meta['used']
+        ]
+        if not sessions:
+            return {}
+        return max(sessions, key=lambda meta: meta['created_at'])
@@ -10,6 +10,7 @@ import logging
 from app.config.email_config import EmailConfig
 from app.services.email_service import email_service
 from app.services.sms_service import sms_service
+from app.services.rate_limiter import rate_limiter, json_field
 
 import re
 from sqlalchemy import func
@@ -18,6 +19,7 @@ auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 logger = logging.getLogger(__name__)
 
 @auth_bp.route("/register", methods=["POST"])
+@rate_limiter.limit("registration")
 def register():
     data = request.get_json() or {}
     phone = data.get("phone")
@@ -86,6 +88,7 @@ def register():
     }), 201
 
 @auth_bp.route("/verify-otp", methods=["POST"])
+@rate_limiter.limit("otp_verify")
 def verify_otp_route():
     data = request.get_json() or {}
     user_id = data.get("user_id")
@@ -111,6 +114,8 @@ def verify_otp_route():
     return jsonify({"access_token": access, "refresh_token": refresh, "user": {"id": user.id, "name": user.first_name}})
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limiter.limit("login")
+@rate_limiter.limit("login_identity", key=json_field("email_or_phone"))
 def login():
     data = request.get_json() or {}
     ident = data.get("email_or_phone")
@@ -175,6 +180,8 @@ def login():
     })
 
 @auth_bp.route("/seeker-login", methods=["POST"])
+@rate_limiter.limit("login")
+@rate_limiter.limit("login_identity", key=json_field("email_or_phone"))
 def seeker_login():
     """Seeker login endpoint - allows login for any user type (donor, staff, admin)"""
     data = request.get_json() or {}
@@ -346,6 +353,8 @@ def refresh():
         return jsonify({"error": "invalid or expired refresh token"}), 401
 
 @auth_bp.route("/forgot-password", methods=["POST"])
+@rate_limiter.limit("password_reset")
+@rate_limiter.limit("otp_identity", key=json_field("email_or_phone"))
 def forgot_password():
     data = request.get_json() or {}
     ident = data.get("email_or_phone")
@@ -378,6 +387,7 @@ def forgot_password():
 
 
 @auth_bp.route("/reset-password", methods=["POST"])
+@rate_limiter.limit("password_reset")
 def reset_password():
     data = request.get_json() or {}
     token = data.get("token")
@@ -455,6 +465,8 @@ def change_password():
 @auth_bp.route("/change-password", methods=["OPTIONS"])
 
 @auth_bp.route("/send-contact-otp", methods=["POST"])
+@rate_limiter.limit("otp_send")
+@rate_limiter.limit("otp_identity", key=json_field("user_id"))
 def send_contact_otp():
     """Send OTP to a user's email or phone for verification.
     Body: { user_id, channel: "email"|"phone", destination? }
@@ -536,6 +548,7 @@ def send_contact_otp():
 
 
 @auth_bp.route("/verify-email-otp", methods=["POST"])
+@rate_limiter.limit("otp_verify")
 def verify_email_otp():
     """Verify latest email OTP for a user and mark email verified."""
     data = request.get_json() or {}
@@ -568,6 +581,7 @@ def change_password_options():
 
 
 @auth_bp.route("/check-availability", methods=["POST"])
+@rate_limiter.limit("availability")
 def check_availability():
     """Check if email or phone already exist. Public endpoint for live validation."""
     data = request.get_json() or {}
@@ -4,19 +4,42 @@ from datetime import datetime, timedelta
 from threading import Lock
 from typing import Dict, Set, Optional
 import logging
+import time
+
+from flask import current_app, has_app_context
+
+from app.services.expiring_store import get_expiring_store, to_timestamp
 
 logger = logging.getLogger(__name__)
 
+NAMESPACE = 'tokens'
+BLOCKED_NAMESPACE = 'blocked_users'
+
 class TokenStore:
+    """
+    Session tokens and blocked users, kept in the shared expiring store
+
+    A block is a record that expires after one access-token lifetime: by then
+    every token issued before the block has expired on its own. Blocked user
+    IDs are also cached in-process (is_user_blocked runs on every
+    authenticated request) and kept current by block/unblock events; revocation
+    events evict locally cached token lookups.
+    """
     _instance = None
     _lock = Lock()
 
+    # Re-read the blocked set even without events (missed pub/sub messages)
+    BLOCKED_RESYNC_SECONDS = 60
+    VALID_CACHE_SECONDS = 5
+    VALID_CACHE_MAX = 10000
+
     def __init__(self):
-        self._tokens: Dict[str, Dict] = {}  # token -> metadata
-        self._user_tokens: Dict[int, Set[str]] = {}  # user_id -> set of tokens
-        self._blocked_users: Set[int] = set()  # blocked user IDs
-        self._last_cleanup = datetime.utcnow()
-        
+        self._store = get_expiring_store()
+        self._blocked_users: Set[int] = set()
+        self._blocked_synced_at = 0.0
+        self._valid_cache: Dict[str, tuple] = {}  # token -> (meta, cached_at)
+        self._store.subscribe(self._on_event)
+
     @classmethod
     def get_instance(cls):
         if not cls._instance:
@@ -24,86 +47,109 @@ class TokenStore:
                 if not cls._instance:
                     cls._instance = cls()
         return cls._instance
-    
-    def _cleanup(self):
-        """Remove expired tokens. Called periodically."""
-        now = datetime.utcnow()
-        if (now - self._last_cleanup) < timedelta(minutes=5):
-            return  # Only cleanup every 5 minutes
-            
-        expired = []
-        for token, meta in self._tokens.items():
-            if now > meta['expires_at']:
-                expired.append(token)
-                
-        for token in expired:
-            self.remove_token(token)
-            
-        self._last_cleanup = now
+
+    def _on_event(self, event: str, payload: Dict):
+        user_id = payload.get('user_id')
+        if user_id is None:
+            return
+        if event == 'user_blocked':
+            self._blocked_users.add(int(user_id))
+        elif event == 'user_unblocked':
+            self._blocked_users.discard(int(user_id))
+        if event in ('user_blocked', 'tokens_revoked'):
+            self._evict_user(int(user_id))
+
+    def _evict_user(self, user_id: int):
+        for token, (meta, _) in list(self._valid_cache.items()):
+            if meta['user_id'] == user_id:
+                self._valid_cache.pop(token, None)
+
+    @staticmethod
+    def _block_expires_at() -> datetime:
+        minutes = int(current_app.config.get("ACCESS_EXPIRES_MINUTES", 60)) if has_app_context() else 60
+        return datetime.utcnow() + timedelta(minutes=minutes)
 
     def block_user(self, user_id: int):
         """Block a user and revoke all their tokens."""
+        self._store.put(BLOCKED_NAMESPACE, str(user_id), {
+            'user_id': user_id,
+            'blocked_at': datetime.utcnow()
+        }, self._block_expires_at(), indexes=['all'])
         self._blocked_users.add(user_id)
         self.revoke_all_user_tokens(user_id)
+        self._store.publish('user_blocked', {'user_id': user_id})
 
     def unblock_user(self, user_id: int):
         """Unblock a user."""
+        self._store.delete(BLOCKED_NAMESPACE, str(user_id))
         self._blocked_users.discard(user_id)
-    
+        self._store.publish('user_unblocked', {'user_id': user_id})
+
+    def has_block(self, user_id: int) -> bool:
+        """Whether the shared store holds a live block (bypasses the local cache)."""
+        return self._store.get(BLOCKED_NAMESPACE, str(user_id)) is not None
+
     def is_user_blocked(self, user_id: int) -> bool:
         """Check if a user is blocked."""
+        now = time.monotonic()
+        if now - self._blocked_synced_at > self.BLOCKED_RESYNC_SECONDS:
+            self._blocked_users = {int(k) for k in self._store.keys_for(BLOCKED_NAMESPACE, 'all')}
+            self._blocked_synced_at = now
         return user_id in self._blocked_users
-        
+
     def add_token(self, token: str, user_id: int, expires_at: datetime):
         """Add a new token."""
         if self.is_user_blocked(user_id):
             return None
-        
-        self._cleanup()
-        self._tokens[token] = {
+
+        self._store.put(NAMESPACE, token, {
             'user_id': user_id,
             'expires_at': expires_at,
             'created_at': datetime.utcnow()
-        }
-        if user_id not in self._user_tokens:
-            self._user_tokens[user_id] = set()
-        self._user_tokens[user_id].add(token)
+        }, expires_at, indexes=[f"user:{user_id}"])
         return token
-    
+
     def remove_token(self, token: str):
         """Remove a token."""
-        if token in self._tokens:
-            user_id = self._tokens[token]['user_id']
-            del self._tokens[token]
-            if user_id in self._user_tokens:
-                self._user_tokens[user_id].discard(token)
-                if not self._user_tokens[user_id]:
-                    del self._user_tokens[user_id]
-    
+        self._valid_cache.pop(token, None)
+        self._store.delete(NAMESPACE, token)
+
+    def _lookup(self, token: str) -> Optional[Dict]:
+        cached = self._valid_cache.get(token)
+        now = time.monotonic()
+        if cached and now - cached[1] < self.VALID_CACHE_SECONDS:
+            meta = cached[0]
+            if time.time() <= to_timestamp(meta['expires_at']):
+                return meta
+        meta = self._store.get(NAMESPACE, token)
+        if meta is None:
+            self._valid_cache.pop(token, None)
+            return None
+        if len(self._valid_cache) >= self.VALID_CACHE_MAX:
+            self._valid_cache.clear()
+        self._valid_cache[token] = (meta, now)
+        return meta
+
     def is_valid(self, token: str) -> bool:
         """Check if a token exists, is not expired, and user is not blocked."""
-        self._cleanup()
-        if token not in self._tokens:
+        token_info = self._lookup(token)
+        if token_info is None:
             return False
-        
-        token_info = self._tokens[token]
-        if datetime.utcnow() > token_info['expires_at']:
-            return False
-            
+
         if self.is_user_blocked(token_info['user_id']):
             return False
-            
+
         return True
-    
+
     def revoke_all_user_tokens(self, user_id: int):
         """Revoke all tokens for a user."""
-        if user_id in self._user_tokens:
-            tokens = list(self._user_tokens[user_id])  # Copy to avoid modification during iteration
-            for token in tokens:
-                self.remove_token(token)
-    
+        for token in self._store.keys_for(NAMESPACE, f"user:{user_id}"):
+            self._store.delete(NAMESPACE, token)
+        self._evict_user(user_id)
+        self._store.publish('tokens_revoked', {'user_id': user_id})
+
     def get_token_info(self, token: str) -> Dict:
         """Get token metadata if valid."""
         if self.is_valid(token):
-            return self._tokens.get(token, {})
-        return {}
\ No newline at end of file
+            return dict(self._lookup(token) or {})
+        return {}
@@ -7,17 +7,24 @@ from passlib.hash import bcrypt
 from werkzeug.security import generate_password_hash, check_password_hash
 
 def generate_otp(length=6):
-    import random
+    import secrets
     start = 10**(length-1)
-    return str(random.randint(start, start*10 - 1))
+    return str(start + secrets.randbelow(start * 9))
 
-def otp_hash(otp: str):
-    # HMAC-based deterministic hash using OTP_SECRET
-    key = current_app.config.get("OTP_SECRET", "otp-secret")
-    return hmac.new(key.encode(), otp.encode(), hashlib.sha256).hexdigest()
+def otp_hash(otp: str, context: str = "", secret: str = None):
+    """Keyed HMAC-SHA256 of an OTP using OTP_SECRET.
 
-def verify_otp(otp: str, hashed: str):
-    return hmac.compare_digest(otp_hash(otp), hashed)
+    OTPs are short-lived and attempt-limited, so a keyed MAC is enough; a slow
+    password KDF only costs CPU. `context` binds the code to one OTP session
+    (the store key) so it can't be replayed against another.
+    """
+    key = secret or current_app.config.get("OTP_SECRET", "otp-secret")
+    message = f"{context}:{otp}" if context else str(otp)
+    return hmac.new(key.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+def verify_otp(otp: str, hashed: str, context: str = "", secret: str = None):
+    """Constant-time check of an OTP against otp_hash output"""
+    return hmac.compare_digest(otp_hash(otp, context, secret), hashed or "")
 
 def hash_password(password: str):
     """Hash password using werkzeug for compatibility with existing system"""
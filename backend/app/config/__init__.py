@@ -45,6 +45,58 @@ def validate_positive_int(value: str) -> int:
         raise ValueError("Value must be positive")
     return result
 
+def validate_non_negative_int(value: str) -> int:
+    """Validate integer values that may be zero"""
+    result = int(value)
+    if result < 0:
+        raise ValueError("Value must not be negative")
+    return result
+
+def validate_positive_float(value: str) -> float:
+    """Validate positive float values"""
+    result = float(value)
+    if result <= 0:
+        raise ValueError("Value must be positive")
+    return result
+
+def validate_bool(value: str) -> bool:
+    """Parse boolean flags such as 1/0, true/false, yes/no"""
+    lowered = value.strip().lower()
+    if lowered in ('1', 'true', 'yes', 'on'):
+        return True
+    if lowered in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError("Value must be a boolean (true/false)")
+
+def validate_sample_rates(value: str) -> Dict[str, float]:
+    """Parse 'endpoint=rate,endpoint=rate' into a dict of sampling rates (0-1)"""
+    rates = {}
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        endpoint, rate = item.rsplit('=', 1)
+        rate = float(rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sampling rate for {endpoint} must be between 0 and 1")
+        rates[endpoint.strip()] = rate
+    return rates
+
+def validate_rate_limits(value: str) -> Dict[str, tuple]:
+    """Parse 'policy=limit/seconds,...' into {policy: (limit, seconds)}"""
+    limits = {}
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, spec = item.split('=', 1)
+        limit, period = spec.split('/', 1)
+        limit, period = int(limit), float(period)
+        if limit <= 0 or period <= 0:
+            raise ValueError(f"Rate limit for {name} must be positive")
+        limits[name.strip()] = (limit, period)
+    return limits
+
 class Config:
     """Application configuration with environment validation"""
     
@@ -90,6 +142,13 @@ class Config:
     # JWT and Authentication configuration
     JWT_SECRET_KEY = EnvVar("JWT_SECRET_KEY", required=True).get_value()
     OTP_SECRET = EnvVar("OTP_SECRET", required=False, default="otp-secret").get_value()
+    # Wrong codes allowed per OTP session before it stops verifying
+    OTP_MAX_ATTEMPTS = EnvVar(
+        "OTP_MAX_ATTEMPTS",
+        required=False,
+        default=3,
+        validator=validate_positive_int
+    ).get_value()
     ACCESS_EXPIRES_MINUTES = EnvVar(
         "ACCESS_EXPIRES_MINUTES", 
         required=False, 
@@ -121,6 +180,389 @@ class Config:
     ADMIN_EMAIL = EnvVar("ADMIN_EMAIL").get_value()
     ADMIN_PASSWORD = EnvVar("ADMIN_PASSWORD").get_value()
 
+    # ML prediction log sink (buffered, written off the request path)
+    PREDICTION_LOG_BATCH_SIZE = EnvVar(
+        "PREDICTION_LOG_BATCH_SIZE",
+        required=False,
+        default=200,
+        validator=validate_positive_int
+    ).get_value()
+    PREDICTION_LOG_FLUSH_SECONDS = EnvVar(
+        "PREDICTION_LOG_FLUSH_SECONDS",
+        required=False,
+        default=2.0,
+        validator=validate_positive_float
+    ).get_value()
+    PREDICTION_LOG_QUEUE_SIZE = EnvVar(
+        "PREDICTION_LOG_QUEUE_SIZE",
+        required=False,
+        default=10000,
+        validator=validate_positive_int
+    ).get_value()
+    # e.g. "/api/donors/dashboard=0.1,/api/donors/analytics=0.5" (unlisted endpoints log everything)
+    PREDICTION_LOG_SAMPLE_RATES = EnvVar(
+        "PREDICTION_LOG_SAMPLE_RATES",
+        required=False,
+        default={},
+        validator=validate_sample_rates
+    ).get_value()
+
+    # Nightly reliability scoring (chunked, see app/ml/batch_scoring.py)
+    RELIABILITY_SCORING_CHUNK_SIZE = EnvVar(
+        "RELIABILITY_SCORING_CHUNK_SIZE",
+        required=False,
+        default=5000,
+        validator=validate_positive_int
+    ).get_value()
+    # Process pool size for scoring chunks (0 = score in the calling process)
+    RELIABILITY_SCORING_WORKERS = EnvVar(
+        "RELIABILITY_SCORING_WORKERS",
+        required=False,
+        default=0,
+        validator=validate_non_negative_int
+    ).get_value()
+
+    # SQL diagnostics (per-request statement counts, Server-Timing, N+1 warnings)
+    SQL_DIAGNOSTICS_ENABLED = EnvVar(
+        "SQL_DIAGNOSTICS_ENABLED",
+        required=False,
+        default=DEBUG,
+        validator=validate_bool
+    ).get_value()
+    # Warn when one normalized statement runs more than this many times per request
+    SQL_N_PLUS_ONE_THRESHOLD = EnvVar(
+        "SQL_N_PLUS_ONE_THRESHOLD",
+        required=False,
+        default=10,
+        validator=validate_positive_int
+    ).get_value()
+
+    # Metrics: directory shared by gunicorn workers for merged /api/metrics (unset = single process)
+    METRICS_MULTIPROC_DIR = EnvVar(
+        "METRICS_MULTIPROC_DIR",
+        required=False,
+        default=os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    ).get_value()
+    METRICS_FLUSH_SECONDS = EnvVar(
+        "METRICS_FLUSH_SECONDS",
+        required=False,
+        default=5.0,
+        validator=validate_positive_float
+    ).get_value()
+
+    # Startup: print per-phase create_app timings (see scripts/profile_startup.py)
+    STARTUP_PROFILE = EnvVar(
+        "STARTUP_PROFILE",
+        required=False,
+        default=False,
+        validator=validate_bool
+    ).get_value()
+    # Preload models / warm the Swagger spec on a thread after create_app returns.
+    # Turn off when the process forks after startup (gunicorn --preload).
+    STARTUP_BACKGROUND_INIT = EnvVar(
+        "STARTUP_BACKGROUND_INIT",
+        required=False,
+        default=True,
+        validator=validate_bool
+    ).get_value()
+    ML_PRELOAD_MODELS = EnvVar(
+        "ML_PRELOAD_MODELS",
+        required=False,
+        default=True,
+        validator=validate_bool
+    ).get_value()
+    SWAGGER_ENABLED = EnvVar(
+        "SWAGGER_ENABLED",
+        required=False,
+        default=True,
+        validator=validate_bool
+    ).get_value()
+    # Create missing tables and seed the admin user in create_app (migrations
+    # own the schema in deployed instances, so they can skip this)
+    DB_INIT_ON_STARTUP = EnvVar(
+        "DB_INIT_ON_STARTUP",
+        required=False,
+        default=True,
+        validator=validate_bool
+    ).get_value()
+
+    # Health checks: deep result cache TTL and per-component network timeout
+    HEALTH_DEEP_CACHE_SECONDS = EnvVar(
+        "HEALTH_DEEP_CACHE_SECONDS",
+        required=False,
+        default=30.0,
+        validator=validate_positive_float
+    ).get_value()
+    HEALTH_CHECK_TIMEOUT_SECONDS = EnvVar(
+        "HEALTH_CHECK_TIMEOUT_SECONDS",
+        required=False,
+        default=2.0,
+        validator=validate_positive_float
+    ).get_value()
+
+    # Email delivery (see app/services/email_delivery.py): "background" queues
+    # messages for worker threads, "sync" sends inline over the same pool
+    EMAIL_DELIVERY_MODE = EnvVar(
+        "EMAIL_DELIVERY_MODE",
+        required=False,
+        default="background"
+    ).get_value()
+    EMAIL_SMTP_POOL_SIZE = EnvVar(
+        "EMAIL_SMTP_POOL_SIZE",
+        required=False,
+        default=2,
+        validator=validate_positive_int
+    ).get_value()
+    EMAIL_QUEUE_SIZE = EnvVar(
+        "EMAIL_QUEUE_SIZE",
+        required=False,
+        default=5000,
+        validator=validate_positive_int
+    ).get_value()
+    EMAIL_BATCH_SIZE = EnvVar(
+        "EMAIL_BATCH_SIZE",
+        required=False,
+        default=20,
+        validator=validate_positive_int
+    ).get_value()
+    EMAIL_MAX_RETRIES = EnvVar(
+        "EMAIL_MAX_RETRIES",
+        required=False,
+        default=4,
+        validator=validate_non_negative_int
+    ).get_value()
+    EMAIL_RETRY_BACKOFF_SECONDS = EnvVar(
+        "EMAIL_RETRY_BACKOFF_SECONDS",
+        required=False,
+        default=2.0,
+        validator=validate_positive_float
+    ).get_value()
+    # Inline sends (sync mode, Celery tasks) block the caller while they back off
+    EMAIL_INLINE_MAX_RETRIES = EnvVar(
+        "EMAIL_INLINE_MAX_RETRIES",
+        required=False,
+        default=2,
+        validator=validate_non_negative_int
+    ).get_value()
+    # Idle sessions are NOOP-checked before reuse; sessions are recycled after N messages
+    EMAIL_SMTP_IDLE_SECONDS = EnvVar(
+        "EMAIL_SMTP_IDLE_SECONDS",
+        required=False,
+        default=30.0,
+        validator=validate_positive_float
+    ).get_value()
+    EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION = EnvVar(
+        "EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION",
+        required=False,
+        default=100,
+        validator=validate_positive_int
+    ).get_value()
+
+    # SMS dispatch (see app/services/sms_dispatcher.py): "twilio" or "fake"
+    SMS_TRANSPORT = EnvVar(
+        "SMS_TRANSPORT",
+        required=False,
+        default="twilio"
+    ).get_value()
+    SMS_FAKE_LATENCY_SECONDS = EnvVar(
+        "SMS_FAKE_LATENCY_SECONDS",
+        required=False,
+        default=0.0
+    ).get_value()
+    SMS_MAX_IN_FLIGHT = EnvVar(
+        "SMS_MAX_IN_FLIGHT",
+        required=False,
+        default=8,
+        validator=validate_positive_int
+    ).get_value()
+    # Provider account limit, shared by all dispatch threads in a process
+    SMS_RATE_PER_SECOND = EnvVar(
+        "SMS_RATE_PER_SECOND",
+        required=False,
+        default=10.0,
+        validator=validate_positive_float
+    ).get_value()
+    # Identical body to the same number within this window is sent once (0 disables)
+    SMS_DEDUP_SECONDS = EnvVar(
+        "SMS_DEDUP_SECONDS",
+        required=False,
+        default=300,
+        validator=validate_non_negative_int
+    ).get_value()
+    SMS_MAX_RETRIES = EnvVar(
+        "SMS_MAX_RETRIES",
+        required=False,
+        default=2,
+        validator=validate_non_negative_int
+    ).get_value()
+    SMS_RETRY_BACKOFF_SECONDS = EnvVar(
+        "SMS_RETRY_BACKOFF_SECONDS",
+        required=False,
+        default=0.5,
+        validator=validate_positive_float
+    ).get_value()
+
+    # Certificate generation (see app/services/certificate_jobs.py): worker
+    # processes, spawned on first use (0 renders on one thread in-process)
+    CERTIFICATE_WORKERS = EnvVar(
+        "CERTIFICATE_WORKERS",
+        required=False,
+        default=2,
+        validator=validate_non_negative_int
+    ).get_value()
+    CERTIFICATE_CHUNK_SIZE = EnvVar(
+        "CERTIFICATE_CHUNK_SIZE",
+        required=False,
+        default=25,
+        validator=validate_positive_int
+    ).get_value()
+    # Most donations one bulk request may cover
+    CERTIFICATE_BULK_MAX = EnvVar(
+        "CERTIFICATE_BULK_MAX",
+        required=False,
+        default=2000,
+        validator=validate_positive_int
+    ).get_value()
+    # Retry-After sent with the 202 for a certificate that is still being rendered
+    CERTIFICATE_RETRY_AFTER_SECONDS = EnvVar(
+        "CERTIFICATE_RETRY_AFTER_SECONDS",
+        required=False,
+        default=2,
+        validator=validate_positive_int
+    ).get_value()
+
+    # Certificate and profile picture downloads (see app/services/file_serving.py):
+    # "" streams from Python, "nginx" sends X-Accel-Redirect, "sendfile" X-Sendfile
+    FILE_SERVE_OFFLOAD = EnvVar(
+        "FILE_SERVE_OFFLOAD",
+        required=False,
+        default=""
+    ).get_value()
+    # nginx internal location holding one sub-path per root (certificates/, profile_pictures/)
+    FILE_SERVE_ACCEL_PREFIX = EnvVar(
+        "FILE_SERVE_ACCEL_PREFIX",
+        required=False,
+        default="/protected-files"
+    ).get_value()
+    CERTIFICATE_CACHE_MAX_AGE = EnvVar(
+        "CERTIFICATE_CACHE_MAX_AGE",
+        required=False,
+        default=86400,
+        validator=validate_non_negative_int
+    ).get_value()
+    PROFILE_PICTURE_CACHE_MAX_AGE = EnvVar(
+        "PROFILE_PICTURE_CACHE_MAX_AGE",
+        required=False,
+        default=86400,
+        validator=validate_non_negative_int
+    ).get_value()
+
+    # Profile picture uploads (see app/services/profile_pictures.py)
+    PROFILE_PICTURE_MAX_BYTES = EnvVar(
+        "PROFILE_PICTURE_MAX_BYTES",
+        required=False,
+        default=5 * 1024 * 1024,
+        validator=validate_positive_int
+    ).get_value()
+    PROFILE_PICTURE_CHUNK_BYTES = EnvVar(
+        "PROFILE_PICTURE_CHUNK_BYTES",
+        required=False,
+        default=64 * 1024,
+        validator=validate_positive_int
+    ).get_value()
+    # "webp" or "jpeg"
+    PROFILE_PICTURE_THUMB_FORMAT = EnvVar(
+        "PROFILE_PICTURE_THUMB_FORMAT",
+        required=False,
+        default="webp"
+    ).get_value()
+    PROFILE_PICTURE_WORKERS = EnvVar(
+        "PROFILE_PICTURE_WORKERS",
+        required=False,
+        default=1,
+        validator=validate_positive_int
+    ).get_value()
+
+    # Live match progress streams (SSE): reconnect after this long, comment
+    # line every keepalive interval so proxies keep the connection open
+    MATCH_EVENTS_STREAM_SECONDS = EnvVar(
+        "MATCH_EVENTS_STREAM_SECONDS",
+        required=False,
+        default=300,
+        validator=validate_positive_int
+    ).get_value()
+    MATCH_EVENTS_KEEPALIVE_SECONDS = EnvVar(
+        "MATCH_EVENTS_KEEPALIVE_SECONDS",
+        required=False,
+        default=15,
+        validator=validate_positive_int
+    ).get_value()
+
+    # Notification inbox: default feed page size, and read notifications older
+    # than NOTIFICATION_ARCHIVE_DAYS move to notifications_archive (daily task)
+    NOTIFICATION_PAGE_SIZE = EnvVar(
+        "NOTIFICATION_PAGE_SIZE",
+        required=False,
+        default=20,
+        validator=validate_positive_int
+    ).get_value()
+    NOTIFICATION_ARCHIVE_DAYS = EnvVar(
+        "NOTIFICATION_ARCHIVE_DAYS",
+        required=False,
+        default=90,
+        validator=validate_positive_int
+    ).get_value()
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = EnvVar(
+        "NOTIFICATION_ARCHIVE_BATCH_SIZE",
+        required=False,
+        default=5000,
+        validator=validate_positive_int
+    ).get_value()
+
+    # Sessions, refresh tokens, OTPs and blocked users: "memory://" (per process)
+    # or a Redis URL so every worker shares them, e.g. redis://localhost:6379/1
+    SESSION_STORE_URL = EnvVar(
+        "SESSION_STORE_URL",
+        required=False,
+        default="memory://"
+    ).get_value()
+
+    # Rate limiting for auth/OTP/public endpoints (see app/services/rate_limiter.py)
+    RATE_LIMIT_ENABLED = EnvVar(
+        "RATE_LIMIT_ENABLED",
+        required=False,
+        default=True,
+        validator=validate_bool
+    ).get_value()
+    # "memory://" (per process) or a Redis URL shared by all workers
+    RATE_LIMIT_STORAGE_URL = EnvVar(
+        "RATE_LIMIT_STORAGE_URL",
+        required=False,
+        default="memory://"
+    ).get_value()
+    RATE_LIMIT_MAX_KEYS = EnvVar(
+        "RATE_LIMIT_MAX_KEYS",
+        required=False,
+        default=100000,
+        validator=validate_positive_int
+    ).get_value()
+    # e.g. "login=20/60,public=300/60"
+    RATE_LIMIT_OVERRIDES = EnvVar(
+        "RATE_LIMIT_OVERRIDES",
+        required=False,
+        default={},
+        validator=validate_rate_limits
+    ).get_value()
+    # Reverse proxies in front of the app (nginx, load balancer) whose
+    # X-Forwarded-For/-Proto hops are trusted; 0 uses the socket address, so
+    # per-IP rate limits only see real clients when this matches the deployment
+    TRUSTED_PROXY_COUNT = EnvVar(
+        "TRUSTED_PROXY_COUNT",
+        required=False,
+        default=0,
+        validator=validate_non_negative_int
+    ).get_value()
+
     @classmethod
     def validate_all(cls) -> None:
         """Validate all configuration values at once"""
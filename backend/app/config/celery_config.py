@@ -47,6 +47,16 @@ class CeleryConfig:
             'task': 'app.tasks.ml_tasks.cleanup_old_predictions',
             'schedule': timedelta(days=7),  # Run weekly
             'options': {'queue': 'default'}
+        },
+        'archive-read-notifications-daily': {
+            'task': 'app.tasks.ml_tasks.archive_read_notifications',
+            'schedule': timedelta(days=1),
+            'options': {'queue': 'default'}
+        },
+        'maintain-partitions-daily': {
+            'task': 'app.tasks.ml_tasks.maintain_partitions',
+            'schedule': timedelta(days=1),
+            'options': {'queue': 'default'}
         }
     }
     
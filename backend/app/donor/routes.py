@@ -1,12 +1,16 @@
-from flask import Blueprint, jsonify, request, current_app, send_file
+from flask import Blueprint, Response, jsonify, request, current_app
 from app.extensions import db
-from app.models import User, Donor, Match, DonationHistory, Hospital, MatchPrediction, ModelPredictionLog
+from app.models import User, Donor, Match, DonationHistory, Hospital, MatchPrediction, Request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
 import os
 from app.utils.id_encoder import encode_id, decode_id, IDEncodingError
 from app.ml.feature_builder import FeatureBuilder
 from app.ml.model_client import model_client
+from app.services.prediction_log_service import log_prediction
+from app.services.profile_pictures import profile_pictures, UploadTooLarge, MULTIPART_OVERHEAD
+from app.services.match_events import match_events
+from app.services.notification_inbox import notification_inbox
 
 donor_bp = Blueprint("donor", __name__, url_prefix="/api/donors")
 
@@ -93,6 +97,7 @@ def get_me():
         "date_of_birth": donor.date_of_birth.isoformat() if donor.date_of_birth else None,
         "gender": donor.gender,
         "profile_pic_url": user.profile_pic_url,
+        "profile_pic_thumb_url": profile_pictures.thumbnail_url(user.profile_pic_url, 'medium'),
         "address": user.address,
         "city": user.city,
         "district": user.district,
@@ -272,18 +277,15 @@ def dashboard():
             "demand_forecast_area": user.district or "Not Available"
         }
         
-        # Log ML prediction
-        log_entry = ModelPredictionLog(
-            model_name='donor_availability',
-            model_version='1.0.0',
+        # Log ML prediction (buffered, written in the background)
+        log_prediction(
+            'donor_availability',
             endpoint='/api/donors/dashboard',
             input_data={'donor_id': donor.id},
             prediction_output={'availability_score': availability_prob},
             inference_time_ms=50.0,
             success=True
         )
-        db.session.add(log_entry)
-        db.session.commit()
         
     except Exception as e:
         current_app.logger.warning(f"ML insights failed for donor {donor.id}: {str(e)}")
@@ -305,7 +307,7 @@ def dashboard():
             "phone": user.phone,
             "district": user.district,
             "city": user.city,
-            "profile_pic_url": user.profile_pic_url
+            "profile_pic_url": profile_pictures.thumbnail_url(user.profile_pic_url)
         },
         "donor": {
             "id": encode_id(donor.id),
@@ -387,12 +389,15 @@ def respond_to_match():
             if req and req.status not in ("fulfilled", "matched"):
                 req.status = "matched"
                 db.session.add(req)
+        notification_inbox.mark_match_read(user.id, mr.id)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         current_app.logger.exception("error responding to match")
         return jsonify({"error":"internal"}), 500
 
+    match_events.publish(mr.request_id, "donor_accepted" if action == "accept" else "donor_declined",
+                         {"match_id": mr.id, "donor_id": donor.id})
     return jsonify({"match_id": mr.id, "response": mr.status}), 200
 
 
@@ -562,6 +567,9 @@ def record_donation():
     db.session.add(donation)
     db.session.commit()
     
+    from app.services.certificate_jobs import certificate_jobs
+    certificate_jobs.invalidate_counts(donor.id)
+    
     return jsonify({"message": "Donation recorded", "donation_id": donation.id}), 201
 
 
@@ -586,187 +594,295 @@ def generate_certificate(donation_id):
             "certificate_number": donation.certificate_number
         }), 200
     
-    # Get hospital details
-    hospital = Hospital.query.get(donation.hospital_id) if donation.hospital_id else None
+    from app.services.certificate_jobs import certificate_jobs
+    from app.services.certificate_service import build_donation_data
     
-    # Calculate next eligible donation date
-    # Standard waiting periods: 90 days for males, 120 days for females
-    donation_date = donation.donation_date
-    donor_gender = donor.gender.lower() if donor.gender else None
+    # A job may already be rendering this certificate
+    job = certificate_jobs.pending_for_donation(donation.id)
+    if not job:
+        # Get hospital details
+        hospital = Hospital.query.get(donation.hospital_id) if donation.hospital_id else None
+        try:
+            job = certificate_jobs.submit(
+                [build_donation_data(donation, donor, user, hospital)], requested_by=user.id
+            )
+        except Exception as e:
+            current_app.logger.exception("Failed to queue certificate")
+            return jsonify({"error": "Failed to generate certificate", "details": str(e)}), 500
     
-    if donor_gender == 'male':
-        waiting_days = 90
-    elif donor_gender == 'female':
-        waiting_days = 120
-    else:
-        waiting_days = 90  # Default to male waiting period
-    
-    next_eligible_date = donation_date + timedelta(days=waiting_days)
-    
-    # Prepare donation data for certificate generation
-    from app.services.certificate_service import get_certificate_service
-    cert_service = get_certificate_service()
-    
-    donor_name = f"{user.first_name} {user.last_name or ''}".strip()
-    
-    donation_data = {
-        'donor_name': donor_name,
-        'donor_id': donor.id,
-        'blood_group': donor.blood_group,
-        'donation_date': donation.donation_date,
-        'hospital_name': hospital.name if hospital else 'Unknown Hospital',
-        'hospital_city': hospital.city if hospital else '',
-        'hospital_district': hospital.district if hospital else '',
-        'units': donation.units,
-        'donation_id': donation.id,
-        'hospital_id': donation.hospital_id or 0,
-        'next_eligible_date': next_eligible_date,
-        'gender': donor_gender
-    }
+    # Number and filename are final; the download answers 202 while the PDF is rendered
+    certificate = job["certificates"][str(donation.id)]
+    return jsonify({
+        "message": "Certificate generation started",
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/api/donors/certificates/jobs/{job['job_id']}",
+        "certificate_url": f"/api/donors/certificates/{certificate['filename']}",
+        "certificate_number": certificate["certificate_number"]
+    }), 202
+
+
+@donor_bp.route("/certificates/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def certificate_job_status(job_id):
+    """Progress of a certificate generation job"""
+    user, donor, err = _get_current_donor()
+    if err:
+        return err
     
-    try:
-        # Generate certificate PDF
-        filename, certificate_number = cert_service.generate_certificate_pdf(donation_data)
-        
-        # Update donation record with certificate info
-        donation.certificate_number = certificate_number
-        donation.certificate_url = filename  # Store just filename, not full path
-        donation.certificate_generated_at = datetime.utcnow()
-        
-        db.session.commit()
-        
-        return jsonify({
-            "message": "Certificate generated successfully",
-            "certificate_url": f"/api/donors/certificates/{filename}",
-            "certificate_number": certificate_number
-        }), 201
-        
-    except Exception as e:
-        current_app.logger.exception("Failed to generate certificate")
-        return jsonify({"error": "Failed to generate certificate", "details": str(e)}), 500
+    from app.services.certificate_jobs import certificate_jobs
+    job = certificate_jobs.get(job_id)
+    if not job or job["requested_by"] != user.id:
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify({
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "total": job["total"],
+        "done": job["done"],
+        "failed": job["failed"],
+        "certificates": [
+            {
+                "donation_id": int(donation_id),
+                "certificate_number": c["certificate_number"],
+                "certificate_url": f"/api/donors/certificates/{c['filename']}" if c["status"] == "done" else None,
+                "status": c["status"],
+                "error": c["error"]
+            }
+            for donation_id, c in job["certificates"].items()
+        ],
+        "created_at": job["created_at"].isoformat(),
+        "completed_at": job["completed_at"].isoformat() if job["completed_at"] else None
+    }), 200
 
 
 @donor_bp.route("/certificates/<filename>", methods=["GET"])
 def download_certificate(filename):
-    """Download certificate PDF file"""
+    """Download certificate PDF file (ETag/Range aware, offloaded to the front server if configured)"""
     try:
-        from app.services.certificate_service import get_certificate_service
-        cert_service = get_certificate_service()
+        from app.services.file_serving import file_server
         
-        # Get full path to certificate
-        filepath = cert_service.get_certificate_path(filename)
+        def send():
+            return file_server.send(
+                'certificates', filename,
+                mimetype='application/pdf',
+                as_attachment=True,
+                max_age=current_app.config.get('CERTIFICATE_CACHE_MAX_AGE', 86400),
+                private=True
+            )
         
-        if not os.path.exists(filepath):
-            return jsonify({"error": "Certificate not found"}), 404
+        response = send()
+        if response is not None:
+            return response
         
-        # Send file with proper MIME type and download disposition
-        return send_file(
-            filepath,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        # Still being rendered by a certificate job: tell the client when to come back
+        from app.services.certificate_jobs import certificate_jobs
+        job = certificate_jobs.pending_for_file(filename)
+        if job is None:
+            return jsonify({"error": "Certificate not found"}), 404
+        retry_after = current_app.config.get('CERTIFICATE_RETRY_AFTER_SECONDS', 2)
+        response = jsonify({
+            "message": "Certificate is still being generated",
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/api/donors/certificates/jobs/{job['job_id']}",
+            "retry_after": retry_after
+        })
+        response.status_code = 202
+        response.headers['Retry-After'] = str(retry_after)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
         
     except Exception as e:
         current_app.logger.exception("Failed to download certificate")
         return jsonify({"error": "Failed to download certificate"}), 500
 
 
+@donor_bp.route("/profile-pictures/<filename>", methods=["GET"])
+def get_profile_picture(filename):
+    """Serve an uploaded profile picture"""
+    from app.services.file_serving import file_server
+    
+    def send():
+        if profile_pictures.is_content_addressed(filename):
+            return file_server.send('profile_pictures', filename, max_age=31536000, immutable=True)
+        return file_server.send(
+            'profile_pictures', filename,
+            max_age=current_app.config.get('PROFILE_PICTURE_CACHE_MAX_AGE', 86400)
+        )
+    
+    response = send()
+    if response is None:
+        # Thumbnail not made yet: make it now
+        try:
+            if profile_pictures.resolve_thumbnail(filename):
+                response = send()
+        except Exception as e:
+            current_app.logger.warning(f"[PROFILE_PIC] On-demand thumbnail {filename} failed: {e}")
+    if response is None:
+        return jsonify({"error": "Picture not found"}), 404
+    return response
+
+
 @donor_bp.route("/notifications", methods=["GET"])
 @jwt_required()
 def get_notifications():
-    """Get donor notifications (matches + system messages)"""
+    """
+    Donor notification inbox, newest first
+    
+    Query params: limit (default NOTIFICATION_PAGE_SIZE, max 100), cursor (next_cursor
+    of the previous page), unread=1 (unread only)
+    """
     user, donor, err = _get_current_donor()
     if err:
         return err
     
-    # Get recent matches as notifications
-    matches = Match.query.filter_by(donor_id=donor.id)\
-        .filter(Match.status == 'pending')\
-        .order_by(Match.matched_at.desc())\
-        .limit(20).all()
-    
-    notifications = []
-    for m in matches:
-        req = m.request
-        if req:
-            hosp = Hospital.query.get(req.hospital_id) if req.hospital_id else None
-            notifications.append({
-                "id": f"match_{m.id}",
-                "type": "match",
-                "title": "New Blood Request Match",
-                "message": f"You've been matched to a {req.blood_group} request at {hosp.name if hosp else 'a hospital'}",
-                "created_at": m.matched_at.isoformat() if m.matched_at else None,
-                "read": m.status != 'pending',
-                "data": {
-                    "match_id": m.id,
-                    "request_id": req.id,
-                    "blood_group": req.blood_group,
-                    "urgency": req.urgency,
-                    "hospital_name": hosp.name if hosp else None
-                }
-            })
+    unread_only = request.args.get('unread', '').lower() in ('1', 'true', 'yes')
+    try:
+        limit = int(request.args['limit']) if request.args.get('limit') else None
+        rows, next_cursor = notification_inbox.feed(
+            user.id, limit=limit, cursor=request.args.get('cursor'), unread_only=unread_only
+        )
+    except ValueError:
+        return jsonify({"error": "invalid limit or cursor"}), 400
     
-    return jsonify({"notifications": notifications, "unread_count": len([n for n in notifications if not n['read']])})
+    return jsonify({
+        "notifications": [notification_inbox.serialize(n) for n in rows],
+        "unread_count": notification_inbox.unread_count(user.id),
+        "next_cursor": next_cursor
+    })
+
+
+@donor_bp.route("/notifications/unread-count", methods=["GET"])
+@jwt_required()
+def get_unread_notification_count():
+    """Unread badge count (one primary-key lookup)"""
+    user, donor, err = _get_current_donor()
+    if err:
+        return err
+    return jsonify({"unread_count": notification_inbox.unread_count(user.id)})
 
 
 @donor_bp.route("/notifications/<int:notification_id>/read", methods=["PUT"])
 @jwt_required()
 def mark_notification_read(notification_id):
-    """Mark a notification as read (placeholder - extend based on notification system)"""
+    """Mark a notification as read"""
     user, donor, err = _get_current_donor()
     if err:
         return err
     
-    # For now, notifications are based on matches, so this is a no-op
-    # In future, implement a separate Notification model
-    return jsonify({"message": "Notification marked as read"})
+    if notification_inbox.mark_read(user.id, notification_id) is None:
+        return jsonify({"error": "Notification not found"}), 404
+    return jsonify({
+        "message": "Notification marked as read",
+        "unread_count": notification_inbox.unread_count(user.id)
+    })
 
 
 @donor_bp.route("/notifications/read-all", methods=["PUT"])
 @jwt_required()
 def mark_all_notifications_read():
-    """Mark all notifications as read"""
+    """Mark all notifications as read (one UPDATE)"""
     user, donor, err = _get_current_donor()
     if err:
         return err
     
-    # Placeholder for future notification system
-    return jsonify({"message": "All notifications marked as read"})
+    updated = notification_inbox.mark_all_read(user.id)
+    return jsonify({
+        "message": "All notifications marked as read",
+        "updated": updated,
+        "unread_count": notification_inbox.unread_count(user.id)
+    })
 
 
 @donor_bp.route("/me/certificates", methods=["GET"])
 @jwt_required()
 def get_donor_certificates():
-    """Get all certificates for current donor"""
+    """Certificate index for current donor: one row per donation, paginated (?page=&per_page=)"""
     user, donor, err = _get_current_donor()
     if err:
         return err
     
-    # TODO: Implement when Certificate model is ready
-    # For now, return certificates based on completed donations
-    donations = DonationHistory.query.filter_by(donor_id=donor.id)\
-        .order_by(DonationHistory.donation_date.desc()).all()
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        per_page = int(request.args.get('per_page', 20))
+        if per_page < 1 or per_page > 100:
+            per_page = 20
+    except ValueError:
+        return jsonify({"error": "page and per_page must be integers"}), 400
+    
+    from app.services.certificate_jobs import certificate_jobs
+    counts = certificate_jobs.counts_for_donor(donor.id)
+    
+    # Donations with their hospital in one query; the total comes from the cached counts
+    rows = db.session.query(DonationHistory, Hospital.name)\
+        .outerjoin(Hospital, Hospital.id == DonationHistory.hospital_id)\
+        .filter(DonationHistory.donor_id == donor.id)\
+        .order_by(DonationHistory.donation_date.desc(), DonationHistory.id.desc())\
+        .offset((page - 1) * per_page)\
+        .limit(per_page)\
+        .all()
     
     certificates = []
-    for idx, donation in enumerate(donations, 1):
-        hospital = None
-        if donation.hospital_id:
-            hospital = Hospital.query.get(donation.hospital_id)
-        
+    for donation, hospital_name in rows:
+        generated = bool(donation.certificate_url)
         certificates.append({
             "id": donation.id,
-            "certificate_number": f"CERT-{donor.id}-{donation.id}",
             "donation_id": donation.id,
+            "certificate_number": donation.certificate_number if generated else None,
+            "certificate_url": f"/api/donors/certificates/{os.path.basename(donation.certificate_url)}" if generated else None,
+            "status": "generated" if generated else "not_generated",
             "donation_date": donation.donation_date.isoformat() if donation.donation_date else None,
-            "hospital_name": hospital.name if hospital else "Unknown",
+            "hospital_name": hospital_name or "Unknown",
             "blood_group": donor.blood_group,
             "units": donation.units,
-            "certificate_url": None,  # Will be populated when cloud storage is integrated
-            "generated_at": donation.donation_date.isoformat() if donation.donation_date else None
+            "generated_at": donation.certificate_generated_at.isoformat() if donation.certificate_generated_at else None
         })
     
-    return jsonify({"certificates": certificates, "total": len(certificates)})
+    total = counts["donations"]
+    return jsonify({
+        "certificates": certificates,
+        "total": total,
+        "generated": counts["certificates"],
+        "page": page,
+        "per_page": per_page,
+        "pages": (total + per_page - 1) // per_page,
+        "has_next": page * per_page < total,
+        "has_prev": page > 1,
+        "archive_url": "/api/donors/me/certificates/archive" if counts["certificates"] else None
+    })
+
+
+@donor_bp.route("/me/certificates/archive", methods=["GET"])
+@jwt_required()
+def download_certificates_archive():
+    """All generated certificates of current donor as one ZIP, streamed as it is built"""
+    user, donor, err = _get_current_donor()
+    if err:
+        return err
+    
+    from app.services.file_serving import file_server, stream_zip
+    
+    rows = db.session.query(DonationHistory.certificate_number, DonationHistory.certificate_url)\
+        .filter(DonationHistory.donor_id == donor.id, DonationHistory.certificate_url.isnot(None))\
+        .order_by(DonationHistory.donation_date)\
+        .all()
+    entries = []
+    for certificate_number, certificate_url in rows:
+        path = file_server.resolve('certificates', os.path.basename(certificate_url))
+        if path:
+            entries.append((f"{certificate_number or os.path.splitext(os.path.basename(path))[0]}.pdf", path))
+    if not entries:
+        return jsonify({"error": "No certificates generated yet"}), 404
+    
+    return Response(
+        stream_zip(entries),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=certificates-{donor.id}.zip",
+            "Cache-Control": "private, no-store"
+        }
+    )
 
 
 @donor_bp.route("/me/badges", methods=["GET"])
@@ -829,11 +945,15 @@ def get_donor_badges():
 @donor_bp.route("/profile-picture", methods=["POST"])
 @jwt_required()
 def upload_profile_picture():
-    """Upload donor profile picture"""
+    """Upload donor profile picture (size-capped, stored by content hash, thumbnails made in the background)"""
     user, donor, err = _get_current_donor()
     if err:
         return err
     
+    # Declared oversized bodies fail here; chunked ones hit MAX_CONTENT_LENGTH while parsing
+    if request.content_length and request.content_length > profile_pictures.max_bytes + MULTIPART_OVERHEAD:
+        return jsonify({"error": f"Picture exceeds {profile_pictures.max_size_text}"}), 413
+    
     if 'profile_picture' not in request.files:
         return jsonify({"error": "No file provided"}), 400
     
@@ -841,22 +961,22 @@ def upload_profile_picture():
     if file.filename == '':
         return jsonify({"error": "No file selected"}), 400
     
-    # For now, save locally (in production, use S3 or similar)
-    # This is a placeholder - implement actual file upload logic
-    import os
-    from werkzeug.utils import secure_filename
-    
-    filename = secure_filename(file.filename)
-    upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads/profile_pictures')
-    os.makedirs(upload_folder, exist_ok=True)
-    
-    filepath = os.path.join(upload_folder, f"donor_{user.id}_{filename}")
-    file.save(filepath)
+    try:
+        stored_name = profile_pictures.save_upload(file.stream)
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    user.profile_pic_url = filepath
+    # Served by get_profile_picture
+    user.profile_pic_url = profile_pictures.url_for(stored_name)
     db.session.commit()
     
-    return jsonify({"message": "Profile picture uploaded", "url": filepath})
+    return jsonify({
+        "message": "Profile picture uploaded",
+        "url": user.profile_pic_url,
+        "thumbnail_url": profile_pictures.thumbnail_url(user.profile_pic_url)
+    })
 
 
 @donor_bp.route("/me", methods=["DELETE"])
@@ -906,6 +1026,13 @@ def update_donor_location():
     })
 
 
+def _mark_match_notification_read(match):
+    """Answering a match (e.g. from an email link) also clears its inbox entry, in the same transaction"""
+    donor = Donor.query.get(match.donor_id)
+    if donor:
+        notification_inbox.mark_match_read(donor.user_id, match.id)
+
+
 @donor_bp.route("/accept-request/<int:match_id>", methods=["GET"])
 def accept_blood_request(match_id):
     """
@@ -931,7 +1058,9 @@ def accept_blood_request(match_id):
         if blood_request and blood_request.status == 'pending':
             blood_request.status = 'in_progress'
         
+        _mark_match_notification_read(match)
         db.session.commit()
+        match_events.publish(match.request_id, 'donor_accepted', {'match_id': match.id, 'donor_id': match.donor_id})
         
         # Send notification to admin/hospital
         try:
@@ -944,48 +1073,37 @@ def accept_blood_request(match_id):
             hospital = Hospital.query.get(request_obj.hospital_id) if request_obj.hospital_id else None
             
             if request_obj:
+                donor_name = f"{donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}"
+                
                 # Notify hospital staff if exists
                 if hospital and hospital.email:
-                    email_html = f"""
-                    <h2>Donor Accepted Blood Request</h2>
-                    <p>A donor has accepted your blood request:</p>
-                    <ul>
-                        <li>Donor: {donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}</li>
-                        <li>Patient: {request_obj.patient_name}</li>
-                        <li>Blood Group: {request_obj.blood_group}</li>
-                        <li>Units Needed: {request_obj.units_required}</li>
-                        <li>Hospital: {hospital.name if hospital else 'N/A'}</li>
-                    </ul>
-                    <p>Please coordinate with the donor for the donation process.</p>
-                    <p><small>Smart Blood Connect</small></p>
-                    """
-                    
-                    email_service.send_email(
+                    email_service.send_template(
                         to=hospital.email,
                         subject=f'Donor Accepted: {request_obj.blood_group} Blood Request for {request_obj.patient_name}',
-                        html=email_html
+                        template='donor_response',
+                        accepted=True,
+                        audience='hospital',
+                        donor_name=donor_name,
+                        patient_name=request_obj.patient_name,
+                        blood_group=request_obj.blood_group,
+                        units_required=request_obj.units_required,
+                        hospital_name=hospital.name if hospital else None
                     )
                 
                 # Notify admin
                 admin_email = current_app.config.get('ADMIN_EMAIL')
                 if admin_email:
-                    email_html = f"""
-                    <h2>Donor Accepted Blood Request</h2>
-                    <p>A donor has accepted a blood request:</p>
-                    <ul>
-                        <li>Donor: {donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}</li>
-                        <li>Patient: {request_obj.patient_name}</li>
-                        <li>Blood Group: {request_obj.blood_group}</li>
-                        <li>Units Needed: {request_obj.units_required}</li>
-                        <li>Hospital: {hospital.name if hospital else 'N/A'}</li>
-                    </ul>
-                    <p><small>Smart Blood Connect</small></p>
-                    """
-                    
-                    email_service.send_email(
+                    email_service.send_template(
                         to=admin_email,
                         subject=f'Donor Accepted: {request_obj.blood_group} Blood Request',
-                        html=email_html
+                        template='donor_response',
+                        accepted=True,
+                        audience='admin',
+                        donor_name=donor_name,
+                        patient_name=request_obj.patient_name,
+                        blood_group=request_obj.blood_group,
+                        units_required=request_obj.units_required,
+                        hospital_name=hospital.name if hospital else None
                     )
         except Exception as e:
             current_app.logger.error(f"Failed to send acceptance notification: {str(e)}")
@@ -1024,7 +1142,9 @@ def reject_blood_request(match_id):
         # Update request status if needed
         blood_request = Request.query.get(match.request_id)
         
+        _mark_match_notification_read(match)
         db.session.commit()
+        match_events.publish(match.request_id, 'donor_declined', {'match_id': match.id, 'donor_id': match.donor_id})
         
         # Send notification to admin/hospital
         try:
@@ -1037,48 +1157,37 @@ def reject_blood_request(match_id):
             hospital = Hospital.query.get(request_obj.hospital_id) if request_obj.hospital_id else None
             
             if request_obj:
+                donor_name = f"{donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}"
+                
                 # Notify hospital staff if exists
                 if hospital and hospital.email:
-                    email_html = f"""
-                    <h2>Donor Declined Blood Request</h2>
-                    <p>A donor has declined your blood request:</p>
-                    <ul>
-                        <li>Donor: {donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}</li>
-                        <li>Patient: {request_obj.patient_name}</li>
-                        <li>Blood Group: {request_obj.blood_group}</li>
-                        <li>Units Needed: {request_obj.units_required}</li>
-                        <li>Hospital: {hospital.name if hospital else 'N/A'}</li>
-                    </ul>
-                    <p>You may need to find another donor for this request.</p>
-                    <p><small>Smart Blood Connect</small></p>
-                    """
-                    
-                    email_service.send_email(
+                    email_service.send_template(
                         to=hospital.email,
                         subject=f'Donor Declined: {request_obj.blood_group} Blood Request for {request_obj.patient_name}',
-                        html=email_html
+                        template='donor_response',
+                        accepted=False,
+                        audience='hospital',
+                        donor_name=donor_name,
+                        patient_name=request_obj.patient_name,
+                        blood_group=request_obj.blood_group,
+                        units_required=request_obj.units_required,
+                        hospital_name=hospital.name if hospital else None
                     )
                 
                 # Notify admin
                 admin_email = current_app.config.get('ADMIN_EMAIL')
                 if admin_email:
-                    email_html = f"""
-                    <h2>Donor Declined Blood Request</h2>
-                    <p>A donor has declined a blood request:</p>
-                    <ul>
-                        <li>Donor: {donor.user.first_name} {donor.user.last_name if donor.user.last_name else ''}</li>
-                        <li>Patient: {request_obj.patient_name}</li>
-                        <li>Blood Group: {request_obj.blood_group}</li>
-                        <li>Units Needed: {request_obj.units_required}</li>
-                        <li>Hospital: {hospital.name if hospital else 'N/A'}</li>
-                    </ul>
-                    <p><small>Smart Blood Connect</small></p>
-                    """
-                    
-                    email_service.send_email(
+                    email_service.send_template(
                         to=admin_email,
                         subject=f'Donor Declined: {request_obj.blood_group} Blood Request',
-                        html=email_html
+                        template='donor_response',
+                        accepted=False,
+                        audience='admin',
+                        donor_name=donor_name,
+                        patient_name=request_obj.patient_name,
+                        blood_group=request_obj.blood_group,
+                        units_required=request_obj.units_required,
+                        hospital_name=hospital.name if hospital else None
                     )
         except Exception as e:
             current_app.logger.error(f"Failed to send rejection notification: {str(e)}")
@@ -1164,18 +1273,15 @@ def donor_analytics():
             }
         }
         
-        # Log analytics request
-        log_entry = ModelPredictionLog(
-            model_name='donor_analytics',
-            model_version='1.0.0',
+        # Log analytics request (buffered, written in the background)
+        log_prediction(
+            'donor_analytics',
             endpoint='/api/donors/analytics',
             input_data={'donor_id': donor.id},
             prediction_output={'analytics_generated': True},
             inference_time_ms=avail_time,
             success=True
         )
-        db.session.add(log_entry)
-        db.session.commit()
         
         return jsonify(analytics)
         
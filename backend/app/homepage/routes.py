@@ -6,6 +6,7 @@ Handles homepage data including statistics, alerts, and dynamic content
 from flask import Blueprint, jsonify, request, current_app
 from app.models import User, Request, Donor, Hospital, Match, DonationHistory
 from app import db
+from app.services.rate_limiter import rate_limiter
 from sqlalchemy import func, text
 from datetime import datetime, timedelta
 import logging
@@ -18,6 +19,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @homepage_bp.route('/api/homepage/stats', methods=['GET'])
+@rate_limiter.limit('public')
 def get_homepage_stats():
     """
     Get homepage statistics including donors, units, hospitals, and districts
@@ -113,6 +115,7 @@ def get_homepage_stats():
         }), 500
 
 @homepage_bp.route('/api/homepage/alerts', methods=['GET'])
+@rate_limiter.limit('public')
 def get_homepage_alerts():
     """
     Get emergency alerts and blood shortage notifications
@@ -228,6 +231,7 @@ def get_homepage_alerts():
         }), 500
 
 @homepage_bp.route('/api/homepage/testimonials', methods=['GET'])
+@rate_limiter.limit('public')
 def get_homepage_testimonials():
     """
     Get testimonials from donors and recipients
@@ -322,6 +326,7 @@ def get_homepage_testimonials():
         }), 500
 
 @homepage_bp.route('/api/homepage/blood-availability', methods=['GET'])
+@rate_limiter.limit('public')
 def get_blood_availability():
     """
     Get current blood availability across different blood types
@@ -372,6 +377,7 @@ def get_blood_availability():
         }), 500
 
 @homepage_bp.route('/api/homepage/featured-hospitals', methods=['GET'])
+@rate_limiter.limit('public')
 def get_featured_hospitals():
     """
     Get featured hospitals for the homepage
@@ -429,6 +435,7 @@ def get_featured_hospitals():
         }), 500
 
 @homepage_bp.route('/api/homepage/dashboard-summary', methods=['GET'])
+@rate_limiter.limit('public')
 def get_dashboard_summary():
     """
     Admin/Homepage dashboard summary with totals, charts, and activities
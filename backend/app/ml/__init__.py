@@ -3,7 +3,22 @@ ML Module for SmartBlood Connect
 Handles model loading, feature engineering, and predictions
 """
 
-from .model_client import ModelClient
-from .feature_builder import FeatureBuilder
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .feature_builder import FeatureBuilder
+    from .model_client import ModelClient
 
 __all__ = ['ModelClient', 'FeatureBuilder']
+
+
+def __getattr__(name):
+    # Resolved on first access so that importing app.ml.feature_store (done in
+    # create_app) doesn't load the model client and feature builder up front
+    if name == 'ModelClient':
+        from .model_client import ModelClient
+        return ModelClient
+    if name == 'FeatureBuilder':
+        from .feature_builder import FeatureBuilder
+        return FeatureBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
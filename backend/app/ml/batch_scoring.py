@@ -0,0 +1,208 @@
+"""
+Batch scoring pipelines for nightly ML jobs
+Streams donors in chunks, aggregates history with one grouped query per chunk,
+scores each chunk with a single batched predict and writes the results with
+one UPDATE ... FROM (VALUES ...) statement
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from flask import current_app
+from sqlalchemy import Float, Integer, column, func, select, update, values
+
+from app.models import db, Donor, DonorFeatures, DonationHistory
+from app.ml.model_client import model_client
+
+
+# Flask app owned by a scoring worker process (see _init_scoring_worker)
+_worker_app = None
+
+
+def iter_donor_id_chunks(chunk_size: int) -> Iterator[List[int]]:
+    """Stream donor ids in primary-key order, chunk_size ids at a time"""
+    result = db.session.execute(
+        select(Donor.id).order_by(Donor.id).execution_options(yield_per=chunk_size)
+    )
+    for partition in result.partitions():
+        yield [row[0] for row in partition]
+
+
+def load_reliability_inputs(connection, donor_ids: List[int]) -> pd.DataFrame:
+    """Fetch everything the reliability features need for a chunk in one query"""
+    history = (
+        select(
+            DonationHistory.donor_id,
+            func.count(DonationHistory.id).label('history_donations')
+        )
+        .where(DonationHistory.donor_id.in_(donor_ids))
+        .group_by(DonationHistory.donor_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            Donor.id.label('donor_id'),
+            Donor.created_at,
+            history.c.history_donations,
+            DonorFeatures.total_matches,
+            DonorFeatures.accepted_matches,
+            DonorFeatures.completed_matches,
+            DonorFeatures.declined_matches,
+            DonorFeatures.cancelled_matches,
+            DonorFeatures.response_time_sum,
+            DonorFeatures.response_time_count,
+        )
+        .outerjoin(history, history.c.donor_id == Donor.id)
+        .outerjoin(DonorFeatures, DonorFeatures.donor_id == Donor.id)
+        .where(Donor.id.in_(donor_ids))
+    )
+    rows = connection.execute(stmt).mappings().all()
+    return pd.DataFrame([dict(r) for r in rows])
+
+
+def build_reliability_frame(inputs: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Vectorized equivalent of FeatureBuilder.build_reliability_features
+
+    Args:
+        inputs: Frame from load_reliability_inputs
+        now: Reference time for tenure (default: now)
+
+    Returns:
+        Feature frame with one row per donor, in the same column order
+    """
+    now = now or datetime.now()
+    n = len(inputs)
+
+    def col(name, default=0.0):
+        if name not in inputs:
+            return np.full(n, default, dtype=float)
+        return pd.to_numeric(inputs[name], errors='coerce').fillna(default).to_numpy(dtype=float)
+
+    total_matches = col('total_matches')
+    has_matches = total_matches > 0
+    safe_matches = np.where(has_matches, total_matches, 1.0)
+    completion_rate = np.where(
+        has_matches, (col('accepted_matches') + col('completed_matches')) / safe_matches, 0.85
+    )
+    cancellation_rate = np.where(
+        has_matches, (col('declined_matches') + col('cancelled_matches')) / safe_matches, 0.05
+    )
+
+    rt_count = col('response_time_count')
+    avg_response_time = np.where(
+        rt_count > 0, col('response_time_sum') / np.where(rt_count > 0, rt_count, 1.0), 24.0
+    )
+
+    created_at = pd.to_datetime(inputs['created_at'], errors='coerce') if 'created_at' in inputs \
+        else pd.Series([pd.NaT] * n)
+    tenure_days = (pd.Timestamp(now) - created_at).dt.days.fillna(30).to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        'total_donations': col('history_donations'),
+        'completion_rate': completion_rate,
+        'cancellation_rate': cancellation_rate,
+        'average_response_time': avg_response_time,
+        'tenure_days': tenure_days
+    })
+
+
+def write_reliability_scores(connection, donor_ids: List[int], scores) -> int:
+    """Write scores for a chunk with a single UPDATE ... FROM (VALUES ...)"""
+    data = [(int(d), round(float(s), 3)) for d, s in zip(donor_ids, scores)]
+    if not data:
+        return 0
+    new_scores = values(
+        column('donor_id', Integer), column('score', Float), name='new_scores'
+    ).data(data)
+    stmt = (
+        update(Donor.__table__)
+        .where(Donor.__table__.c.id == new_scores.c.donor_id)
+        .values(reliability_score=new_scores.c.score, updated_at=datetime.utcnow())
+    )
+    return connection.execute(stmt).rowcount
+
+
+def score_reliability_chunk(donor_ids: List[int]) -> Dict[str, int]:
+    """Aggregate, score and write one chunk of donors (own transaction)"""
+    engine = db.engine
+    with engine.connect() as conn:
+        inputs = load_reliability_inputs(conn, donor_ids)
+    if inputs.empty:
+        return {'updated': 0, 'failed': 0}
+
+    features_df = build_reliability_frame(inputs)
+    prediction, _ = model_client.predict('donor_reliability', features_df)
+
+    with engine.begin() as conn:
+        updated = write_reliability_scores(conn, inputs['donor_id'].tolist(), prediction)
+    return {'updated': updated, 'failed': 0}
+
+
+def _init_scoring_worker():
+    """Process pool initializer: one app (engine + loaded models) per worker"""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def _score_chunk_in_worker(donor_ids: List[int]) -> Dict[str, int]:
+    with _worker_app.app_context():
+        try:
+            return score_reliability_chunk(donor_ids)
+        except Exception as e:
+            _worker_app.logger.error(f"[TASK] Reliability chunk failed ({len(donor_ids)} donors): {str(e)}")
+            return {'updated': 0, 'failed': len(donor_ids)}
+
+
+def run_reliability_scoring(chunk_size: int = 5000, workers: int = 0) -> Dict[str, int]:
+    """
+    Score every donor in bounded-memory chunks
+
+    Args:
+        chunk_size: Donors per chunk (one aggregate query, predict and UPDATE each)
+        workers: Spread chunks over this many processes (0 = score in-process).
+            Needs a parent that may fork children, e.g. a script or a
+            non-prefork Celery pool.
+
+    Returns:
+        Totals for updated/failed donors and chunks processed
+    """
+    totals = {'updated': 0, 'failed': 0, 'total': 0, 'chunks': 0}
+
+    def add(result):
+        totals['updated'] += result['updated']
+        totals['failed'] += result['failed']
+
+    if workers and workers > 1:
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_scoring_worker) as pool:
+            pending = set()
+            for donor_ids in iter_donor_id_chunks(chunk_size):
+                totals['total'] += len(donor_ids)
+                totals['chunks'] += 1
+                pending.add(pool.submit(_score_chunk_in_worker, donor_ids))
+                # Keep at most two chunks per worker in flight
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        add(future.result())
+            for future in pending:
+                add(future.result())
+        return totals
+
+    for donor_ids in iter_donor_id_chunks(chunk_size):
+        totals['total'] += len(donor_ids)
+        totals['chunks'] += 1
+        try:
+            add(score_reliability_chunk(donor_ids))
+        except Exception as e:
+            current_app.logger.error(
+                f"[TASK] Reliability chunk failed ({len(donor_ids)} donors): {str(e)}"
+            )
+            add({'updated': 0, 'failed': len(donor_ids)})
+    return totals
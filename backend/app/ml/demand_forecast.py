@@ -0,0 +1,153 @@
+"""
+Demand forecast engine
+Scores the full district x blood group x date grid with a single predict call,
+derives historical features from one grouped query and upserts the results
+on the unique_forecast constraint
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import product
+from typing import Dict, List, Optional
+import pandas as pd
+from sqlalchemy import cast, Date, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models import db, DemandForecast, Hospital, Request
+from app.ml.model_client import model_client
+from app.ml.feature_builder import FeatureBuilder
+
+
+KERALA_DISTRICTS = [
+    'Thiruvananthapuram', 'Kollam', 'Pathanamthitta', 'Alappuzha',
+    'Kottayam', 'Idukki', 'Ernakulam', 'Thrissur', 'Palakkad',
+    'Malappuram', 'Kozhikode', 'Wayanad', 'Kannur', 'Kasaragod'
+]
+
+BLOOD_GROUPS = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
+
+MODEL_VERSION = '1.0.0'
+
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 1000
+
+
+def load_historical_stats(lookback_days: int = 90, today: Optional[date] = None) -> pd.DataFrame:
+    """
+    Historical demand features per district and blood group
+
+    Daily units requested come from one grouped query over requests joined to
+    hospitals; days without requests count as zero demand.
+
+    Returns:
+        Frame indexed by (district, blood_group) with historical_mean,
+        historical_std and recent_trend columns
+    """
+    today = today or date.today()
+    start = today - timedelta(days=lookback_days)
+    day = cast(Request.created_at, Date)
+
+    stmt = (
+        select(
+            Hospital.district.label('district'),
+            Request.blood_group.label('blood_group'),
+            day.label('day'),
+            func.sum(Request.units_required).label('demand')
+        )
+        .join(Hospital, Hospital.id == Request.hospital_id)
+        .where(Request.created_at >= start, Hospital.district.isnot(None))
+        .group_by(Hospital.district, Request.blood_group, day)
+    )
+    rows = db.session.execute(stmt).mappings().all()
+    columns = ['historical_mean', 'historical_std', 'recent_trend']
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    daily = pd.DataFrame([dict(r) for r in rows])
+    daily['day'] = pd.to_datetime(daily['day'])
+    daily['demand'] = daily['demand'].astype(float)
+
+    # Dense (district, blood_group) x day matrix, zero where nothing was requested
+    matrix = daily.pivot_table(
+        index=['district', 'blood_group'], columns='day', values='demand',
+        aggfunc='sum', fill_value=0.0
+    ).reindex(columns=pd.date_range(start, today - timedelta(days=1)), fill_value=0.0)
+
+    stats = pd.DataFrame({
+        'historical_mean': matrix.mean(axis=1),
+        'historical_std': matrix.std(axis=1),
+        'recent_trend': matrix.iloc[:, -7:].mean(axis=1)
+    })
+    return stats.loc[:, columns]
+
+
+def upsert_forecasts(rows: List[Dict]) -> int:
+    """Write forecasts with INSERT ... ON CONFLICT (district, blood_group, forecast_date) DO UPDATE"""
+    table = DemandForecast.__table__
+    written = 0
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        stmt = pg_insert(table).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            constraint='unique_forecast',
+            set_={
+                'predicted_demand': stmt.excluded.predicted_demand,
+                'confidence_lower': stmt.excluded.confidence_lower,
+                'confidence_upper': stmt.excluded.confidence_upper,
+                'model_version': stmt.excluded.model_version
+            }
+        )
+        db.session.execute(stmt)
+        written += len(batch)
+    db.session.commit()
+    return written
+
+
+def generate_forecasts(days_ahead: int = 30, lookback_days: int = 90,
+                       start_date: Optional[date] = None,
+                       districts: Optional[List[str]] = None,
+                       blood_groups: Optional[List[str]] = None) -> int:
+    """
+    Forecast demand for every district x blood group over the horizon
+
+    Args:
+        days_ahead: Number of days to forecast
+        lookback_days: History window for the demand features
+        start_date: First forecast date (default: today)
+        districts: Districts to forecast (default: all of Kerala)
+        blood_groups: Blood groups to forecast (default: all)
+
+    Returns:
+        Number of forecasts written
+    """
+    start_date = start_date or date.today()
+    districts = districts or KERALA_DISTRICTS
+    blood_groups = blood_groups or BLOOD_GROUPS
+    forecast_dates = [start_date + timedelta(days=offset) for offset in range(days_ahead)]
+    if not forecast_dates:
+        return 0
+
+    stats = load_historical_stats(lookback_days, today=start_date)
+    features_df = FeatureBuilder.build_demand_forecast_grid(
+        districts, blood_groups, forecast_dates, stats
+    )
+    prediction, _ = model_client.predict('demand_forecast', features_df)
+
+    now = datetime.utcnow()
+    rows = []
+    # Same ordering as the feature grid (district, blood group, date)
+    for (district, blood_group, forecast_date), value in zip(
+        product(districts, blood_groups, forecast_dates), prediction
+    ):
+        predicted_demand = float(value)
+        rows.append({
+            'district': district,
+            'blood_group': blood_group,
+            'forecast_date': forecast_date,
+            'predicted_demand': predicted_demand,
+            'confidence_lower': predicted_demand * 0.8,
+            'confidence_upper': predicted_demand * 1.2,
+            'model_version': MODEL_VERSION,
+            'created_at': now
+        })
+
+    return upsert_forecasts(rows)
@@ -3,12 +3,16 @@ FeatureBuilder - Generate feature vectors for ML models
 Handles feature engineering from database objects
 """
 
-import numpy as np
-import pandas as pd
 from datetime import datetime, date
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 from math import radians, cos, sin, asin, sqrt
 
+# numpy/pandas are imported inside the methods that build arrays/frames so that
+# importing the blueprints (and the ORM listeners in app.ml) stays cheap
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
 
 class FeatureBuilder:
     """Build feature vectors for ML models from DB objects"""
@@ -107,6 +111,20 @@ class FeatureBuilder:
             'is_business_hours': 1 if 9 <= dt.hour <= 17 else 0
         }
     
+    @staticmethod
+    def get_donor_features(donor):
+        """Incrementally maintained aggregates for a donor (None if not yet tracked)"""
+        from flask import current_app
+        from app.models import db
+        from app.ml.feature_store import feature_store
+        try:
+            # Savepoint: a failed lookup must not leave the caller's transaction aborted
+            with db.session.begin_nested():
+                return feature_store.get(donor)
+        except Exception as e:
+            current_app.logger.warning(f"[FEATURES] Donor feature lookup failed: {str(e)}")
+            return None
+    
     @classmethod
     def build_donor_seeker_features(
         cls,
@@ -179,8 +197,9 @@ class FeatureBuilder:
         # Donor history
         days_since_donation = cls.days_since_date(donor.last_donation_date)
         
-        # Calculate total donations (would need DonationHistory query in real implementation)
-        total_donations = 0  # Placeholder - should query DonationHistory
+        # Total donations from the feature store (O(1) lookup)
+        donor_features = cls.get_donor_features(donor)
+        total_donations = donor_features.total_donations if donor_features else 0
         
         features = {
             'time_since_last_donation': min(days_since_donation, 365),
@@ -229,10 +248,13 @@ class FeatureBuilder:
             dob = donor.date_of_birth
             donor_age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
         
+        donor_features = cls.get_donor_features(donor)
+        past_response_times = donor_features.avg_response_time() if donor_features else 24.0
+        
         features = {
             'distance_km': distance,
             'donor_age': float(donor_age),
-            'past_response_times': 24.0,  # Placeholder - should calculate from history
+            'past_response_times': float(past_response_times),
             'urgency_level': float(urgency_score),
             'time_of_day': float(time_features['hour_of_day']),
             'is_weekend': float(time_features['is_weekend'])
@@ -241,26 +263,30 @@ class FeatureBuilder:
         return features
     
     @classmethod
-    def build_reliability_features(cls, donor, donation_history: List) -> Dict[str, float]:
+    def build_reliability_features(cls, donor, donation_history: Optional[List] = None) -> Dict[str, float]:
         """
         Build features for donor reliability scoring
         
         Args:
             donor: Donor object
-            donation_history: List of donation records
+            donation_history: List of donation records (only used when the
+                donor has no feature store row yet)
             
         Returns:
             Feature dictionary
         """
-        total_donations = len(donation_history)
+        donor_features = cls.get_donor_features(donor)
         
-        # Calculate completion and cancellation rates
-        # (This is simplified - real implementation would track match outcomes)
-        completion_rate = 0.85  # Placeholder
-        cancellation_rate = 0.05  # Placeholder
-        
-        # Calculate average response time
-        avg_response_time = 24.0  # Placeholder in hours
+        if donor_features:
+            total_donations = donor_features.total_donations
+            completion_rate = donor_features.completion_rate()
+            cancellation_rate = donor_features.cancellation_rate()
+            avg_response_time = donor_features.avg_response_time()
+        else:
+            total_donations = len(donation_history or [])
+            completion_rate = 0.85  # Defaults until outcomes are tracked
+            cancellation_rate = 0.05
+            avg_response_time = 24.0  # hours
         
         # Calculate tenure
         if hasattr(donor, 'created_at') and donor.created_at:
@@ -270,9 +296,9 @@ class FeatureBuilder:
         
         features = {
             'total_donations': float(total_donations),
-            'completion_rate': completion_rate,
-            'cancellation_rate': cancellation_rate,
-            'average_response_time': avg_response_time,
+            'completion_rate': float(completion_rate),
+            'cancellation_rate': float(cancellation_rate),
+            'average_response_time': float(avg_response_time),
             'tenure_days': float(tenure_days)
         }
         
@@ -284,8 +310,8 @@ class FeatureBuilder:
         district: str,
         blood_group: str,
         forecast_date: date,
-        historical_data: pd.DataFrame
-    ) -> pd.DataFrame:
+        historical_data: 'pd.DataFrame'
+    ) -> 'pd.DataFrame':
         """
         Build features for demand forecasting
         
@@ -298,6 +324,8 @@ class FeatureBuilder:
         Returns:
             Feature DataFrame
         """
+        import pandas as pd
+
         # Time-based features
         features = {
             'district': district,
@@ -321,9 +349,62 @@ class FeatureBuilder:
             features['recent_trend'] = 10.0
         
         return pd.DataFrame([features])
-    
+
+    @classmethod
+    def build_demand_forecast_grid(
+        cls,
+        districts: List[str],
+        blood_groups: List[str],
+        forecast_dates: List[date],
+        historical_stats: Optional['pd.DataFrame'] = None
+    ) -> 'pd.DataFrame':
+        """
+        Build demand forecast features for every district x blood group x date
+
+        Produces the same columns as build_demand_forecast_features, one row
+        per combination, so the whole horizon can be scored in one predict call.
+
+        Args:
+            districts: District names
+            blood_groups: Blood groups
+            forecast_dates: Dates to forecast for
+            historical_stats: Frame indexed by (district, blood_group) with
+                historical_mean, historical_std and recent_trend columns;
+                pairs missing from it get zeros
+
+        Returns:
+            Feature DataFrame
+        """
+        import pandas as pd
+
+        grid = pd.MultiIndex.from_product(
+            [districts, blood_groups, pd.to_datetime(list(forecast_dates))],
+            names=['district', 'blood_group', 'forecast_date']
+        ).to_frame(index=False)
+
+        dates = grid['forecast_date'].dt
+        grid['day_of_week'] = dates.weekday
+        grid['day_of_month'] = dates.day
+        grid['month'] = dates.month
+        grid['quarter'] = dates.quarter
+        grid['is_weekend'] = (dates.weekday >= 5).astype(int)
+
+        defaults = {'historical_mean': 10.0, 'historical_std': 3.0, 'recent_trend': 10.0}
+        if historical_stats is not None and not historical_stats.empty:
+            grid = grid.join(
+                historical_stats[list(defaults)], on=['district', 'blood_group']
+            )
+            # Pairs with no requests in the lookback window had zero demand
+            for column in defaults:
+                grid[column] = grid[column].fillna(0.0)
+        else:
+            for column, default in defaults.items():
+                grid[column] = default
+
+        return grid.drop(columns=['forecast_date'])
+
     @classmethod
-    def features_to_array(cls, features: Dict[str, float], feature_order: List[str]) -> np.ndarray:
+    def features_to_array(cls, features: Dict[str, float], feature_order: List[str]) -> 'np.ndarray':
         """
         Convert feature dictionary to numpy array in specified order
         
@@ -334,9 +415,11 @@ class FeatureBuilder:
         Returns:
             Numpy array of features
         """
+        import numpy as np
         return np.array([[features.get(f, 0.0) for f in feature_order]])
     
     @classmethod
-    def features_to_dataframe(cls, features: Dict[str, float]) -> pd.DataFrame:
+    def features_to_dataframe(cls, features: Dict[str, float]) -> 'pd.DataFrame':
         """Convert feature dictionary to pandas DataFrame"""
+        import pandas as pd
         return pd.DataFrame([features])
@@ -0,0 +1,313 @@
+"""
+DonorFeatureStore - Incremental per-donor feature aggregates
+Keeps the donor_features table in step with donation_history, matches,
+match_predictions and notifications via ORM flush events, so FeatureBuilder
+can read real aggregates with a single primary-key lookup per donor
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from sqlalchemy import event, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import attributes
+
+from app.models import (
+    db, Donor, DonorFeatures, DonationHistory, Match,
+    MatchPrediction, Notification
+)
+
+
+# Time constant (days) for the decayed notification counter
+NOTIFICATION_DECAY_DAYS = 7.0
+
+# Notification types that count as asks to the donor
+NOTIFICATION_TYPES = ('blood_request',)
+
+# Match.status -> DonorFeatures counter column
+MATCH_STATUS_COLUMNS = {
+    'accepted': 'accepted_matches',
+    'completed': 'completed_matches',
+    'declined': 'declined_matches',
+    'rejected': 'declined_matches',
+    'cancelled': 'cancelled_matches',
+}
+
+_table = DonorFeatures.__table__
+
+
+def _bump(connection, donor_id: Optional[int], **deltas):
+    """Upsert a donor_features row, adding `deltas` to its counters"""
+    if not donor_id:
+        return
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    stmt = pg_insert(_table).values(
+        donor_id=donor_id,
+        updated_at=now,
+        **{k: max(v, 0) for k, v in deltas.items()}
+    )
+    set_ = {k: func.greatest(_table.c[k] + v, 0) for k, v in deltas.items()}
+    set_['updated_at'] = now
+    connection.execute(stmt.on_conflict_do_update(index_elements=['donor_id'], set_=set_))
+
+
+def _status_change(target):
+    """Return (old_status, new_status) if Match.status changed in this flush"""
+    hist = attributes.get_history(target, 'status')
+    if not hist.has_changes():
+        return None
+    old = hist.deleted[0] if hist.deleted else None
+    new = hist.added[0] if hist.added else None
+    return old, new
+
+
+# ---------------------------------------------------------------------------
+# Donation history
+# ---------------------------------------------------------------------------
+
+@event.listens_for(DonationHistory, 'after_insert')
+def _donation_inserted(mapper, connection, target):
+    _bump(
+        connection, target.donor_id,
+        total_donations=1,
+        cancelled_donations=1 if target.status == 'cancelled' else 0
+    )
+    if target.donor_id and target.donation_date:
+        connection.execute(
+            _table.update()
+            .where(_table.c.donor_id == target.donor_id)
+            .values(last_donation_at=func.greatest(
+                func.coalesce(_table.c.last_donation_at, target.donation_date),
+                target.donation_date
+            ))
+        )
+
+
+@event.listens_for(DonationHistory, 'after_update')
+def _donation_updated(mapper, connection, target):
+    hist = attributes.get_history(target, 'status')
+    if not hist.has_changes():
+        return
+    old = hist.deleted[0] if hist.deleted else None
+    new = hist.added[0] if hist.added else None
+    delta = (1 if new == 'cancelled' else 0) - (1 if old == 'cancelled' else 0)
+    _bump(connection, target.donor_id, cancelled_donations=delta)
+
+
+@event.listens_for(DonationHistory, 'after_delete')
+def _donation_deleted(mapper, connection, target):
+    _bump(
+        connection, target.donor_id,
+        total_donations=-1,
+        cancelled_donations=-1 if target.status == 'cancelled' else 0
+    )
+
+
+# ---------------------------------------------------------------------------
+# Matches
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Match, 'after_insert')
+def _match_inserted(mapper, connection, target):
+    deltas = {'total_matches': 1}
+    column = MATCH_STATUS_COLUMNS.get(target.status)
+    if column:
+        deltas[column] = 1
+    _bump(connection, target.donor_id, **deltas)
+
+
+@event.listens_for(Match, 'after_update')
+def _match_updated(mapper, connection, target):
+    change = _status_change(target)
+    if not change:
+        return
+    old, new = change
+    deltas: Dict[str, int] = {}
+    if MATCH_STATUS_COLUMNS.get(old):
+        deltas[MATCH_STATUS_COLUMNS[old]] = deltas.get(MATCH_STATUS_COLUMNS[old], 0) - 1
+    if MATCH_STATUS_COLUMNS.get(new):
+        deltas[MATCH_STATUS_COLUMNS[new]] = deltas.get(MATCH_STATUS_COLUMNS[new], 0) + 1
+    _bump(connection, target.donor_id, **deltas)
+
+
+@event.listens_for(Match, 'after_delete')
+def _match_deleted(mapper, connection, target):
+    deltas = {'total_matches': -1}
+    column = MATCH_STATUS_COLUMNS.get(target.status)
+    if column:
+        deltas[column] = -1
+    _bump(connection, target.donor_id, **deltas)
+
+
+# ---------------------------------------------------------------------------
+# Observed response times
+# ---------------------------------------------------------------------------
+
+@event.listens_for(MatchPrediction, 'after_insert')
+def _prediction_inserted(mapper, connection, target):
+    if target.actual_response_time is not None:
+        _bump(
+            connection, target.donor_id,
+            response_time_sum=float(target.actual_response_time),
+            response_time_count=1
+        )
+
+
+@event.listens_for(MatchPrediction, 'after_update')
+def _prediction_updated(mapper, connection, target):
+    hist = attributes.get_history(target, 'actual_response_time')
+    if not hist.has_changes():
+        return
+    old = hist.deleted[0] if hist.deleted else None
+    new = hist.added[0] if hist.added else None
+    _bump(
+        connection, target.donor_id,
+        response_time_sum=float(new or 0) - float(old or 0),
+        response_time_count=(1 if new is not None else 0) - (1 if old is not None else 0)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Notification, 'after_insert')
+def _notification_inserted(mapper, connection, target):
+    if target.type not in NOTIFICATION_TYPES:
+        return
+    now = datetime.utcnow()
+    # Resolve user -> donor inside the statement; non-donor users insert nothing
+    source = select(
+        Donor.id, literal(1.0), literal(now), literal(now)
+    ).where(Donor.user_id == target.user_id)
+    stmt = pg_insert(_table).from_select(
+        ['donor_id', 'recent_notifications', 'recent_notifications_at', 'updated_at'],
+        source
+    )
+    age_seconds = func.extract(
+        'epoch', literal(now) - func.coalesce(_table.c.recent_notifications_at, literal(now))
+    )
+    decayed = _table.c.recent_notifications * func.exp(
+        -age_seconds / (NOTIFICATION_DECAY_DAYS * 86400.0)
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=['donor_id'],
+        set_={
+            'recent_notifications': decayed + 1,
+            'recent_notifications_at': now,
+            'updated_at': now
+        }
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Reads and backfill
+# ---------------------------------------------------------------------------
+
+REBUILD_SQL = """
+INSERT INTO donor_features (
+    donor_id, total_donations, cancelled_donations, last_donation_at,
+    total_matches, accepted_matches, completed_matches, declined_matches, cancelled_matches,
+    response_time_sum, response_time_count,
+    recent_notifications, recent_notifications_at, updated_at
+)
+SELECT d.id,
+       COALESCE(dh.total, 0), COALESCE(dh.cancelled, 0), dh.last_at,
+       COALESCE(m.total, 0), COALESCE(m.accepted, 0), COALESCE(m.completed, 0),
+       COALESCE(m.declined, 0), COALESCE(m.cancelled, 0),
+       COALESCE(mp.rt_sum, 0), COALESCE(mp.rt_count, 0),
+       COALESCE(n.recent, 0), now(), now()
+FROM donors d
+LEFT JOIN (
+    SELECT donor_id,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled,
+           MAX(donation_date) AS last_at
+    FROM donation_history GROUP BY donor_id
+) dh ON dh.donor_id = d.id
+LEFT JOIN (
+    SELECT donor_id,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE status = 'accepted') AS accepted,
+           COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+           COUNT(*) FILTER (WHERE status IN ('declined', 'rejected')) AS declined,
+           COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+    FROM matches GROUP BY donor_id
+) m ON m.donor_id = d.id
+LEFT JOIN (
+    SELECT donor_id,
+           SUM(actual_response_time) AS rt_sum,
+           COUNT(actual_response_time) AS rt_count
+    FROM match_predictions
+    WHERE actual_response_time IS NOT NULL
+    GROUP BY donor_id
+) mp ON mp.donor_id = d.id
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS recent
+    FROM notifications
+    WHERE type = 'blood_request' AND created_at >= now() - interval '7 days'
+    GROUP BY user_id
+) n ON n.user_id = d.user_id
+{where}
+ON CONFLICT (donor_id) DO UPDATE SET
+    total_donations = EXCLUDED.total_donations,
+    cancelled_donations = EXCLUDED.cancelled_donations,
+    last_donation_at = EXCLUDED.last_donation_at,
+    total_matches = EXCLUDED.total_matches,
+    accepted_matches = EXCLUDED.accepted_matches,
+    completed_matches = EXCLUDED.completed_matches,
+    declined_matches = EXCLUDED.declined_matches,
+    cancelled_matches = EXCLUDED.cancelled_matches,
+    response_time_sum = EXCLUDED.response_time_sum,
+    response_time_count = EXCLUDED.response_time_count,
+    recent_notifications = EXCLUDED.recent_notifications,
+    recent_notifications_at = EXCLUDED.recent_notifications_at,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+class DonorFeatureStore:
+    """Read access and backfill for donor_features"""
+
+    @staticmethod
+    def get(donor) -> Optional[DonorFeatures]:
+        """Feature row for a Donor (or donor id); uses the eager-loaded relationship when present"""
+        if isinstance(donor, Donor):
+            return donor.features
+        return db.session.get(DonorFeatures, donor)
+
+    @staticmethod
+    def get_many(donor_ids: Iterable[int]) -> Dict[int, DonorFeatures]:
+        """Feature rows for many donors in one query"""
+        ids = list({int(d) for d in donor_ids if d is not None})
+        if not ids:
+            return {}
+        rows = DonorFeatures.query.filter(DonorFeatures.donor_id.in_(ids)).all()
+        return {row.donor_id: row for row in rows}
+
+    @staticmethod
+    def rebuild(donor_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute aggregates from source tables
+
+        Args:
+            donor_ids: Restrict the rebuild to these donors (default: all)
+
+        Returns:
+            Number of rows written
+        """
+        params = {}
+        where = ''
+        if donor_ids is not None:
+            params['ids'] = list(donor_ids)
+            if not params['ids']:
+                return 0
+            where = 'WHERE d.id = ANY(:ids)'
+        result = db.session.execute(text(REBUILD_SQL.format(where=where)), params)
+        db.session.commit()
+        return result.rowcount
+
+
+feature_store = DonorFeatureStore()
@@ -5,7 +5,6 @@ Handles loading, caching, and hot-reloading of ML models
 
 import os
 import json
-import joblib
 import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -14,7 +13,7 @@ from flask import current_app
 import gzip
 import pickle
 import glob
-from huggingface_hub import hf_hub_download
+from app.services.metrics import metrics, MODEL_LOAD_SECONDS, MODEL_INFERENCE_SECONDS
 
 
 class ModelClient:
@@ -82,7 +81,9 @@ class ModelClient:
         
         # Check cache
         if model_key in self.models and not force_reload:
+            metrics.record_cache('model', hit=True)
             return self.models[model_key]
+        metrics.record_cache('model', hit=False)
         
         # Get model metadata
         if model_key not in self.model_metadata:
@@ -99,11 +100,14 @@ class ModelClient:
         # If Hugging Face details are provided in metadata, download via hf_hub
         if hf_repo_id and hf_filename:
             try:
+                from huggingface_hub import hf_hub_download
+                import joblib
                 token = os.environ.get("HUGGINGFACE_HUB_TOKEN")
                 start_time = datetime.now()
                 local_path = hf_hub_download(repo_id=hf_repo_id, filename=hf_filename, use_auth_token=token)
                 model = joblib.load(local_path)
                 load_time = (datetime.now() - start_time).total_seconds() * 1000
+                MODEL_LOAD_SECONDS.observe(load_time / 1000.0, model=model_key)
                 with self._lock:
                     self.models[model_key] = model
                 current_app.logger.info(
@@ -123,11 +127,14 @@ class ModelClient:
                 if len(repo_and_file) != 2:
                     raise ValueError(f"Invalid HF artifact_path format: {artifact_path}")
                 repo_id, filename = repo_and_file
+                from huggingface_hub import hf_hub_download
+                import joblib
                 token = os.environ.get("HUGGINGFACE_HUB_TOKEN")
                 start_time = datetime.now()
                 local_path = hf_hub_download(repo_id=repo_id, filename=filename, use_auth_token=token)
                 model = joblib.load(local_path)
                 load_time = (datetime.now() - start_time).total_seconds() * 1000
+                MODEL_LOAD_SECONDS.observe(load_time / 1000.0, model=model_key)
                 with self._lock:
                     self.models[model_key] = model
                 current_app.logger.info(
@@ -175,14 +182,20 @@ class ModelClient:
         
         # Load model with thread safety
         with self._lock:
+            # A concurrent caller (e.g. the startup preload thread) may have
+            # loaded it while we waited for the lock
+            if model_key in self.models and not force_reload:
+                return self.models[model_key]
             try:
                 start_time = datetime.now()
                 if gzip_path is not None:
                     with gzip.open(gzip_path, 'rb') as f:
                         model = pickle.load(f)
                 else:
+                    import joblib
                     model = joblib.load(full_path)
                 load_time = (datetime.now() - start_time).total_seconds() * 1000
+                MODEL_LOAD_SECONDS.observe(load_time / 1000.0, model=model_key)
                 
                 self.models[model_key] = model
                 
@@ -215,6 +228,7 @@ class ModelClient:
             start_time = datetime.now()
             prediction = model.predict(features, **kwargs)
             inference_time = (datetime.now() - start_time).total_seconds() * 1000
+            MODEL_INFERENCE_SECONDS.observe(inference_time / 1000.0, model=model_key, method='predict')
             
             current_app.logger.debug(
                 f"[MODEL CLIENT] Prediction for '{model_key}' "
@@ -249,6 +263,7 @@ class ModelClient:
             start_time = datetime.now()
             probabilities = model.predict_proba(features)
             inference_time = (datetime.now() - start_time).total_seconds() * 1000
+            MODEL_INFERENCE_SECONDS.observe(inference_time / 1000.0, model=model_key, method='predict_proba')
             
             current_app.logger.debug(
                 f"[MODEL CLIENT] Probability prediction for '{model_key}' "
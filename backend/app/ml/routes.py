@@ -4,14 +4,15 @@ ML API Routes - Endpoints for ML model predictions
 
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
-import numpy as np
+from sqlalchemy.orm import selectinload
 
 from app.models import (
     db, Donor, Request, Hospital, MatchPrediction,
-    ModelPredictionLog, DonationHistory, User
+    DonationHistory, User
 )
 from app.ml.model_client import model_client
 from app.ml.feature_builder import FeatureBuilder
+from app.services.prediction_log_service import log_prediction
 
 ml_bp = Blueprint('ml', __name__, url_prefix='/api/ml')
 
@@ -92,7 +93,7 @@ def match_donors():
                 FeatureBuilder.BLOOD_COMPATIBILITY.get(blood_request.blood_group, [])
             ),
             User.status == 'active'
-        ).all()
+        ).options(selectinload(Donor.features)).all()
         
         if not compatible_donors:
             return jsonify({
@@ -181,17 +182,15 @@ def match_donors():
         # Calculate total inference time
         total_time = (datetime.now() - start_time).total_seconds() * 1000
         
-        # Log prediction
-        log_entry = ModelPredictionLog()  # type: ignore[call-arg]
-        log_entry.model_name = 'donor_matching_pipeline'  # type: ignore[misc]
-        log_entry.model_version = '1.0.0'  # type: ignore[misc]
-        log_entry.endpoint = '/api/ml/match'  # type: ignore[misc]
-        log_entry.input_data = {'request_id': request_id, 'top_k': top_k}  # type: ignore[misc]
-        log_entry.prediction_output = {'matches_count': len(predictions[:top_k])}  # type: ignore[misc]
-        log_entry.inference_time_ms = total_time  # type: ignore[misc]
-        log_entry.success = True  # type: ignore[misc]
-        db.session.add(log_entry)
-        db.session.commit()
+        # Log prediction (buffered, written in the background)
+        log_prediction(
+            'donor_matching_pipeline',
+            endpoint='/api/ml/match',
+            input_data={'request_id': request_id, 'top_k': top_k},
+            prediction_output={'matches_count': len(predictions[:top_k])},
+            inference_time_ms=total_time,
+            success=True
+        )
         
         # Remove features from response
         for pred in predictions[:top_k]:
@@ -209,17 +208,15 @@ def match_donors():
         
         # Log failed prediction
         try:
-            log_entry = ModelPredictionLog()  # type: ignore[call-arg]
-            log_entry.model_name = 'donor_matching_pipeline'  # type: ignore[misc]
-            log_entry.model_version = '1.0.0'  # type: ignore[misc]
-            log_entry.endpoint = '/api/ml/match'  # type: ignore[misc]
-            log_entry.input_data = data  # type: ignore[misc]
-            log_entry.prediction_output = None  # type: ignore[misc]
-            log_entry.inference_time_ms = 0  # type: ignore[misc]
-            log_entry.success = False  # type: ignore[misc]
-            log_entry.error_message = str(e)  # type: ignore[misc]
-            db.session.add(log_entry)
-            db.session.commit()
+            log_prediction(
+                'donor_matching_pipeline',
+                endpoint='/api/ml/match',
+                input_data=data,
+                prediction_output=None,
+                inference_time_ms=0,
+                success=False,
+                error_message=str(e)
+            )
         except:
             pass
         
@@ -227,6 +227,7 @@ class MatchPrediction(db.Model):
     notified = db.Column(db.Boolean, default=False)
     actual_response_time = db.Column(db.Float)  # For model evaluation
     
+    # Monthly RANGE partition key (see app/services/partitioning.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -277,6 +278,7 @@ class ModelPredictionLog(db.Model):
     success = db.Column(db.Boolean, default=True)
     error_message = db.Column(db.Text)
     
+    # Monthly RANGE partition key (see app/services/partitioning.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
@@ -292,7 +294,97 @@ class Notification(db.Model):
     data = db.Column(db.JSON)  # Additional data (request_id, match_id, token, etc.)
     is_read = db.Column(db.Boolean, default=False)
     read_at = db.Column(db.DateTime)
+    # Monthly RANGE partition key (see app/services/partitioning.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship
     user = db.relationship("User", backref="notifications")
+
+    # Inbox feed (keyset on created_at, id) and unread-only scans
+    __table_args__ = (
+        db.Index('ix_notifications_user_feed', 'user_id', 'created_at', 'id'),
+        db.Index('ix_notifications_user_unread', 'user_id', 'created_at',
+                 postgresql_where=db.text('is_read = false')),
+    )
+
+
+class NotificationCounter(db.Model):
+    """Per-user unread notification count (see app/services/notification_inbox.py)"""
+    __tablename__ = "notification_counters"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ArchivedNotification(db.Model):
+    """Read notifications moved out of the notifications table after NOTIFICATION_ARCHIVE_DAYS"""
+    __tablename__ = "notifications_archive"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # id from notifications
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    type = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    data = db.Column(db.JSON)
+    read_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class DonorFeatures(db.Model):
+    """Per-donor ML feature aggregates, maintained incrementally (see app/ml/feature_store.py)"""
+    __tablename__ = "donor_features"
+
+    donor_id = db.Column(db.Integer, db.ForeignKey("donors.id", ondelete="CASCADE"), primary_key=True)
+
+    # Donation history
+    total_donations = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_donations = db.Column(db.Integer, nullable=False, default=0)
+    last_donation_at = db.Column(db.DateTime)
+
+    # Match outcomes
+    total_matches = db.Column(db.Integer, nullable=False, default=0)
+    accepted_matches = db.Column(db.Integer, nullable=False, default=0)
+    completed_matches = db.Column(db.Integer, nullable=False, default=0)
+    declined_matches = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_matches = db.Column(db.Integer, nullable=False, default=0)
+
+    # Response time (from MatchPrediction.actual_response_time, hours)
+    response_time_sum = db.Column(db.Float, nullable=False, default=0.0)
+    response_time_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Exponentially decayed count of blood request notifications
+    recent_notifications = db.Column(db.Float, nullable=False, default=0.0)
+    recent_notifications_at = db.Column(db.DateTime)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    donor = db.relationship("Donor", backref=db.backref("features", uselist=False, passive_deletes=True))
+
+    def completion_rate(self, default=0.85):
+        """Share of matches the donor accepted or completed"""
+        if not self.total_matches:
+            return default
+        return (self.accepted_matches + self.completed_matches) / self.total_matches
+
+    def cancellation_rate(self, default=0.05):
+        """Share of matches the donor declined or cancelled"""
+        if not self.total_matches:
+            return default
+        return (self.declined_matches + self.cancelled_matches) / self.total_matches
+
+    def avg_response_time(self, default=24.0):
+        """Mean observed response time in hours"""
+        if not self.response_time_count:
+            return default
+        return self.response_time_sum / self.response_time_count
+
+    def recent_notification_count(self, now=None, decay_days=7.0):
+        """Notification count decayed to `now` (roughly the last `decay_days` days)"""
+        if not self.recent_notifications or not self.recent_notifications_at:
+            return 0.0
+        import math
+        now = now or datetime.utcnow()
+        age_days = max((now - self.recent_notifications_at).total_seconds(), 0) / 86400.0
+        return self.recent_notifications * math.exp(-age_days / decay_days)
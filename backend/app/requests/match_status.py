@@ -9,6 +9,7 @@ from app.models import Request, MatchPrediction, Donor, User
 from app.extensions import db
 from datetime import datetime
 from sqlalchemy import and_
+from app.services.match_events import match_events
 
 
 def get_match_status(request_id, since=None):
@@ -60,8 +61,9 @@ def get_match_status(request_id, since=None):
             MatchPrediction.request_id == request_id
         ).count()
         
-        # Determine status
-        status = determine_search_status(req, total_count)
+        # Determine status (from the search's own events when it published any)
+        last_event = match_events.last_search_event(request_id)
+        status = determine_search_status(req, total_count, last_event)
         
         # Build matched donors array
         matched = []
@@ -128,7 +130,7 @@ def get_match_status(request_id, since=None):
             "matched": matched,
             "updated_at": datetime.utcnow().isoformat() + 'Z',
             "search_metadata": {
-                "radius_km": 20.0,  # Default from geofencing
+                "radius_km": (last_event or {}).get('data', {}).get('radius_km', 20.0),  # Default from geofencing
                 "blood_group": req.blood_group,
                 "units_required": req.units_required,
                 "urgency": req.urgency,
@@ -143,12 +145,26 @@ def get_match_status(request_id, since=None):
         return {"error": "Failed to get match status", "details": str(e)}, 500
 
 
-def determine_search_status(request, match_count):
+def determine_search_status(request, match_count, last_event=None):
     """
     Determine current status of donor search
     
+    Args:
+        last_event: Latest search lifecycle event from match_events, if any
+    
     Returns: "pending" | "running" | "done" | "none_found" | "failed"
     """
+    if last_event:
+        if last_event['event'] == 'search_failed':
+            return "failed"
+        if last_event['event'] == 'search_completed':
+            return "done" if match_count else "none_found"
+        started_at = datetime.fromisoformat(last_event['at'].rstrip('Z'))
+        if (datetime.utcnow() - started_at).total_seconds() < 120:
+            return "running"  # started or expanded, not finished yet
+        # Worker died without reporting: fall back to the heuristics below
+    
+    # No events (search ran before events existed): infer from timing
     # Check if request is very recent (< 5 seconds) and has no matches yet
     age_seconds = (datetime.utcnow() - request.created_at).total_seconds()
     
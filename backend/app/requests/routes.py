@@ -1,12 +1,15 @@
 # backend/app/requests/routes.py
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from app.extensions import db
 from app.models import Request, User, Donor, Hospital
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from sqlalchemy import and_
 from .match_status import get_match_status
+from app.services.match_events import match_events
+import json
+import queue
 import threading
+import time
 
 req_bp = Blueprint("requests", __name__, url_prefix="/api/requests")
 
@@ -393,6 +396,77 @@ def get_request_match_status(request_id):
         return jsonify({"error": "Failed to get match status", "details": str(e)}), 500
 
 
+@req_bp.route("/<int:request_id>/match-events", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def stream_match_events(request_id):
+    """
+    Server-Sent Events stream of donor matching progress (replaces polling match-status)
+    
+    EventSource cannot send headers, so the token may be passed as ?jwt=<token>.
+    Resumes after the Last-Event-ID header (sent by EventSource on reconnect) or ?after=<id>.
+    
+    Each event: "id: <seq>", "event: <name>", "data: {id, event, data, at}"
+    (search_started, candidates_found, scored, donor_notified, search_completed,
+    search_failed, search_expanded, donor_accepted, donor_declined)
+    """
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    
+    blood_request = Request.query.get(request_id)
+    if not blood_request:
+        return jsonify({"error": "Request not found"}), 404
+    
+    if user.role not in ['admin'] and blood_request.seeker_id != int(user_id):
+        return jsonify({"error": "Unauthorized access to this request"}), 403
+    
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.args.get('after') or 0)
+    except ValueError:
+        after = 0
+    stream_seconds = current_app.config.get('MATCH_EVENTS_STREAM_SECONDS', 300)
+    keepalive = current_app.config.get('MATCH_EVENTS_KEEPALIVE_SECONDS', 15)
+    
+    # Authorized once; the stream itself never touches the database
+    db.session.remove()
+    
+    def format_event(entry):
+        return f"id: {entry['id']}\nevent: {entry['event']}\ndata: {json.dumps(entry)}\n\n"
+    
+    def generate():
+        last_id = after
+        deadline = time.monotonic() + stream_seconds
+        # Subscribe before reading history so nothing published in between is lost
+        with match_events.subscribe(request_id) as events:
+            yield "retry: 3000\n\n"
+            for entry in match_events.history(request_id, after=last_id):
+                last_id = entry['id']
+                yield format_event(entry)
+            
+            while time.monotonic() < deadline:
+                try:
+                    entry = events.get(timeout=min(keepalive, max(deadline - time.monotonic(), 0.1)))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if entry['id'] <= last_id:
+                    continue  # already sent from history
+                if entry['id'] > last_id + 1:
+                    # Missed some (queue overflow): fill the gap from history
+                    backlog = match_events.history(request_id, after=last_id)
+                else:
+                    backlog = [entry]
+                for item in backlog:
+                    last_id = item['id']
+                    yield format_event(item)
+    
+    response = current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: do not buffer the stream
+    return response
+
+
 @req_bp.route("/<int:request_id>/retry-matching", methods=["POST"])
 @jwt_required()
 def retry_matching(request_id):
@@ -484,6 +558,7 @@ def expand_search(request_id):
                 kwargs={'radius_km': radius_km, 'top_k': 15},  # More donors for wider radius
                 countdown=1
             )
+            match_events.publish(request_id, 'search_expanded', {'radius_km': radius_km})
             
             return jsonify({
                 "message": f"Search expanded to {radius_km} km",
@@ -522,63 +597,70 @@ def notify_emergency(request_id):
         if user.role not in ['admin'] and blood_request.seeker_id != int(user_id):
             return jsonify({"error": "Unauthorized"}), 403
         
-        # Get all active hospitals in the district
-        from app.services.email_service import email_service
-        from app.services.sms_service import sms_service
+        # Fan-out runs in the background over pooled SMTP connections
+        from app.services.emergency_broadcast import emergency_broadcast
         
-        hospital = None
-        if blood_request.hospital_id:
-            hospital = Hospital.query.get(blood_request.hospital_id)
+        broadcast = emergency_broadcast.start(blood_request, int(user_id))
+        current_app.logger.info(
+            f"Emergency broadcast {broadcast['broadcast_id']} queued for request {request_id}"
+        )
         
-        # Find nearby hospitals (same district or neighboring)
-        target_hospitals = []
-        if hospital:
-            target_hospitals = Hospital.query.filter(
-                and_(
-                    Hospital.is_active == True,
-                    Hospital.id != hospital.id,
-                    Hospital.district.in_([hospital.district, hospital.city])
-                )
-            ).limit(10).all()
-        else:
-            target_hospitals = Hospital.query.filter(
-                Hospital.is_active == True
-            ).limit(10).all()
-        
-        # Send emergency notifications
-        notifications_sent = 0
-        for target_hosp in target_hospitals:
-            if target_hosp.email:
-                try:
-                    email_service.send_email(
-                        to=target_hosp.email,
-                        subject=f"URGENT: {blood_request.blood_group} Blood Needed",
-                        html=f"""
-                        <h2>Emergency Blood Request</h2>
-                        <p>A nearby hospital urgently needs blood:</p>
-                        <ul>
-                            <li><strong>Blood Group:</strong> {blood_request.blood_group}</li>
-                            <li><strong>Units Required:</strong> {blood_request.units_required}</li>
-                            <li><strong>Urgency:</strong> {blood_request.urgency.upper()}</li>
-                            <li><strong>Required By:</strong> {blood_request.required_by.strftime('%Y-%m-%d %H:%M') if blood_request.required_by else 'ASAP'}</li>
-                            <li><strong>Contact:</strong> {blood_request.contact_person} - {blood_request.contact_phone}</li>
-                        </ul>
-                        <p>Please check your blood bank inventory and respond if you can help.</p>
-                        <p><small>Smart Blood Connect - Emergency Network</small></p>
-                        """
-                    )
-                    notifications_sent += 1
-                except Exception as e:
-                    current_app.logger.error(f"Failed to notify hospital {target_hosp.id}: {str(e)}")
+        return jsonify({
+            "message": "Emergency broadcast queued",
+            "request_id": request_id,
+            "broadcast_id": broadcast['broadcast_id'],
+            "status": broadcast['status'],
+            "status_url": f"/api/requests/{request_id}/notify-emergency/{broadcast['broadcast_id']}"
+        }), 202
         
-        current_app.logger.info(f"Emergency notification sent for request {request_id} to {notifications_sent} hospitals")
+    except Exception as e:
+        current_app.logger.error(f"Error in notify-emergency endpoint: {str(e)}")
+        return jsonify({"error": "Failed to send emergency notification", "details": str(e)}), 500
+
+
+@req_bp.route("/<int:request_id>/notify-emergency/<broadcast_id>", methods=["GET"])
+@jwt_required()
+def emergency_broadcast_status(request_id, broadcast_id):
+    """
+    Delivery progress of an emergency broadcast
+    Returns status (queued, sending, completed, partial, failed), counts and per-hospital results
+    """
+    try:
+        user_id = get_jwt_identity()
+        user = User.query.get(user_id)
+        
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        
+        from app.services.emergency_broadcast import emergency_broadcast
+        
+        broadcast = emergency_broadcast.get(broadcast_id)
+        if not broadcast or broadcast['request_id'] != request_id:
+            return jsonify({"error": "Broadcast not found"}), 404
         
+        # Authorization check
+        if user.role not in ['admin'] and broadcast['requested_by'] != int(user_id):
+            return jsonify({"error": "Unauthorized"}), 403
+        
+        targets = [
+            {"hospital_id": int(hospital_id), **target}
+            for hospital_id, target in broadcast['targets'].items()
+        ]
         return jsonify({
-            "message": "Emergency network notified",
+            "broadcast_id": broadcast_id,
             "request_id": request_id,
-            "hospitals_notified": notifications_sent
+            "status": broadcast['status'],
+            "total": broadcast['total'],
+            "sent": broadcast['sent'],
+            "failed": broadcast['failed'],
+            "pending": broadcast['total'] - broadcast['sent'] - broadcast['failed'],
+            "targets": targets,
+            "error": broadcast.get('error'),
+            "created_at": broadcast['created_at'].isoformat() if broadcast['created_at'] else None,
+            "started_at": broadcast['started_at'].isoformat() if broadcast['started_at'] else None,
+            "completed_at": broadcast['completed_at'].isoformat() if broadcast['completed_at'] else None
         }), 200
         
     except Exception as e:
-        current_app.logger.error(f"Error in notify-emergency endpoint: {str(e)}")
-        return jsonify({"error": "Failed to send emergency notification", "details": str(e)}), 500
+        current_app.logger.error(f"Error in emergency broadcast status endpoint: {str(e)}")
+        return jsonify({"error": "Failed to get broadcast status", "details": str(e)}), 500
@@ -0,0 +1,217 @@
+"""
+Background certificate generation
+
+submit() records a job and hands its certificates to a pool of worker
+processes (CERTIFICATE_WORKERS, spawned on first use), so the request
+thread never runs ReportLab. Certificates are sent in chunks; each worker
+keeps the static background layout cached between chunks. Finished chunks
+update the job record and write certificate_number/url/generated_at for
+their donations with one bulk UPDATE.
+
+Certificate numbers and filenames are fixed at submit time, so callers can
+hand out the final URL straight away (the download route answers 202 with
+Retry-After and the job's status URL while the file is still being rendered).
+
+Job records live in the shared expiring store for JOB_TTL, indexed by
+donation and by filename. Per-donor donation/certificate counts for the
+certificate list are cached there too and dropped whenever they change.
+"""
+
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import func, update
+
+from app.models import db, DonationHistory
+from app.services.expiring_store import get_expiring_store
+
+NAMESPACE = 'certificate_job'
+JOB_TTL = timedelta(hours=24)
+COUNTS_NAMESPACE = 'certificate_count'
+COUNTS_TTL = timedelta(minutes=10)
+
+
+class CertificateJobService:
+    """Runs certificate jobs on a process pool and reports their progress"""
+
+    def __init__(self):
+        self.workers = 2
+        self.chunk_size = 25
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.workers = app.config.get('CERTIFICATE_WORKERS', self.workers)
+        self.chunk_size = app.config.get('CERTIFICATE_CHUNK_SIZE', self.chunk_size)
+
+    def _pool(self):
+        """Executor for this process (recreated after fork); 0 workers = one thread"""
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    if self.workers:
+                        from app.services.certificate_service import get_static_layer
+                        ctx = multiprocessing.get_context('spawn')
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers, mp_context=ctx, initializer=get_static_layer
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='certificates')
+                    self._pid = pid
+        return self._executor
+
+    def submit(self, items: List[Dict], requested_by: int, kind: str = 'single') -> Dict:
+        """
+        Record a job and queue its certificates
+
+        Args:
+            items: donation_data dicts (see build_donation_data)
+            requested_by: User ID of the requester
+            kind: "single" or "bulk"
+
+        Returns:
+            The job record (status "queued", certificate numbers assigned)
+        """
+        # ReportLab/PIL load on the first job, not when the app starts
+        from app.services.certificate_service import (
+            generate_certificate_number, get_certificate_service, render_certificates
+        )
+
+        job_id = secrets.token_hex(8)
+        now = datetime.utcnow()
+        certificates = {}
+        for data in items:
+            data['certificate_number'] = data.get('certificate_number') or generate_certificate_number(
+                data['donation_id'], data['hospital_id'], data['donor_id'])
+            certificates[str(data['donation_id'])] = {
+                'certificate_number': data['certificate_number'],
+                'filename': f"{data['certificate_number']}.pdf",
+                'status': 'pending',
+                'error': None
+            }
+        record = {
+            'job_id': job_id,
+            'kind': kind,
+            'requested_by': requested_by,
+            'status': 'queued' if items else 'completed',
+            'total': len(items),
+            'done': 0,
+            'failed': 0,
+            'certificates': certificates,
+            'created_at': now,
+            'completed_at': None if items else now
+        }
+        indexes = [f"donation:{donation_id}" for donation_id in certificates]
+        indexes += [f"file:{c['filename']}" for c in certificates.values()]
+        store = get_expiring_store()
+        store.put(NAMESPACE, job_id, record, now + JOB_TTL, indexes=indexes)
+
+        app = current_app._get_current_object()
+        certificates_dir = get_certificate_service().certificates_dir
+        pool = self._pool()
+        for start in range(0, len(items), self.chunk_size):
+            chunk = items[start:start + self.chunk_size]
+            future = pool.submit(render_certificates, certificates_dir, chunk)
+            future.add_done_callback(self._recorder(app, job_id, chunk))
+        return record
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return get_expiring_store().get(NAMESPACE, job_id)
+
+    def pending_for_donation(self, donation_id: int) -> Optional[Dict]:
+        """Live job still rendering this donation's certificate, if any"""
+        return self._pending(f"donation:{donation_id}", lambda c, key: key == str(donation_id))
+
+    def pending_for_file(self, filename: str) -> Optional[Dict]:
+        """Live job still rendering this file, if any"""
+        return self._pending(f"file:{filename}", lambda c, key: c['filename'] == filename)
+
+    def counts_for_donor(self, donor_id: int) -> Dict[str, int]:
+        """Donations and generated certificates for a donor (cached for COUNTS_TTL)"""
+        store = get_expiring_store()
+        counts = store.get(COUNTS_NAMESPACE, str(donor_id))
+        if counts is None:
+            donations, certificates = db.session.query(
+                func.count(DonationHistory.id),
+                func.count(DonationHistory.certificate_url)
+            ).filter(DonationHistory.donor_id == donor_id).one()
+            counts = {'donations': donations, 'certificates': certificates}
+            store.put(COUNTS_NAMESPACE, str(donor_id), counts, datetime.utcnow() + COUNTS_TTL)
+        return counts
+
+    def invalidate_counts(self, donor_id: int):
+        get_expiring_store().delete(COUNTS_NAMESPACE, str(donor_id))
+
+    def _pending(self, index, match):
+        store = get_expiring_store()
+        for job in store.get_many(NAMESPACE, store.keys_for(NAMESPACE, index)).values():
+            for key, certificate in job['certificates'].items():
+                if match(certificate, key) and certificate['status'] == 'pending':
+                    return job
+        return None
+
+    def _recorder(self, app, job_id: str, chunk: List[Dict]):
+        """Done callback for one chunk: save successes, then update the job record"""
+        def on_done(future):
+            try:
+                results = future.result()
+            except Exception as e:  # worker died or pool shut down
+                results = [(data['donation_id'], None, str(e)) for data in chunk]
+
+            numbers = {data['donation_id']: data['certificate_number'] for data in chunk}
+            generated_at = datetime.utcnow()
+            rows = [
+                {
+                    'id': donation_id,
+                    'certificate_number': numbers[donation_id],
+                    'certificate_url': filename,  # Store just filename, not full path
+                    'certificate_generated_at': generated_at
+                }
+                for donation_id, filename, error in results if filename
+            ]
+            with app.app_context():
+                if rows:
+                    try:
+                        db.session.execute(update(DonationHistory), rows)
+                        db.session.commit()
+                    except Exception as e:
+                        db.session.rollback()
+                        app.logger.error(f"[CERT] Job {job_id}: failed to save {len(rows)} certificates: {e}")
+                        results = [(donation_id, None, error or str(e)) for donation_id, _, error in results]
+                    else:
+                        saved = {row['id'] for row in rows}
+                        for donor_id in {data['donor_id'] for data in chunk if data['donation_id'] in saved}:
+                            self.invalidate_counts(donor_id)
+
+                def apply(meta):
+                    for donation_id, filename, error in results:
+                        certificate = meta['certificates'].get(str(donation_id))
+                        if certificate is None or certificate['status'] != 'pending':
+                            continue
+                        certificate['status'] = 'done' if filename else 'failed'
+                        certificate['error'] = error
+                        meta['done' if filename else 'failed'] += 1
+                    if meta['done'] + meta['failed'] >= meta['total']:
+                        meta['status'] = 'completed' if meta['failed'] == 0 else (
+                            'partial' if meta['done'] else 'failed')
+                        meta['completed_at'] = datetime.utcnow()
+                    else:
+                        meta['status'] = 'running'
+                get_expiring_store().update(NAMESPACE, job_id, apply)
+
+                failed = sum(1 for _, filename, _ in results if not filename)
+                if failed:
+                    app.logger.warning(f"[CERT] Job {job_id}: {failed} of {len(results)} certificates failed")
+        return on_done
+
+
+# Global instance
+certificate_jobs = CertificateJobService()
@@ -8,7 +8,9 @@ from datetime import datetime, timedelta
 from math import radians, cos, sin, asin, sqrt
 from flask import current_app
 from sqlalchemy import and_, or_
-from app.models import Donor, Request, User, Hospital, Match, MatchPrediction
+from sqlalchemy.orm import selectinload
+from app.models import Donor, Request, User, Hospital, Match
+from app.ml.feature_store import feature_store
 from app.services.ml_service import (
     predict_donor_availability,
     predict_response_time,
@@ -145,8 +147,10 @@ def select_candidate_donors(
             )
         )
     
-    # Limit results for better performance
-    candidates = candidates_query.limit(100).all()  # Limit to 100 candidates
+    # Limit results for better performance; feature rows load in one extra query
+    candidates = candidates_query.options(
+        selectinload(Donor.features)
+    ).limit(100).all()  # Limit to 100 candidates
     
     # Calculate exact distances and filter
     candidates_with_distance = []
@@ -251,17 +255,14 @@ def extract_features(
         else:
             days_since_last = (datetime.utcnow() - donor.last_donation_date).days
     
-    # Recent notifications count (last 7 days)
-    recent_notifications = MatchPrediction.query.filter(
-        and_(
-            MatchPrediction.donor_id == donor.id,
-            MatchPrediction.notified == True,
-            MatchPrediction.created_at >= datetime.utcnow() - timedelta(days=7)
-        )
-    ).count()
-    
-    # Total donations
-    total_donations = getattr(donor, 'total_donations', 0)
+    # Recent notifications (last ~7 days) and total donations from the feature store
+    donor_features = feature_store.get(donor)
+    if donor_features:
+        recent_notifications = round(donor_features.recent_notification_count(), 2)
+        total_donations = donor_features.total_donations
+    else:
+        recent_notifications = 0
+        total_donations = 0
     
     # Reliability score (0-1)
     reliability = getattr(donor, 'reliability_score', 0.5)
@@ -0,0 +1,462 @@
+"""
+Email delivery: pooled persistent SMTP connections and a background send queue
+
+Request handlers hand a built message to email_delivery.send() and return;
+worker threads drain the queue in batches, sending each batch over one
+authenticated SMTP session taken from a small pool. Transient failures
+(disconnects, timeouts, 4xx replies) are retried with exponential backoff.
+
+Inside Celery tasks messages are sent inline over the same pool, since a
+prefork child may exit before a background queue drains; inline sends retry
+transient failures in place, fewer times (EMAIL_INLINE_MAX_RETRIES).
+"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import os
+import queue
+import random
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app.config.email_config import EmailConfig
+from app.services.metrics import metrics, EMAIL_SEND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DELIVERIES = metrics.counter(
+    'email_deliveries_total', 'Emails by final outcome', ['kind', 'outcome']
+)
+EMAIL_QUEUE_DEPTH = metrics.gauge(
+    'email_queue_depth', 'Emails waiting in the delivery queue (incl. scheduled retries)', mode='max'
+)
+
+
+@dataclass
+class OutgoingEmail:
+    """One queued message"""
+    to: str
+    message: Message
+    kind: str = 'generic'
+    attempts: int = 0
+    queued_at: float = field(default_factory=time.monotonic)
+    # Called once with (delivered, error) when the message is sent or given up on
+    on_done: Optional[Callable[[bool, Optional[str]], None]] = None
+
+
+@dataclass
+class _PooledConnection:
+    smtp: smtplib.SMTP
+    created_at: float
+    last_used: float
+    sent: int = 0
+
+
+def _is_transient(error: Exception) -> bool:
+    """Retry disconnects, timeouts and 4xx replies; 5xx replies are final"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return _breaks_connection(error)
+
+
+def _breaks_connection(error: Exception) -> bool:
+    """Socket-level failures; SMTPException subclasses OSError but leaves the session usable"""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class SMTPConnectionPool:
+    """Bounded pool of logged-in SMTP sessions, reused across messages"""
+
+    def __init__(self, size: int = 2, idle_seconds: float = 30.0,
+                 max_messages: int = 100, timeout: float = 20.0):
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_PooledConnection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _connect(self) -> _PooledConnection:
+        context = ssl.create_default_context()
+        if EmailConfig.SMTP_USE_SSL:
+            smtp = smtplib.SMTP_SSL(EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT,
+                                    context=context, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT, timeout=self.timeout)
+            smtp.ehlo()
+            if EmailConfig.SMTP_USE_TLS:
+                smtp.starttls(context=context)
+                smtp.ehlo()
+        if EmailConfig.SENDER_PASSWORD:
+            smtp.login(EmailConfig.SENDER_EMAIL, EmailConfig.SENDER_PASSWORD)
+        now = time.monotonic()
+        return _PooledConnection(smtp=smtp, created_at=now, last_used=now)
+
+    @staticmethod
+    def _close(conn: _PooledConnection):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            try:
+                conn.smtp.close()
+            except Exception:
+                pass
+
+    def _checkout_idle(self) -> Optional[_PooledConnection]:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Sockets inherited across a fork belong to the parent
+                self._idle = []
+                self._pid = os.getpid()
+            return self._idle.pop() if self._idle else None
+
+    @contextmanager
+    def connection(self):
+        """Yield a live session; it goes back to the pool unless it broke"""
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout_idle()
+            if conn is not None and time.monotonic() - conn.last_used > self.idle_seconds:
+                # Servers drop idle sessions; check before trusting it
+                try:
+                    if conn.smtp.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected('NOOP failed')
+                except Exception:
+                    self._close(conn)
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+            try:
+                yield conn
+            except Exception as e:
+                if _breaks_connection(e):
+                    self._close(conn)
+                    conn = None
+                raise
+        finally:
+            if conn is not None:
+                if conn.sent >= self.max_messages:
+                    self._close(conn)
+                else:
+                    conn.last_used = time.monotonic()
+                    with self._lock:
+                        self._idle.append(conn)
+            self._slots.release()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+class EmailDeliveryService:
+    """Background queue in front of the SMTP pool"""
+
+    def __init__(self):
+        self.app = None
+        self.mode = 'background'
+        self.batch_size = 20
+        self.max_retries = 4
+        self.inline_max_retries = 2
+        self.backoff_seconds = 2.0
+        self.pool = SMTPConnectionPool()
+        self._queue: "queue.Queue[Optional[OutgoingEmail]]" = queue.Queue(maxsize=5000)
+        self._delayed: list = []  # (due, seq, OutgoingEmail)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._workers_pid: Optional[int] = None
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        atexit.register(self.shutdown)
+
+    def init_app(self, app):
+        """Read delivery settings from the app config"""
+        self.app = app
+        self.mode = app.config.get('EMAIL_DELIVERY_MODE', self.mode)
+        self.batch_size = int(app.config.get('EMAIL_BATCH_SIZE', self.batch_size))
+        self.max_retries = int(app.config.get('EMAIL_MAX_RETRIES', self.max_retries))
+        self.inline_max_retries = int(app.config.get('EMAIL_INLINE_MAX_RETRIES', self.inline_max_retries))
+        self.backoff_seconds = float(app.config.get('EMAIL_RETRY_BACKOFF_SECONDS', self.backoff_seconds))
+        self.pool = SMTPConnectionPool(
+            size=int(app.config.get('EMAIL_SMTP_POOL_SIZE', 2)),
+            idle_seconds=float(app.config.get('EMAIL_SMTP_IDLE_SECONDS', 30.0)),
+            max_messages=int(app.config.get('EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION', 100))
+        )
+        queue_size = int(app.config.get('EMAIL_QUEUE_SIZE', self._queue.maxsize))
+        if queue_size != self._queue.maxsize and self._queue.empty():
+            self._queue = queue.Queue(maxsize=queue_size)
+
+    @property
+    def _log(self):
+        return self.app.logger if self.app is not None else logger
+
+    # -- public API -------------------------------------------------------
+
+    def send(self, to: str, message: Message, kind: str = 'generic', on_done=None) -> bool:
+        """
+        Queue a message for delivery (or send it now in sync mode / Celery tasks)
+
+        Returns:
+            True if queued (or sent), False if the queue is full or a sync send failed
+        """
+        item = OutgoingEmail(to=to, message=message, kind=kind, on_done=on_done)
+        if self._inline():
+            return self._deliver_inline([item]) == 1
+        return self._enqueue(item)
+
+    def send_many(self, items: List[OutgoingEmail]) -> int:
+        """
+        Deliver a fan-out of messages spread over all pooled connections
+
+        Queued for the workers in background mode; inline (sync mode / Celery
+        tasks) the items are split across pool.size sessions sent in parallel.
+
+        Returns:
+            Number of messages queued (background) or delivered (inline)
+        """
+        if not items:
+            return 0
+        if not self._inline():
+            return sum(1 for item in items if self._enqueue(item))
+
+        lanes = min(self.pool.size, len(items))
+        chunks = [items[i::lanes] for i in range(lanes)]
+        with ThreadPoolExecutor(max_workers=lanes, thread_name_prefix='email-fanout') as executor:
+            return sum(executor.map(self._deliver_inline, chunks))
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until queued messages (not scheduled retries) are handed to SMTP"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def shutdown(self, timeout: float = 10.0):
+        """Drain the queue and stop the workers"""
+        workers = self._workers
+        if not workers or self._workers_pid != os.getpid():
+            return
+        for _ in workers:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for worker in workers:
+            worker.join(timeout)
+        self._workers = []
+        if self._delayed:
+            self._log.warning(f"[EMAIL] {len(self._delayed)} emails awaiting retry were not sent before exit")
+        self.pool.close_all()
+
+    def stats(self):
+        return {
+            'queued': self._queue.qsize(),
+            'retrying': len(self._delayed),
+            'sent': self.sent,
+            'failed': self.failed,
+            'dropped': self.dropped
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _inline(self) -> bool:
+        return self.mode == 'sync' or self._in_celery_task()
+
+    def _enqueue(self, item: OutgoingEmail) -> bool:
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            EMAIL_DELIVERIES.inc(kind=item.kind, outcome='dropped')
+            self._log.error(f"[EMAIL] Queue full, dropping '{item.kind}' email to {item.to}")
+            self._finish(item, False, 'delivery queue full')
+            return False
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize() + len(self._delayed))
+        return True
+
+    def _finish(self, item: OutgoingEmail, delivered: bool, error: Optional[str] = None):
+        if item.on_done is None:
+            return
+        try:
+            item.on_done(delivered, error)
+        except Exception as e:
+            self._log.warning(f"[EMAIL] Delivery callback failed for {item.to}: {e}")
+
+    @staticmethod
+    def _in_celery_task() -> bool:
+        try:
+            from celery import current_task
+        except ImportError:
+            return False
+        return bool(current_task and current_task.request.id)
+
+    def _ensure_workers(self):
+        """One worker per pooled connection, started lazily (and again after a fork)"""
+        pid = os.getpid()
+        if self._workers_pid == pid and all(w.is_alive() for w in self._workers) and self._workers:
+            return
+        with self._lock:
+            if self._workers_pid == pid and self._workers and all(w.is_alive() for w in self._workers):
+                return
+            if self._workers_pid is not None and self._workers_pid != pid:
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                self._delayed = []
+            self._workers_pid = pid
+            self._workers = [
+                threading.Thread(target=self._run, name=f'email-delivery-{i}', daemon=True)
+                for i in range(self.pool.size)
+            ]
+            for worker in self._workers:
+                worker.start()
+
+    def _promote_due(self) -> float:
+        """Move due retries back onto the queue; return seconds until the next one"""
+        with self._lock:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, item = heapq.heappop(self._delayed)
+                try:
+                    self._queue.put_nowait(item)
+                except queue.Full:
+                    heapq.heappush(self._delayed, (now + 1.0, next(self._seq), item))
+                    break
+            return self._delayed[0][0] - now if self._delayed else 1.0
+
+    def _run(self):
+        while True:
+            wait = min(max(self._promote_due(), 0.05), 1.0)
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if item is None:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            try:
+                self._deliver_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                EMAIL_QUEUE_DEPTH.set(self._queue.qsize() + len(self._delayed))
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _deliver_inline(self, items: List[OutgoingEmail]) -> int:
+        """
+        Send now, sleeping between rounds to retry transient failures
+
+        Returns:
+            Number of messages accepted by the server
+        """
+        delivered = 0
+        pending = list(items)
+        while pending:
+            retries: List[tuple] = []
+            delivered += self._deliver_batch(pending, retries=retries)
+            if not retries:
+                break
+            time.sleep(max(delay for delay, _ in retries))
+            pending = [item for _, item in retries]
+        return delivered
+
+    def _deliver_batch(self, batch: List[OutgoingEmail], retries: Optional[List[tuple]] = None) -> int:
+        """
+        Send a batch over one pooled session
+
+        Args:
+            retries: Collect (delay, item) for transient failures here instead
+                of scheduling them on the background queue (inline sends)
+
+        Returns:
+            Number of messages accepted by the server
+        """
+        delivered = 0
+        pending = list(batch)
+        try:
+            with self.pool.connection() as conn:
+                while pending:
+                    item = pending[0]
+                    start = time.perf_counter()
+                    try:
+                        conn.smtp.sendmail(EmailConfig.SENDER_EMAIL, [item.to], item.message.as_string())
+                    except smtplib.SMTPServerDisconnected:
+                        raise  # session is gone; the rest of the batch is retried below
+                    except Exception as e:
+                        EMAIL_SEND_SECONDS.observe(time.perf_counter() - start, kind=item.kind, outcome='failure')
+                        pending.pop(0)
+                        self._handle_failure(item, e, retries)
+                        if _breaks_connection(e):
+                            raise
+                        continue
+                    EMAIL_SEND_SECONDS.observe(time.perf_counter() - start, kind=item.kind, outcome='success')
+                    conn.sent += 1
+                    pending.pop(0)
+                    delivered += 1
+                    self.sent += 1
+                    EMAIL_DELIVERIES.inc(kind=item.kind, outcome='sent')
+                    self._finish(item, True)
+        except Exception as e:
+            # Connect/login failure or a dropped session: everything not sent yet
+            for item in pending:
+                self._handle_failure(item, e, retries)
+        return delivered
+
+    def _handle_failure(self, item: OutgoingEmail, error: Exception, retries: Optional[List[tuple]] = None):
+        item.attempts += 1
+        max_retries = self.max_retries if retries is None else self.inline_max_retries
+        if _is_transient(error) and item.attempts <= max_retries:
+            delay = self.backoff_seconds * (2 ** (item.attempts - 1)) * random.uniform(0.8, 1.2)
+            if retries is not None:
+                retries.append((delay, item))
+            else:
+                with self._lock:
+                    heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), item))
+            self._log.warning(
+                f"[EMAIL] '{item.kind}' email to {item.to} failed ({error}); "
+                f"retry {item.attempts}/{max_retries} in {delay:.1f}s"
+            )
+            return
+        self.failed += 1
+        EMAIL_DELIVERIES.inc(kind=item.kind, outcome='failed')
+        self._log.error(f"[EMAIL] Giving up on '{item.kind}' email to {item.to} after {item.attempts} attempts: {error}")
+        self._finish(item, False, str(error))
+
+
+# Global instance
+email_delivery = EmailDeliveryService()
@@ -0,0 +1,134 @@
+"""
+Email template rendering with compiled Jinja2 templates
+
+Templates live in app/templates/email as <name>.html plus an optional
+<name>.txt plain-text variant. Each is compiled to Python once per process
+and kept (static markup becomes constants in the compiled code), so a render
+only evaluates the dynamic parts. warm() compiles everything up front.
+
+render_batch() resolves the templates once for a whole recipient list and
+renders identical contexts only once (e.g. a broadcast with the same body
+for every hospital).
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+TEMPLATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates', 'email'))
+
+_TAG_RE = re.compile(r'<[^<]+?>')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    html: str
+    text: str
+
+
+def html_to_text(html: str) -> str:
+    """Fallback plain-text variant when a template has no .txt file"""
+    return _BLANK_LINES_RE.sub('\n\n', _TAG_RE.sub('', html)).strip()
+
+
+class EmailRenderer:
+    """Process-wide cache of compiled email templates"""
+
+    def __init__(self, template_dir: str = TEMPLATE_DIR):
+        self.template_dir = template_dir
+        self._env = None
+        self._templates: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def env(self):
+        """Jinja2 environment, created on first use"""
+        if self._env is None:
+            with self._lock:
+                if self._env is None:
+                    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+                    self._env = Environment(
+                        loader=FileSystemLoader(self.template_dir),
+                        autoescape=select_autoescape(['html']),
+                        trim_blocks=True,
+                        lstrip_blocks=True,
+                        keep_trailing_newline=True,
+                        auto_reload=False,  # templates only change on deploy
+                        cache_size=-1
+                    )
+        return self._env
+
+    def _get(self, name: str) -> tuple:
+        """(html template, text template or None), compiled once"""
+        templates = self._templates.get(name)
+        if templates is None:
+            html = self.env.get_template(f"{name}.html")
+            text_path = os.path.join(self.template_dir, f"{name}.txt")
+            text = self.env.get_template(f"{name}.txt") if os.path.exists(text_path) else None
+            templates = self._templates[name] = (html, text)
+        return templates
+
+    def warm(self) -> int:
+        """Compile every template now; returns the number compiled"""
+        names = sorted({
+            os.path.splitext(f)[0] for f in os.listdir(self.template_dir)
+            if f.endswith('.html')
+        })
+        for name in names:
+            self._get(name)
+        return len(names)
+
+    def render(self, name: str, **context: Any) -> RenderedEmail:
+        """
+        Render the HTML and plain-text variants of one email
+
+        Args:
+            name: Template name without extension (e.g. 'staff_invitation')
+            **context: Template variables
+        """
+        html_template, text_template = self._get(name)
+        html = html_template.render(context)
+        text = text_template.render(context) if text_template is not None else html_to_text(html)
+        return RenderedEmail(html=html, text=text)
+
+    def render_batch(self, name: str, recipients: Iterable[Dict[str, Any]],
+                     common: Optional[Dict[str, Any]] = None) -> List[RenderedEmail]:
+        """
+        Render one email per recipient in a single pass
+
+        Args:
+            name: Template name without extension
+            recipients: Per-recipient variables (merged over `common`)
+            common: Variables shared by every recipient
+
+        Returns:
+            One RenderedEmail per recipient, in order
+        """
+        html_template, text_template = self._get(name)
+        common = common or {}
+        rendered: Dict[Any, RenderedEmail] = {}
+        results = []
+        for variables in recipients:
+            context = {**common, **variables}
+            try:
+                key = tuple(sorted(variables.items()))
+                hash(key)
+            except TypeError:
+                key = None  # unhashable values: no sharing
+            email = rendered.get(key) if key is not None else None
+            if email is None:
+                html = html_template.render(context)
+                text = text_template.render(context) if text_template is not None else html_to_text(html)
+                email = RenderedEmail(html=html, text=text)
+                if key is not None:
+                    rendered[key] = email
+            results.append(email)
+        return results
+
+
+# Global instance
+email_renderer = EmailRenderer()
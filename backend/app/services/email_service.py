@@ -1,11 +1,11 @@
-import smtplib
-import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from flask import current_app
 import os
 from datetime import datetime, timedelta
 from app.config.email_config import EmailConfig
+from app.services.email_delivery import email_delivery
+from app.services.email_renderer import email_renderer
 
 class EmailService:
     def __init__(self):
@@ -18,74 +18,32 @@ class EmailService:
     def send_password_reset_email(self, recipient_email, reset_link, user_name="User"):
         """Send password reset email with provided reset link"""
         try:
-            current_app.logger.info(f"[EMAIL SERVICE] Starting password reset email to {recipient_email}")
-            current_app.logger.info(f"[EMAIL SERVICE] SMTP Server: {self.smtp_server}:{self.smtp_port}")
-            current_app.logger.info(f"[EMAIL SERVICE] Sender: {self.sender_email}")
-            current_app.logger.info(f"[EMAIL SERVICE] User name: {user_name}")
+            current_app.logger.info(f"[EMAIL SERVICE] Queueing password reset email to {recipient_email}")
 
             subject = EmailConfig.RESET_SUBJECT if hasattr(EmailConfig, 'RESET_SUBJECT') else "SmartBlood - Password Reset"
             html_content = self._create_password_reset_html(user_name, reset_link)
             text_content = self._create_password_reset_text(user_name, reset_link)
 
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.sender_name} <{self.sender_email}>"
-            message["To"] = recipient_email
-
-            # Add both text and HTML parts
-            text_part = MIMEText(text_content, "plain")
-            html_part = MIMEText(html_content, "html")
-
-            message.attach(text_part)
-            message.attach(html_part)
-
-            current_app.logger.info(f"[EMAIL SERVICE] Message created, preparing to send")
-
-            # Send email with proper TLS/SSL handling
-            context = ssl.create_default_context()
-            use_ssl = getattr(EmailConfig, 'SMTP_USE_SSL', False)
-            use_tls = getattr(EmailConfig, 'SMTP_USE_TLS', True)
-
-            current_app.logger.info(f"[EMAIL SERVICE] SSL: {use_ssl}, TLS: {use_tls}")
-
-            if use_ssl:
-                current_app.logger.info(f"[EMAIL SERVICE] Using SMTP_SSL on port {self.smtp_port}")
-                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context, timeout=20) as server:
-                    current_app.logger.info(f"[EMAIL SERVICE] Connected to SMTP server")
-                    server.set_debuglevel(1)  # Enable SMTP debug output
-                    server.login(self.sender_email, self.sender_password)
-                    current_app.logger.info(f"[EMAIL SERVICE] Login successful")
-                    server.sendmail(self.sender_email, recipient_email, message.as_string())
-                    current_app.logger.info(f"[EMAIL SERVICE] Email sent successfully")
-            else:
-                current_app.logger.info(f"[EMAIL SERVICE] Using SMTP with STARTTLS on port {self.smtp_port}")
-                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=20) as server:
-                    current_app.logger.info(f"[EMAIL SERVICE] Connected to SMTP server")
-                    server.set_debuglevel(1)  # Enable SMTP debug output
-                    server.ehlo()
-                    if use_tls:
-                        current_app.logger.info(f"[EMAIL SERVICE] Starting TLS")
-                        server.starttls(context=context)
-                        server.ehlo()
-                    server.login(self.sender_email, self.sender_password)
-                    current_app.logger.info(f"[EMAIL SERVICE] Login successful")
-                    server.sendmail(self.sender_email, recipient_email, message.as_string())
-                    current_app.logger.info(f"[EMAIL SERVICE] Email sent successfully")
-
-            current_app.logger.info(f"Password reset email sent to {recipient_email}")
-            return True
-
-        except smtplib.SMTPAuthenticationError as e:
-            current_app.logger.error(f"[EMAIL SERVICE] SMTP Authentication failed: {str(e)}")
-            return False
-        except smtplib.SMTPException as e:
-            current_app.logger.error(f"[EMAIL SERVICE] SMTP error: {str(e)}")
-            return False
+            message = self._build_message(recipient_email, subject, text_content, html_content)
+            queued = email_delivery.send(recipient_email, message, kind='password_reset')
+            if queued:
+                current_app.logger.info(f"Password reset email queued for {recipient_email}")
+            return queued
+
         except Exception as e:
             current_app.logger.error(f"[EMAIL SERVICE] Failed to send password reset email to {recipient_email}: {str(e)}", exc_info=True)
             return False
 
+    def _build_message(self, recipient_email, subject, text_content, html_content):
+        """Multipart message with plain text and HTML alternatives"""
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = f"{self.sender_name} <{self.sender_email}>"
+        message["To"] = recipient_email
+        message.attach(MIMEText(text_content, "plain"))
+        message.attach(MIMEText(html_content, "html"))
+        return message
+
     def _create_password_reset_html(self, user_name, reset_link):
         """Professional short HTML email for password reset"""
         expiry = int(current_app.config.get("RESET_EXPIRES_MINUTES", 15))
@@ -198,28 +156,11 @@ If you didn't request this, you can ignore this email.
             html_content = self._create_otp_html(user_name, otp)
             text_content = self._create_otp_text(user_name, otp)
 
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.sender_name} <{self.sender_email}>"
-            message["To"] = recipient_email
-
-            # Add both text and HTML parts
-            text_part = MIMEText(text_content, "plain")
-            html_part = MIMEText(html_content, "html")
-
-            message.attach(text_part)
-            message.attach(html_part)
-
-            # Send email
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
-
-            current_app.logger.info(f"OTP email sent to {recipient_email}")
-            return True
+            message = self._build_message(recipient_email, subject, text_content, html_content)
+            queued = email_delivery.send(recipient_email, message, kind='otp')
+            if queued:
+                current_app.logger.info(f"OTP email queued for {recipient_email}")
+            return queued
 
         except Exception as e:
             current_app.logger.error(f"Failed to send OTP email to {recipient_email}: {str(e)}")
@@ -253,28 +194,11 @@ Your verification code is: {otp}
 This code expires in {int(current_app.config.get('RESET_EXPIRES_MINUTES', 15))} minutes.
 Do not share it with anyone.
 """
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.sender_name} <{self.sender_email}>"
-            message["To"] = recipient_email
-            text_part = MIMEText(text_content, "plain")
-            html_part = MIMEText(html_content, "html")
-            message.attach(text_part)
-            message.attach(html_part)
-
-            context = ssl.create_default_context()
-            if getattr(EmailConfig, 'SMTP_USE_SSL', False):
-                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context, timeout=20) as server:
-                    server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, recipient_email, message.as_string())
-            else:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=20) as server:
-                    if getattr(EmailConfig, 'SMTP_USE_TLS', True):
-                        server.starttls(context=context)
-                    server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, recipient_email, message.as_string())
-            current_app.logger.info(f"Verification email sent to {recipient_email}")
-            return True
+            message = self._build_message(recipient_email, subject, text_content, html_content)
+            queued = email_delivery.send(recipient_email, message, kind='verification')
+            if queued:
+                current_app.logger.info(f"Verification email queued for {recipient_email}")
+            return queued
         except Exception as e:
             current_app.logger.error(f"Failed to send verification email to {recipient_email}: {str(e)}")
             return False
@@ -397,54 +321,38 @@ SmartBlood Admin Panel
             text: Plain text content (optional, will extract from HTML if not provided)
         
         Returns:
-            bool: True if sent successfully, False otherwise
+            bool: True if queued for delivery, False otherwise
         """
         try:
-            import smtplib
-            
-            current_app.logger.info(f"[EMAIL SERVICE] Sending email to {to}: {subject}")
-            
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.sender_name} <{self.sender_email}>"
-            message["To"] = to
-            
+            current_app.logger.info(f"[EMAIL SERVICE] Queueing email to {to}: {subject}")
+
             # Add text part (use simple HTML strip if not provided)
             if text is None:
                 import re
                 text = re.sub('<[^<]+?>', '', html)  # Simple HTML tag removal
-            
-            text_part = MIMEText(text, "plain")
-            html_part = MIMEText(html, "html")
-            
-            message.attach(text_part)
-            message.attach(html_part)
-            
-            # Send email with proper TLS/SSL handling
-            context = ssl.create_default_context()
-            use_ssl = getattr(EmailConfig, 'SMTP_USE_SSL', False)
-            use_tls = getattr(EmailConfig, 'SMTP_USE_TLS', True)
-            
-            if use_ssl:
-                with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, context=context, timeout=20) as server:
-                    server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, to, message.as_string())
-            else:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=20) as server:
-                    server.ehlo()
-                    if use_tls:
-                        server.starttls(context=context)
-                        server.ehlo()
-                    server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, to, message.as_string())
-            
-            current_app.logger.info(f"Email sent successfully to {to}")
-            return True
-            
+
+            message = self._build_message(to, subject, text, html)
+            return email_delivery.send(to, message, kind='generic')
+
         except Exception as e:
             current_app.logger.error(f"Failed to send email to {to}: {str(e)}")
             return False
 
+    def send_template(self, to, subject, template, **context):
+        """
+        Render an email template (app/templates/email) and queue it
+
+        Args:
+            to: Recipient email address
+            subject: Email subject line
+            template: Template name without extension
+            **context: Template variables
+
+        Returns:
+            bool: True if queued for delivery, False otherwise
+        """
+        rendered = email_renderer.render(template, **context)
+        return self.send_email(to, subject, rendered.html, rendered.text)
+
 # Create global instance
 email_service = EmailService()
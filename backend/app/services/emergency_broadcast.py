@@ -0,0 +1,183 @@
+"""
+Emergency broadcast to nearby hospitals
+
+start() records a broadcast and hands the fan-out to a background job, so
+the notify-emergency endpoint returns a broadcast ID without touching SMTP.
+The job picks the target hospitals, renders the template once and passes
+one email per hospital to email_delivery.send_many, which spreads them over
+the pooled SMTP connections. Each delivery callback updates the broadcast
+record, which the status endpoint reads.
+
+Records live in the shared expiring store for BROADCAST_TTL. The fan-out
+runs as a Celery task when that store is Redis (visible to every process)
+and on a thread in the calling process otherwise.
+"""
+
+import secrets
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import current_app
+from sqlalchemy import and_
+
+from app.models import Hospital, Request
+from app.services.email_delivery import email_delivery, OutgoingEmail
+from app.services.email_renderer import email_renderer
+from app.services.expiring_store import get_expiring_store, RedisExpiringStore
+
+NAMESPACE = 'broadcast'
+BROADCAST_TTL = timedelta(hours=24)
+MAX_TARGETS = 10
+
+
+class EmergencyBroadcastService:
+    """Creates, runs and reports on emergency broadcasts"""
+
+    def start(self, blood_request: Request, requested_by: int) -> Dict:
+        """
+        Record a new broadcast and enqueue its fan-out job
+
+        Returns:
+            The broadcast record (status "queued")
+        """
+        broadcast_id = secrets.token_hex(8)
+        now = datetime.utcnow()
+        record = {
+            'broadcast_id': broadcast_id,
+            'request_id': blood_request.id,
+            'requested_by': requested_by,
+            'status': 'queued',
+            'total': 0,
+            'sent': 0,
+            'failed': 0,
+            'targets': {},
+            'created_at': now,
+            'started_at': None,
+            'completed_at': None
+        }
+        store = get_expiring_store()
+        store.put(NAMESPACE, broadcast_id, record, now + BROADCAST_TTL,
+                  indexes=[f"request:{blood_request.id}"])
+
+        if isinstance(store, RedisExpiringStore):
+            try:
+                from app.tasks.email_tasks import broadcast_emergency
+                broadcast_emergency.delay(broadcast_id)
+                return record
+            except Exception as e:
+                current_app.logger.warning(f"[BROADCAST] Celery not available, running in-process: {e}")
+
+        app = current_app._get_current_object()
+
+        def _target():
+            with app.app_context():
+                self.run(broadcast_id)
+
+        threading.Thread(target=_target, name=f"broadcast-{broadcast_id}", daemon=True).start()
+        return record
+
+    def get(self, broadcast_id: str) -> Optional[Dict]:
+        return get_expiring_store().get(NAMESPACE, broadcast_id)
+
+    def run(self, broadcast_id: str):
+        """Fan-out job: pick targets, render once, hand every email to the delivery pool"""
+        store = get_expiring_store()
+        record = store.get(NAMESPACE, broadcast_id)
+        if not record:
+            return
+        try:
+            blood_request = Request.query.get(record['request_id'])
+            if not blood_request:
+                raise ValueError("Request not found")
+            targets = [h for h in self._target_hospitals(blood_request) if h.email]
+            subject, rendered = self._render(blood_request)
+
+            def begin(meta):
+                meta['status'] = 'sending' if targets else 'completed'
+                meta['total'] = len(targets)
+                meta['started_at'] = datetime.utcnow()
+                meta['targets'] = {
+                    str(h.id): {'hospital': h.name, 'status': 'pending', 'error': None}
+                    for h in targets
+                }
+                if not targets:
+                    meta['completed_at'] = meta['started_at']
+            store.update(NAMESPACE, broadcast_id, begin)
+
+            from app.services.email_service import email_service
+            items = [
+                OutgoingEmail(
+                    to=h.email,
+                    message=email_service._build_message(h.email, subject, rendered.text, rendered.html),
+                    kind='emergency',
+                    on_done=self._recorder(broadcast_id, h.id)
+                )
+                for h in targets
+            ]
+            email_delivery.send_many(items)
+            current_app.logger.info(
+                f"[BROADCAST] {broadcast_id}: request {blood_request.id} fanned out to {len(items)} hospitals"
+            )
+        except Exception as e:
+            current_app.logger.error(f"[BROADCAST] {broadcast_id} failed: {e}", exc_info=True)
+            error = str(e)
+
+            def fail(meta):
+                meta['status'] = 'failed'
+                meta['error'] = error
+                meta['completed_at'] = datetime.utcnow()
+            store.update(NAMESPACE, broadcast_id, fail)
+
+    @staticmethod
+    def _recorder(broadcast_id: str, hospital_id: int):
+        """Delivery callback recording one hospital's outcome"""
+        def on_done(delivered: bool, error: Optional[str]):
+            def apply(meta):
+                target = meta['targets'].get(str(hospital_id))
+                if target is None or target['status'] != 'pending':
+                    return
+                target['status'] = 'sent' if delivered else 'failed'
+                target['error'] = error
+                meta['sent' if delivered else 'failed'] += 1
+                if meta['sent'] + meta['failed'] >= meta['total']:
+                    meta['status'] = 'completed' if meta['failed'] == 0 else (
+                        'partial' if meta['sent'] else 'failed')
+                    meta['completed_at'] = datetime.utcnow()
+            get_expiring_store().update(NAMESPACE, broadcast_id, apply)
+        return on_done
+
+    @staticmethod
+    def _target_hospitals(blood_request: Request):
+        """Active hospitals near the request's hospital (same district or city)"""
+        hospital = Hospital.query.get(blood_request.hospital_id) if blood_request.hospital_id else None
+        if hospital:
+            return Hospital.query.filter(
+                and_(
+                    Hospital.is_active == True,
+                    Hospital.id != hospital.id,
+                    Hospital.district.in_([hospital.district, hospital.city])
+                )
+            ).limit(MAX_TARGETS).all()
+        return Hospital.query.filter(
+            Hospital.is_active == True
+        ).limit(MAX_TARGETS).all()
+
+    @staticmethod
+    def _render(blood_request: Request):
+        """Subject and body, rendered once for every target hospital"""
+        subject = f"URGENT: {blood_request.blood_group} Blood Needed"
+        rendered = email_renderer.render(
+            'emergency_broadcast',
+            blood_group=blood_request.blood_group,
+            units_required=blood_request.units_required,
+            urgency=blood_request.urgency or '',
+            required_by=blood_request.required_by.strftime('%Y-%m-%d %H:%M') if blood_request.required_by else 'ASAP',
+            contact_person=blood_request.contact_person,
+            contact_phone=blood_request.contact_phone
+        )
+        return subject, rendered
+
+
+# Global instance
+emergency_broadcast = EmergencyBroadcastService()
@@ -0,0 +1,329 @@
+"""
+Expiring key/value store shared by the session, refresh-token and OTP stores
+
+Two backends behind one interface:
+
+- MemoryExpiringStore: per-process dicts, expiry via a min-heap (no full
+  scans), secondary indexes (e.g. user -> tokens) and in-process events.
+- RedisExpiringStore: native key TTLs, sorted-set indexes and pub/sub, so
+  every gunicorn worker sees the same sessions, OTPs and blocked users.
+
+Pick one with SESSION_STORE_URL ("memory://" or "redis://host:6379/1").
+"""
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[str, Dict[str, Any]], None]
+
+
+def to_timestamp(dt: datetime) -> float:
+    """Naive datetimes are UTC (the stores use datetime.utcnow())"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class ExpiringStore(ABC):
+    """
+    Interface: namespaced records that disappear at expires_at
+
+    Records are dicts. Each may be listed under secondary index names
+    (e.g. "user:42") within its namespace. Events are broadcast to every
+    process sharing the store.
+    """
+
+    @abstractmethod
+    def put(self, namespace: str, key: str, value: Dict[str, Any], expires_at: datetime,
+            indexes: Iterable[str] = ()) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def update(self, namespace: str, key: str, mutate: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Atomically apply mutate(value) to a live record, keeping its expiry
+
+        Returns:
+            Whatever mutate returns, or None if the record is missing/expired
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def keys_for(self, namespace: str, index: str) -> List[str]:
+        """Live keys listed under a secondary index"""
+
+    @abstractmethod
+    def publish(self, event: str, payload: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, handler: EventHandler) -> None:
+        ...
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Live records for keys (missing ones are left out)"""
+        records = {}
+        for key in keys:
+            value = self.get(namespace, key)
+            if value is not None:
+                records[key] = value
+        return records
+
+
+class MemoryExpiringStore(ExpiringStore):
+    """Single-process backend; expiry is O(log n) per record via a heap"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: Dict[tuple, tuple] = {}  # (ns, key) -> (value, expires_ts, indexes)
+        self._heap: List[tuple] = []  # (expires_ts, seq, ns, key)
+        self._seq = itertools.count()
+        self._indexes: Dict[tuple, Dict[str, None]] = {}  # (ns, index) -> ordered keys
+        self._handlers: List[EventHandler] = []
+
+    def _purge(self, now: float) -> None:
+        """Drop records whose expiry has passed (stale heap entries are skipped)"""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_ts, _, namespace, key = heapq.heappop(heap)
+            record = self._records.get((namespace, key))
+            if record is not None and record[1] == expires_ts:
+                self._remove(namespace, key)
+
+    def _remove(self, namespace: str, key: str) -> bool:
+        record = self._records.pop((namespace, key), None)
+        if record is None:
+            return False
+        for index in record[2]:
+            keys = self._indexes.get((namespace, index))
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._indexes[(namespace, index)]
+        return True
+
+    def put(self, namespace, key, value, expires_at, indexes=()):
+        expires_ts = to_timestamp(expires_at)
+        indexes = tuple(indexes)
+        with self._lock:
+            self._purge(time.time())
+            self._remove(namespace, key)
+            self._records[(namespace, key)] = (dict(value), expires_ts, indexes)
+            heapq.heappush(self._heap, (expires_ts, next(self._seq), namespace, key))
+            for index in indexes:
+                self._indexes.setdefault((namespace, index), {})[key] = None
+
+    def get(self, namespace, key):
+        with self._lock:
+            self._purge(time.time())
+            record = self._records.get((namespace, key))
+            return dict(record[0]) if record else None
+
+    def update(self, namespace, key, mutate):
+        with self._lock:
+            self._purge(time.time())
+            record = self._records.get((namespace, key))
+            if record is None:
+                return None
+            return mutate(record[0])
+
+    def delete(self, namespace, key):
+        with self._lock:
+            return self._remove(namespace, key)
+
+    def keys_for(self, namespace, index):
+        with self._lock:
+            self._purge(time.time())
+            return list(self._indexes.get((namespace, index), ()))
+
+    def publish(self, event, payload):
+        for handler in list(self._handlers):
+            try:
+                handler(event, payload)
+            except Exception as e:
+                logger.error(f"[STORE] Event handler failed for {event}: {e}")
+
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+
+
+def _encode(obj):
+    if isinstance(obj, datetime):
+        return {'__dt__': obj.isoformat()}
+    raise TypeError(f"Cannot store {type(obj).__name__}")
+
+
+def _decode(obj):
+    if '__dt__' in obj:
+        return datetime.fromisoformat(obj['__dt__'])
+    return obj
+
+
+class RedisExpiringStore(ExpiringStore):
+    """Shared backend: records are JSON strings with a TTL, indexes are sorted sets"""
+
+    CHANNEL = 'events'
+    UPDATE_RETRIES = 5
+
+    def __init__(self, url: str, prefix: str = 'smartblood:store'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._handlers: List[EventHandler] = []
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def _key(self, namespace, key):
+        return f"{self._prefix}:{namespace}:{key}"
+
+    def _index_key(self, namespace, index):
+        return f"{self._prefix}:{namespace}:idx:{index}"
+
+    def put(self, namespace, key, value, expires_at, indexes=()):
+        expires_ts = to_timestamp(expires_at)
+        ttl = max(1, int(expires_ts - time.time() + 0.999))
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(namespace, key), json.dumps(value, default=_encode), ex=ttl)
+        for index in indexes:
+            index_key = self._index_key(namespace, index)
+            pipe.zadd(index_key, {key: expires_ts})
+            # Index lives as long as its longest-lived member
+            pipe.expire(index_key, ttl, nx=True)
+            pipe.expire(index_key, ttl, gt=True)
+        pipe.execute()
+
+    def get(self, namespace, key):
+        raw = self._redis.get(self._key(namespace, key))
+        return json.loads(raw, object_hook=_decode) if raw is not None else None
+
+    def get_many(self, namespace, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        raws = self._redis.mget([self._key(namespace, key) for key in keys])
+        return {
+            key: json.loads(raw, object_hook=_decode)
+            for key, raw in zip(keys, raws) if raw is not None
+        }
+
+    def update(self, namespace, key, mutate):
+        import redis
+
+        name = self._key(namespace, key)
+        for _ in range(self.UPDATE_RETRIES):
+            with self._redis.pipeline() as pipe:
+                try:
+                    pipe.watch(name)
+                    raw = pipe.get(name)
+                    if raw is None:
+                        return None
+                    value = json.loads(raw, object_hook=_decode)
+                    result = mutate(value)
+                    pipe.multi()
+                    pipe.set(name, json.dumps(value, default=_encode), keepttl=True, xx=True)
+                    pipe.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+        raise RuntimeError(f"Concurrent updates kept conflicting on {namespace}:{key}")
+
+    def delete(self, namespace, key):
+        # Index entries are dropped lazily by keys_for
+        return bool(self._redis.delete(self._key(namespace, key)))
+
+    def keys_for(self, namespace, index):
+        index_key = self._index_key(namespace, index)
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(index_key, '-inf', time.time())
+        pipe.zrange(index_key, 0, -1)
+        members = pipe.execute()[1]
+        keys = [m.decode() if isinstance(m, bytes) else m for m in members]
+        if not keys:
+            return []
+        # Drop members whose record was deleted before it expired
+        live, dead = [], []
+        pipe = self._redis.pipeline()
+        for key in keys:
+            pipe.exists(self._key(namespace, key))
+        for key, exists in zip(keys, pipe.execute()):
+            (live if exists else dead).append(key)
+        if dead:
+            self._redis.zrem(index_key, *dead)
+        return live
+
+    def publish(self, event, payload):
+        message = json.dumps({'event': event, 'payload': payload}, default=_encode)
+        self._redis.publish(f"{self._prefix}:{self.CHANNEL}", message)
+
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+        self._ensure_listener()
+
+    def _ensure_listener(self):
+        """Start the pub/sub thread in this process (after any fork)"""
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{f"{self._prefix}:{self.CHANNEL}": self._on_message})
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _on_message(self, message):
+        try:
+            data = json.loads(message['data'], object_hook=_decode)
+        except (TypeError, ValueError):
+            return
+        for handler in list(self._handlers):
+            try:
+                handler(data.get('event'), data.get('payload') or {})
+            except Exception as e:
+                logger.error(f"[STORE] Event handler failed for {data.get('event')}: {e}")
+
+
+_store: Optional[ExpiringStore] = None
+_store_lock = threading.Lock()
+
+
+def get_expiring_store() -> ExpiringStore:
+    """
+    Process-wide store selected by SESSION_STORE_URL
+
+    Returns:
+        MemoryExpiringStore for "memory://" (default), RedisExpiringStore for redis URLs
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = _configured_url()
+                if url.startswith(('redis://', 'rediss://', 'unix://')):
+                    _store = RedisExpiringStore(url)
+                    logger.info("[STORE] Using Redis expiring store")
+                else:
+                    _store = MemoryExpiringStore()
+    return _store
+
+
+def _configured_url() -> str:
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return current_app.config.get('SESSION_STORE_URL') or 'memory://'
+    return os.environ.get('SESSION_STORE_URL', 'memory://')
@@ -0,0 +1,210 @@
+"""
+Serving stored files (certificates, profile pictures)
+
+Files live under named roots (directories registered in init_app). send()
+stats the file once and answers with:
+
+- a content-hash ETag (SHA-256, cached per path/mtime/size so each version
+  is hashed once per process) and Last-Modified,
+- Cache-Control with the caller's max-age (optionally immutable),
+- 304 for a matching If-None-Match / If-Modified-Since,
+- 206 for Range / If-Range requests.
+
+With FILE_SERVE_OFFLOAD the worker only decides headers and hands the
+bytes to the front server:
+
+- "nginx": X-Accel-Redirect to <FILE_SERVE_ACCEL_PREFIX>/<root>/<file>, e.g.
+
+      location /protected-files/certificates/ {
+          internal;
+          alias /srv/smartblood/backend/certificates/;
+      }
+
+- "sendfile": X-Sendfile with the absolute path (Apache mod_xsendfile,
+  lighttpd). Range requests are then handled by the front server.
+
+stream_zip() builds a ZIP archive while it is being sent, one chunk at a
+time, so archives of many files never sit in memory.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+HASH_CHUNK = 1024 * 1024
+
+
+class FileServer:
+    """Conditional, cacheable file responses with optional front-server offload"""
+
+    def __init__(self, etag_cache_size: int = 4096):
+        self.roots: Dict[str, str] = {}
+        self.offload = ''
+        self.accel_prefix = '/protected-files'
+        self.etag_cache_size = etag_cache_size
+        self._etags: OrderedDict = OrderedDict()  # (path, mtime_ns, size) -> etag
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.offload = (app.config.get('FILE_SERVE_OFFLOAD') or '').lower()
+        self.accel_prefix = app.config.get('FILE_SERVE_ACCEL_PREFIX', self.accel_prefix).rstrip('/')
+        # Same directories as get_certificate_service() and the profile picture upload
+        self.register_root('certificates', os.path.join(app.root_path, '..', 'certificates'))
+        self.register_root('profile_pictures', app.config.get('UPLOAD_FOLDER', 'uploads/profile_pictures'))
+
+    def register_root(self, name: str, directory: str):
+        self.roots[name] = os.path.abspath(directory)
+
+    def resolve(self, root: str, filename: str) -> Optional[str]:
+        """Absolute path of filename under a root, or None if it would escape the root"""
+        return safe_join(self.roots[root], filename)
+
+    def content_etag(self, path: str, st: os.stat_result) -> str:
+        """SHA-256 of the file contents, computed once per file version"""
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            etag = self._etags.get(key)
+            if etag is not None:
+                self._etags.move_to_end(key)
+                return etag
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+
+        with self._lock:
+            self._etags[key] = etag
+            while len(self._etags) > self.etag_cache_size:
+                self._etags.popitem(last=False)
+        return etag
+
+    def send(self, root: str, filename: str, mimetype: Optional[str] = None,
+             as_attachment: bool = False, download_name: Optional[str] = None,
+             max_age: int = 86400, immutable: bool = False, private: bool = False):
+        """
+        Response for a stored file, or None if it does not exist
+
+        Args:
+            root: Registered root name ('certificates', 'profile_pictures')
+            filename: Path relative to the root (checked against traversal)
+            mimetype: Content type (guessed from the name if omitted)
+            as_attachment: Send Content-Disposition: attachment
+            download_name: Name offered to the browser (default: filename)
+            max_age: Cache-Control max-age in seconds
+            immutable: The URL always refers to the same bytes
+            private: Only the requesting browser may cache it
+        """
+        path = self.resolve(root, filename)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+            etag = self.content_etag(path, st)
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+        download_name = download_name or os.path.basename(filename)
+        mimetype = mimetype or mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+        if self.offload in ('nginx', 'sendfile'):
+            response = self._offload(root, path, mimetype, as_attachment, download_name, etag, st)
+        else:
+            response = send_file(
+                path, request.environ, mimetype=mimetype, as_attachment=as_attachment,
+                download_name=download_name, conditional=True, etag=etag,
+                last_modified=st.st_mtime, max_age=max_age
+            )
+
+        cache_control = response.cache_control
+        cache_control.no_cache = None
+        cache_control.public = not private
+        cache_control.private = private or None
+        cache_control.max_age = max_age
+        cache_control.immutable = immutable or None
+        return response
+
+    def _offload(self, root, path, mimetype, as_attachment, download_name, etag, st):
+        """Headers-only response; the front server streams the file (and handles Range)"""
+        response = current_app.response_class(mimetype=mimetype)
+        response.set_etag(etag)
+        response.last_modified = int(st.st_mtime)
+        if not is_resource_modified(request.environ, etag=etag, last_modified=response.last_modified):
+            response.status_code = 304
+            return response
+
+        disposition = 'attachment' if as_attachment else 'inline'
+        response.headers.set('Content-Disposition', disposition, filename=download_name)
+        if self.offload == 'nginx':
+            relative = os.path.relpath(path, self.roots[root]).replace(os.sep, '/')
+            response.headers['X-Accel-Redirect'] = quote(f"{self.accel_prefix}/{root}/{relative}")
+        else:
+            response.headers['X-Sendfile'] = path
+        return response
+
+
+class _ZipSink:
+    """Write-only, unseekable target for zipfile; output is drained between yields"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, str]], chunk_size: int = HASH_CHUNK) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of (arcname, path) entries as it is built
+
+    Entries are stored uncompressed (PDFs and images are compressed already).
+    Missing files are skipped.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for arcname, path in entries:
+            try:
+                src = open(path, 'rb')
+                info = zipfile.ZipInfo.from_file(path, arcname)
+            except FileNotFoundError:
+                continue
+            with src, archive.open(info, 'w') as dst:
+                for chunk in iter(lambda: src.read(chunk_size), b''):
+                    dst.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+# Global instance
+file_server = FileServer()
@@ -0,0 +1,189 @@
+"""
+Health checks: liveness, readiness and cached deep checks
+"""
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from flask import current_app
+from sqlalchemy import text
+
+from app.extensions import db
+
+STATUS_OK = 'ok'
+STATUS_DEGRADED = 'degraded'
+STATUS_ERROR = 'error'
+STATUS_SKIPPED = 'skipped'
+
+
+def _timed(check: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one component check and attach its latency (errors become status=error)"""
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = {'status': STATUS_ERROR, 'error': str(e)}
+    result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+class HealthService:
+    """Component checks behind /api/health, with the deep result cached for a TTL"""
+
+    # Components whose failure makes the instance unhealthy (503) rather than degraded
+    CRITICAL = ('database',)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deep_result = None
+        self._deep_checked_at = 0.0
+        self._redis = None
+        self._redis_url = None
+
+    # -- components -------------------------------------------------------
+
+    def check_database(self) -> Dict[str, Any]:
+        """SELECT 1 over a pooled connection from db.engine"""
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT 1")).fetchone()
+        pool = db.engine.pool
+        detail = {'status': STATUS_OK}
+        if hasattr(pool, 'checkedout'):
+            detail['pool'] = {'size': pool.size(), 'checked_out': pool.checkedout()}
+        return detail
+
+    def check_broker(self) -> Dict[str, Any]:
+        """PING the Celery Redis broker"""
+        from app.config.celery_config import CeleryConfig
+
+        url = CeleryConfig.broker_url
+        if not url.startswith(('redis://', 'rediss://', 'unix://')):
+            return {'status': STATUS_SKIPPED, 'detail': 'broker is not Redis'}
+
+        if self._redis is None or self._redis_url != url:
+            import redis
+            timeout = current_app.config.get('HEALTH_CHECK_TIMEOUT_SECONDS', 2.0)
+            self._redis = redis.Redis.from_url(
+                url, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+            self._redis_url = url
+        self._redis.ping()
+        return {'status': STATUS_OK}
+
+    def check_models(self) -> Dict[str, Any]:
+        """ModelClient is initialized and the preloaded models are in memory"""
+        from app import PRELOAD_MODELS
+        from app.ml.model_client import model_client
+
+        if not model_client.initialized:
+            return {'status': STATUS_ERROR, 'error': 'ModelClient not initialized'}
+
+        loaded = sorted(model_client.models)
+        missing = [key for key in PRELOAD_MODELS if key not in model_client.models]
+        return {
+            # Missing preloads usually mean the startup thread is still loading
+            'status': STATUS_DEGRADED if missing else STATUS_OK,
+            'loaded': loaded,
+            'missing': missing
+        }
+
+    def check_smtp(self) -> Dict[str, Any]:
+        """Connect to the SMTP server and NOOP (no login, no mail sent)"""
+        from app.config.email_config import EmailConfig
+
+        if not EmailConfig.SENDER_PASSWORD:
+            return {'status': STATUS_SKIPPED, 'detail': 'SMTP credentials not configured'}
+
+        timeout = current_app.config.get('HEALTH_CHECK_TIMEOUT_SECONDS', 2.0)
+        smtp_class = smtplib.SMTP_SSL if EmailConfig.SMTP_USE_SSL else smtplib.SMTP
+        server = smtp_class(EmailConfig.SMTP_SERVER, EmailConfig.SMTP_PORT, timeout=timeout)
+        try:
+            code, _ = server.noop()
+        finally:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+        if code != 250:
+            return {'status': STATUS_ERROR, 'error': f"NOOP returned {code}"}
+        return {'status': STATUS_OK, 'server': f"{EmailConfig.SMTP_SERVER}:{EmailConfig.SMTP_PORT}"}
+
+    # -- probes -----------------------------------------------------------
+
+    def liveness(self) -> Dict[str, Any]:
+        """Process is up and serving requests (no I/O)"""
+        return {'status': STATUS_OK}
+
+    def readiness(self) -> Dict[str, Any]:
+        """Instance can take traffic: the pooled database connection works"""
+        database = _timed(self.check_database)
+        return {
+            'status': STATUS_OK if database['status'] == STATUS_OK else STATUS_ERROR,
+            'components': {'database': database}
+        }
+
+    def deep(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Check every component, reusing the last result for HEALTH_DEEP_CACHE_SECONDS
+
+        Concurrent callers wait for the running check instead of starting their own.
+
+        Args:
+            refresh: Ignore the cached result
+
+        Returns:
+            Dict with overall status, per-component results, cached flag and age
+        """
+        ttl = current_app.config.get('HEALTH_DEEP_CACHE_SECONDS', 30.0)
+        with self._lock:
+            age = time.monotonic() - self._deep_checked_at
+            if refresh or self._deep_result is None or age >= ttl:
+                self._deep_result = self._run_deep()
+                self._deep_checked_at = time.monotonic()
+                age = 0.0
+                cached = False
+            else:
+                cached = True
+
+        return dict(self._deep_result, cached=cached, age_seconds=round(age, 2))
+
+    def _run_deep(self) -> Dict[str, Any]:
+        """Run the component checks in parallel, each in its own app context"""
+        app = current_app._get_current_object()
+        checks = {
+            'database': self.check_database,
+            'broker': self.check_broker,
+            'models': self.check_models,
+            'smtp': self.check_smtp
+        }
+
+        def run(check):
+            with app.app_context():
+                try:
+                    return _timed(check)
+                finally:
+                    db.session.remove()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix='health') as pool:
+            futures = {name: pool.submit(run, check) for name, check in checks.items()}
+            components = {name: future.result() for name, future in futures.items()}
+
+        status = STATUS_OK
+        for name, result in components.items():
+            if result['status'] == STATUS_ERROR and name in self.CRITICAL:
+                status = STATUS_ERROR
+                break
+            if result['status'] in (STATUS_ERROR, STATUS_DEGRADED):
+                status = STATUS_DEGRADED
+
+        return {
+            'status': status,
+            'components': components,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 2)
+        }
+
+
+health_service = HealthService()
@@ -0,0 +1,140 @@
+"""
+Match progress events for blood requests
+
+publish() appends an event to the request's history in the shared expiring
+store and broadcasts it over the store's pub/sub: in-process for
+"memory://", Redis pub/sub when SESSION_STORE_URL is a Redis URL (so events
+raised by a Celery worker reach every web process). Each process fans
+events out to its own subscribers: SSE streams (subscribe()) and the
+Socket.IO room of the request (see app/websocket.py).
+
+Events: search_started, candidates_found, scored, donor_notified,
+search_completed, search_failed, search_expanded, donor_accepted,
+donor_declined. Every event has a per-request sequence number, so clients
+can resume from the last one they saw instead of polling.
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from app.services.expiring_store import get_expiring_store
+
+logger = logging.getLogger(__name__)
+
+EVENT = 'match_progress'
+NAMESPACE = 'match_events'
+EVENTS_TTL = timedelta(hours=6)
+MAX_EVENTS = 200
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Events after which the search itself is over (responses may still follow)
+SEARCH_FINISHED = ('search_completed', 'search_failed')
+
+
+class MatchEventHub:
+    """Records match events and delivers them to this process's subscribers"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._listening = False
+        self._emitters = []
+
+    def add_emitter(self, emitter):
+        """Also deliver every event to emitter(request_id, entry) (e.g. Socket.IO)"""
+        self._emitters.append(emitter)
+        self._listen()
+
+    def _listen(self):
+        if self._listening:
+            return
+        with self._lock:
+            if not self._listening:
+                get_expiring_store().subscribe(self._on_event)
+                self._listening = True
+
+    def publish(self, request_id: int, event: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        """
+        Record and broadcast one event; never raises (progress must not break matching)
+
+        Returns:
+            The event entry ({id, event, data, at}) or None if it could not be recorded
+        """
+        try:
+            store = get_expiring_store()
+            key = str(request_id)
+            at = datetime.utcnow().isoformat() + 'Z'
+
+            def append(meta):
+                meta['seq'] += 1
+                entry = {'id': meta['seq'], 'event': event, 'data': data or {}, 'at': at}
+                meta['events'].append(entry)
+                del meta['events'][:-MAX_EVENTS]
+                return entry
+
+            entry = store.update(NAMESPACE, key, append)
+            if entry is None:
+                store.put(NAMESPACE, key, {'seq': 0, 'events': []}, datetime.utcnow() + EVENTS_TTL)
+                entry = store.update(NAMESPACE, key, append)
+            store.publish(EVENT, {'request_id': request_id, **entry})
+            return entry
+        except Exception as e:
+            logger.warning(f"[MATCH_EVENTS] Could not publish {event} for request {request_id}: {e}")
+            return None
+
+    def history(self, request_id: int, after: int = 0) -> List[Dict]:
+        """Recorded events with id > after, oldest first"""
+        record = get_expiring_store().get(NAMESPACE, str(request_id))
+        if not record:
+            return []
+        return [entry for entry in record['events'] if entry['id'] > after]
+
+    def last_search_event(self, request_id: int) -> Optional[Dict]:
+        """Most recent search lifecycle event (started/expanded/completed/failed), if any"""
+        for entry in reversed(self.history(request_id)):
+            if entry['event'] in ('search_started', 'search_expanded') + SEARCH_FINISHED:
+                return entry
+        return None
+
+    @contextmanager
+    def subscribe(self, request_id: int):
+        """Queue receiving this request's events while the block runs"""
+        self._listen()
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(request_id, set()).add(q)
+        try:
+            yield q
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(request_id)
+                if subscribers is not None:
+                    subscribers.discard(q)
+                    if not subscribers:
+                        del self._subscribers[request_id]
+
+    def _on_event(self, event: str, payload: Dict[str, Any]):
+        if event != EVENT:
+            return
+        request_id = payload.get('request_id')
+        entry = {k: v for k, v in payload.items() if k != 'request_id'}
+        with self._lock:
+            subscribers = list(self._subscribers.get(request_id, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(entry)
+            except queue.Full:
+                pass  # slow client: it resumes from history on reconnect
+        for emitter in self._emitters:
+            try:
+                emitter(request_id, entry)
+            except Exception as e:
+                logger.warning(f"[MATCH_EVENTS] Emitter failed for request {request_id}: {e}")
+
+
+# Global instance
+match_events = MatchEventHub()
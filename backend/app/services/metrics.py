@@ -0,0 +1,422 @@
+"""
+In-process metrics registry
+Counters, gauges and histograms rendered in the Prometheus text format at
+/api/metrics. Under gunicorn (or any multi-process server) set
+METRICS_MULTIPROC_DIR to a directory shared by the workers and emptied on
+deploy: every process snapshots its values there and the scrape merges them.
+"""
+
+import glob
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, cast
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.pool import Pool, QueuePool
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, registry, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # float for counters/gauges, [bucket counts..., sum, count] for histograms
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def describe(self) -> Dict:
+        return {'kind': self.kind, 'help': self.documentation, 'labelnames': list(self.labelnames)}
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; `mode` says how processes are combined (sum/max/liveall)"""
+    kind = 'gauge'
+
+    def __init__(self, registry, name, documentation, labelnames=(), mode: str = 'sum'):
+        super().__init__(registry, name, documentation, labelnames)
+        self.mode = mode
+
+    def set(self, value: float, **labels):
+        with self.registry.lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def describe(self) -> Dict:
+        return dict(super().describe(), mode=self.mode)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket counts (non-cumulative), then sum and count
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def describe(self) -> Dict:
+        return dict(super().describe(), buckets=list(self.buckets))
+
+
+M = TypeVar('M', bound=_Metric)
+
+
+class MetricsRegistry:
+    """Holds every metric of the process and renders/merges them"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self.multiproc_dir: Optional[str] = None
+        self.flush_seconds = 5.0
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+        self._hooks_installed = False
+        self._task_starts: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def _register(self, cls: Type[M], name: str, documentation: str,
+                  labelnames: Sequence[str] = (), **kwargs) -> M:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(self, name, documentation, labelnames, **kwargs)
+        return cast(M, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), mode: str = 'sum') -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames, mode=mode)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    # ------------------------------------------------------------------
+    # Helpers for instrumented code
+    # ------------------------------------------------------------------
+
+    def timed(self, histogram: Histogram, **labels):
+        """
+        Decorator observing call duration; adds an `outcome` label when the
+        histogram has one (falsy return or exception = failure)
+        """
+        with_outcome = 'outcome' in histogram.labelnames
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                outcome = 'failure'
+                try:
+                    result = fn(*args, **kwargs)
+                    outcome = 'success' if result or result is None else 'failure'
+                    return result
+                finally:
+                    extra = {'outcome': outcome} if with_outcome else {}
+                    histogram.observe(time.perf_counter() - started, **labels, **extra)
+            return wrapper
+        return decorator
+
+    def record_cache(self, cache: str, hit: bool):
+        """Count a cache lookup; hit ratio = hits / (hits + misses)"""
+        CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+    # ------------------------------------------------------------------
+    # Snapshots, multi-process merge and rendering
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                name: dict(metric.describe(), samples=[
+                    [list(key), list(value) if isinstance(value, list) else value]
+                    for key, value in metric._values.items()
+                ])
+                for name, metric in self._metrics.items()
+            }
+
+    def _write_snapshot(self):
+        if not self.multiproc_dir:
+            return
+        path = os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'pid': os.getpid(), 'metrics': self.snapshot()}, f)
+        os.replace(tmp, path)
+
+    def _ensure_flusher(self):
+        """Background snapshot writer (restarted after fork)"""
+        if not self.multiproc_dir:
+            return
+        pid = os.getpid()
+        if self._flusher is not None and self._flusher_pid == pid and self._flusher.is_alive():
+            return
+        self._flusher_pid = pid
+
+        def run():
+            while True:
+                time.sleep(self.flush_seconds)
+                try:
+                    self._write_snapshot()
+                except OSError:
+                    pass
+
+        self._flusher = threading.Thread(target=run, name='metrics-flusher', daemon=True)
+        self._flusher.start()
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+            return True
+        except (OSError, TypeError):
+            return False
+
+    def _collect(self) -> Dict:
+        """This process's snapshot, or the merge of every process's snapshot"""
+        if not self.multiproc_dir:
+            return self.snapshot()
+
+        self._write_snapshot()
+        merged: Dict[str, Dict] = {}
+        for path in glob.glob(os.path.join(self.multiproc_dir, 'metrics_*.json')):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = data.get('pid') == os.getpid() or self._pid_alive(data.get('pid'))
+            for name, metric in data.get('metrics', {}).items():
+                # Gauges of exited workers are stale; counters and histograms are not
+                if metric['kind'] == 'gauge' and not alive:
+                    continue
+                target = merged.setdefault(name, dict(metric, samples={}))
+                for key, value in metric['samples']:
+                    key = tuple(key)
+                    if metric['kind'] == 'gauge' and metric.get('mode') == 'liveall':
+                        key = key + (str(data.get('pid')),)
+                    current = target['samples'].get(key)
+                    if current is None:
+                        target['samples'][key] = value
+                    elif metric['kind'] == 'histogram':
+                        target['samples'][key] = [a + b for a, b in zip(current, value)]
+                    elif metric['kind'] == 'gauge' and metric.get('mode') == 'max':
+                        target['samples'][key] = max(current, value)
+                    else:
+                        target['samples'][key] = current + value
+        for name, metric in merged.items():
+            if metric['kind'] == 'gauge' and metric.get('mode') == 'liveall':
+                metric['labelnames'] = list(metric['labelnames']) + ['pid']
+            metric['samples'] = [[list(k), v] for k, v in metric['samples'].items()]
+        return merged
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, metric in sorted(self._collect().items()):
+            labelnames = metric['labelnames']
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            for key, value in metric['samples']:
+                if metric['kind'] != 'histogram':
+                    lines.append(f"{name}{_format_labels(labelnames, key)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric['buckets'] + [math.inf], value[:-2] + [None]):
+                    cumulative = value[-1] if count is None else cumulative + count
+                    le = ('le', '+Inf' if math.isinf(bound) else repr(float(bound)))
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, key)} {value[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    # ------------------------------------------------------------------
+    # App integration
+    # ------------------------------------------------------------------
+
+    def init_app(self, app):
+        """
+        Install request, DB pool and Celery task hooks
+
+        Must run before db.init_app so the timed pool class is used.
+        """
+        self.multiproc_dir = app.config.get('METRICS_MULTIPROC_DIR') or None
+        self.flush_seconds = float(app.config.get('METRICS_FLUSH_SECONDS', self.flush_seconds))
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        options.setdefault('poolclass', TimedQueuePool)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+        @app.before_request
+        def _start_timer():
+            request.environ['metrics.started'] = time.perf_counter()
+            self._ensure_flusher()
+
+        @app.after_request
+        def _observe_request(response):
+            started = request.environ.get('metrics.started')
+            if started is not None:
+                REQUEST_LATENCY.observe(
+                    time.perf_counter() - started,
+                    blueprint=request.blueprint or '',
+                    endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                    method=request.method,
+                    status=str(response.status_code)
+                )
+            return response
+
+        if not self._hooks_installed:
+            self._install_global_hooks()
+            self._hooks_installed = True
+
+    def _install_global_hooks(self):
+        @event.listens_for(Pool, 'checkout')
+        def _checked_out(dbapi_connection, connection_record, connection_proxy):
+            DB_POOL_IN_USE.inc()
+
+        @event.listens_for(Pool, 'checkin')
+        def _checked_in(dbapi_connection, connection_record):
+            DB_POOL_IN_USE.dec()
+
+        try:
+            from celery.signals import task_prerun, task_postrun
+        except ImportError:
+            return
+
+        @task_prerun.connect(weak=False)
+        def _task_started(task_id=None, **kwargs):
+            self._task_starts[task_id] = time.perf_counter()
+            self._ensure_flusher()
+
+        @task_postrun.connect(weak=False)
+        def _task_finished(task_id=None, task=None, state=None, **kwargs):
+            started = self._task_starts.pop(task_id, None)
+            if started is not None:
+                TASK_DURATION.observe(
+                    time.perf_counter() - started,
+                    task=getattr(task, 'name', 'unknown'), state=state or 'UNKNOWN'
+                )
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+# Global instance
+metrics = MetricsRegistry()
+
+REQUEST_LATENCY = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+DB_POOL_CHECKOUT_WAIT = metrics.histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled DB connection',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_IN_USE = metrics.gauge(
+    'db_pool_connections_in_use', 'DB connections currently checked out'
+)
+MODEL_LOAD_SECONDS = metrics.histogram(
+    'model_load_seconds', 'ML model load time', ['model']
+)
+MODEL_INFERENCE_SECONDS = metrics.histogram(
+    'model_inference_seconds', 'ML model inference time', ['model', 'method'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+TASK_DURATION = metrics.histogram(
+    'celery_task_duration_seconds', 'Celery task run time', ['task', 'state'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0)
+)
+SMS_SEND_SECONDS = metrics.histogram(
+    'sms_send_seconds', 'SMS send latency', ['provider', 'outcome']
+)
+EMAIL_SEND_SECONDS = metrics.histogram(
+    'email_send_seconds', 'Email send latency', ['kind', 'outcome']
+)
+CACHE_REQUESTS = metrics.counter(
+    'cache_requests_total', 'Cache lookups by result', ['cache', 'result']
+)
@@ -3,7 +3,6 @@
 ML Model Loading and Prediction Service
 Handles loading trained models and making predictions for donor matching
 """
-import joblib
 import os
 from typing import Tuple, Any, Dict, List
 from flask import current_app
@@ -34,6 +33,7 @@ def load_model(model_name: str) -> Tuple[Any, str]:
         return None, "default"
     
     try:
+        import joblib
         model_path = os.path.join(current_app.root_path, '..', artifact.artifact_path)
         model = joblib.load(model_path)
         current_app.logger.info(f"Loaded model '{model_name}' version {artifact.version}")
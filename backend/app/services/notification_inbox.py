@@ -0,0 +1,309 @@
+"""
+Notification inbox: unread counters, keyset feed, bulk read and archival
+
+notification_counters holds one unread count per user. ORM inserts, read
+flag changes and deletes of Notification rows adjust it in the same flush
+(like app/ml/feature_store.py), and the set-based statements below adjust
+it by their row counts, so reading the badge is one primary-key lookup.
+
+The feed pages with a keyset cursor on (created_at, id) backed by
+ix_notifications_user_feed, so every page costs O(page size) however long
+the inbox is. Read notifications older than NOTIFICATION_ARCHIVE_DAYS are
+moved to notifications_archive in batches.
+"""
+
+import base64
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import and_, event, func, or_, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import attributes
+
+from app.models import db, Notification, NotificationCounter
+
+_counters = NotificationCounter.__table__
+
+
+def _bump(connection, user_id: Optional[int], delta: int):
+    """Upsert a counter row, adding delta (never below zero)"""
+    if not user_id or not delta:
+        return
+    now = datetime.utcnow()
+    stmt = pg_insert(_counters).values(user_id=user_id, unread_count=max(delta, 0), updated_at=now)
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=['user_id'],
+        set_={'unread_count': func.greatest(_counters.c.unread_count + delta, 0), 'updated_at': now}
+    ))
+
+
+@event.listens_for(Notification, 'after_insert')
+def _notification_inserted(mapper, connection, target):
+    if not target.is_read:
+        _bump(connection, target.user_id, 1)
+
+
+@event.listens_for(Notification, 'after_update')
+def _notification_updated(mapper, connection, target):
+    hist = attributes.get_history(target, 'is_read')
+    if not hist.has_changes():
+        return
+    old = bool(hist.deleted[0]) if hist.deleted else False
+    new = bool(hist.added[0]) if hist.added else False
+    if old != new:
+        _bump(connection, target.user_id, -1 if new else 1)
+
+
+@event.listens_for(Notification, 'after_delete')
+def _notification_deleted(mapper, connection, target):
+    if not target.is_read:
+        _bump(connection, target.user_id, -1)
+
+
+def encode_cursor(created_at: datetime, notification_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{notification_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, notification_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except ValueError as e:  # includes bad base64 and bad UTF-8
+        raise ValueError("Invalid cursor") from e
+
+
+ARCHIVE_SQL = text("""
+    WITH moved AS (
+        DELETE FROM notifications
+        WHERE (id, created_at) IN (
+            SELECT id, created_at FROM notifications
+            WHERE is_read = true AND created_at < :cutoff
+            ORDER BY created_at, id
+            LIMIT :limit
+        )
+        RETURNING id, user_id, type, title, message, data, read_at, created_at
+    )
+    INSERT INTO notifications_archive (id, user_id, type, title, message, data, read_at, created_at, archived_at)
+    SELECT id, user_id, type, title, message, data, read_at, created_at, now() FROM moved
+    ON CONFLICT (id) DO NOTHING
+""")
+
+REBUILD_SQL = """
+INSERT INTO notification_counters (user_id, unread_count, updated_at)
+SELECT u.id, COALESCE(n.unread, 0), now()
+FROM users u
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS unread
+    FROM notifications WHERE is_read = false
+    GROUP BY user_id
+) n ON n.user_id = u.id
+{where}
+ON CONFLICT (user_id) DO UPDATE SET
+    unread_count = EXCLUDED.unread_count,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+class NotificationInbox:
+    """Per-user notification feed with O(1) unread counts"""
+
+    def __init__(self):
+        self.page_size = 20
+        self.max_page_size = 100
+        self.archive_days = 90
+        self.archive_batch_size = 5000
+
+    def init_app(self, app):
+        self.page_size = int(app.config.get('NOTIFICATION_PAGE_SIZE', self.page_size))
+        self.archive_days = int(app.config.get('NOTIFICATION_ARCHIVE_DAYS', self.archive_days))
+        self.archive_batch_size = int(app.config.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', self.archive_batch_size))
+
+    @staticmethod
+    def unread_count(user_id: int) -> int:
+        counter = db.session.get(NotificationCounter, user_id)
+        return counter.unread_count if counter else 0
+
+    def feed(self, user_id: int, limit: Optional[int] = None, cursor: Optional[str] = None,
+             unread_only: bool = False) -> Tuple[List[Notification], Optional[str]]:
+        """
+        One page of a user's notifications, newest first
+
+        Args:
+            limit: Page size (default NOTIFICATION_PAGE_SIZE, capped at 100)
+            cursor: next_cursor from the previous page
+            unread_only: Only unread notifications
+
+        Returns:
+            (notifications, next_cursor) where next_cursor is None on the last page
+
+        Raises:
+            ValueError: Malformed cursor
+        """
+        limit = min(max(int(limit or self.page_size), 1), self.max_page_size)
+        query = Notification.query.filter(Notification.user_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.is_read == False)  # noqa: E712 (matches the partial index)
+        if cursor:
+            created_at, notification_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id < notification_id)
+            ))
+        rows = query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return rows, next_cursor
+
+    def mark_read(self, user_id: int, notification_id: int) -> Optional[bool]:
+        """
+        Mark one notification read
+
+        Returns:
+            True if it was unread, False if already read, None if not the user's
+        """
+        result = db.session.execute(
+            update(Notification)
+            .where(Notification.id == notification_id, Notification.user_id == user_id,
+                   Notification.is_read == False)  # noqa: E712
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            _bump(db.session.connection(), user_id, -result.rowcount)
+            db.session.commit()
+            return True
+        db.session.rollback()
+        exists = db.session.query(
+            Notification.query.filter_by(id=notification_id, user_id=user_id).exists()
+        ).scalar()
+        return False if exists else None
+
+    @staticmethod
+    def mark_match_read(user_id: int, match_id: int) -> int:
+        """
+        Mark (not commit) the user's unread entries for a match read
+
+        Call in the transaction that answers the match, so the inbox and the
+        match status change together.
+
+        Returns:
+            Number of notifications changed
+        """
+        result = db.session.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.type == 'blood_request',
+                   Notification.is_read == False,  # noqa: E712
+                   Notification.data['match_id'].as_string() == str(match_id))
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        _bump(db.session.connection(), user_id, -result.rowcount)
+        return result.rowcount
+
+    def mark_all_read(self, user_id: int) -> int:
+        """Mark every unread notification read in one UPDATE; returns the number changed"""
+        result = db.session.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == False)  # noqa: E712
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # By row count, not reset to 0, so a notification inserted meanwhile still counts
+        _bump(db.session.connection(), user_id, -result.rowcount)
+        db.session.commit()
+        return result.rowcount
+
+    def archive_read(self, older_than_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+        """
+        Move read notifications older than N days to notifications_archive
+
+        Runs one batch per transaction so locks stay short. Only read rows
+        move, so unread counters are unaffected.
+
+        Returns:
+            Number of notifications archived
+        """
+        days = self.archive_days if older_than_days is None else older_than_days
+        batch_size = batch_size or self.archive_batch_size
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        archived = 0
+        while True:
+            result = db.session.execute(ARCHIVE_SQL, {'cutoff': cutoff, 'limit': batch_size})
+            db.session.commit()
+            archived += result.rowcount
+            if result.rowcount < batch_size:
+                break
+        current_app.logger.info(f"[NOTIFICATIONS] Archived {archived} read notifications older than {days} days")
+        return archived
+
+    @staticmethod
+    def rebuild_counters(user_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute unread counters from the notifications table
+
+        Args:
+            user_ids: Restrict the rebuild to these users (default: all)
+
+        Returns:
+            Number of rows written
+        """
+        params: Dict = {}
+        where = ''
+        if user_ids is not None:
+            params['ids'] = list({int(u) for u in user_ids})
+            if not params['ids']:
+                return 0
+            where = 'WHERE u.id = ANY(:ids)'
+        result = db.session.execute(text(REBUILD_SQL.format(where=where)), params)
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def add_match_notification(user_id: int, match, blood_request, hospital_name: Optional[str] = None) -> Notification:
+        """
+        Add (not commit) the inbox entry for a donor matched to a request
+
+        Call after the match is flushed so match.id is set. The insert
+        listener bumps the donor's unread counter in the same flush.
+        """
+        notification = Notification(
+            user_id=user_id,
+            type='blood_request',
+            title='New Blood Request Match',
+            message=f"You've been matched to a {blood_request.blood_group} request at {hospital_name or 'a hospital'}",
+            data={
+                'match_id': match.id,
+                'request_id': blood_request.id,
+                'blood_group': blood_request.blood_group,
+                'urgency': blood_request.urgency,
+                'hospital_name': hospital_name
+            },
+            created_at=datetime.utcnow()
+        )
+        db.session.add(notification)
+        return notification
+
+    @staticmethod
+    def serialize(notification: Notification) -> Dict:
+        return {
+            "id": notification.id,
+            "type": notification.type,
+            "title": notification.title,
+            "message": notification.message,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+            "read": bool(notification.is_read),
+            "read_at": notification.read_at.isoformat() if notification.read_at else None,
+            "data": notification.data or {}
+        }
+
+
+# Global instance
+notification_inbox = NotificationInbox()
@@ -0,0 +1,176 @@
+"""
+Monthly range partitions for append-heavy tables
+Creates upcoming partitions, drops expired ones and falls back to chunked
+deletes when a table is not partitioned (e.g. created by db.create_all)
+"""
+
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from flask import current_app
+from sqlalchemy import text
+
+from app.models import db
+
+
+# Tables partitioned by RANGE (created_at), one partition per month
+PARTITIONED_TABLES = ('model_prediction_logs', 'match_predictions', 'notifications')
+
+# Partition naming: <table>_pYYYYMM, plus <table>_default for stray rows
+_PARTITION_RE = re.compile(r'^(?P<table>.+)_p(?P<year>\d{4})(?P<month>\d{2})$')
+
+
+def month_start(value) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a month start by a number of months"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def _check_table(table: str):
+    # Table names are interpolated into DDL, so only allow the known ones
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not a partitioned table")
+
+
+def is_partitioned(table: str) -> bool:
+    """True if the table exists as a partitioned (parent) table"""
+    result = db.session.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+    ), {'table': table})
+    return result.first() is not None
+
+
+def list_partitions(table: str) -> List[Dict]:
+    """
+    Monthly partitions attached to a table, oldest first
+
+    Returns:
+        List of dicts with name, start and end (exclusive) month
+    """
+    _check_table(table)
+    rows = db.session.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {'table': table}).scalars().all()
+
+    partitions = []
+    for name in rows:
+        match = _PARTITION_RE.match(name)
+        if not match or match.group('table') != table:
+            continue
+        start = date(int(match.group('year')), int(match.group('month')), 1)
+        partitions.append({'name': name, 'start': start, 'end': add_months(start, 1)})
+    return sorted(partitions, key=lambda p: p['start'])
+
+
+def ensure_partitions(table: str, months_ahead: int = 3, start: Optional[date] = None) -> List[str]:
+    """
+    Create monthly partitions from `start` (default: this month) through
+    `months_ahead` months ahead
+
+    Returns:
+        Names of partitions created
+    """
+    _check_table(table)
+    if not is_partitioned(table):
+        return []
+
+    existing = {p['name'] for p in list_partitions(table)}
+    first = month_start(start or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        db.session.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+    db.session.commit()
+    return created
+
+
+def drop_partitions_before(table: str, cutoff: datetime) -> List[str]:
+    """
+    Detach and drop partitions whose whole range is older than cutoff
+
+    Returns:
+        Names of partitions dropped
+    """
+    _check_table(table)
+    dropped = []
+    for partition in list_partitions(table):
+        if datetime.combine(partition['end'], datetime.min.time()) > cutoff:
+            break
+        db.session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition["name"]}"'))
+        db.session.execute(text(f'DROP TABLE "{partition["name"]}"'))
+        db.session.commit()
+        dropped.append(partition['name'])
+    return dropped
+
+
+def chunked_delete(table: str, cutoff: datetime, batch_size: int = 5000) -> int:
+    """
+    Delete rows older than cutoff, batch_size rows per transaction
+
+    Returns:
+        Number of rows deleted
+    """
+    _check_table(table)
+    stmt = text(
+        f'DELETE FROM "{table}" WHERE created_at < :cutoff AND id IN ('
+        f'SELECT id FROM "{table}" WHERE created_at < :cutoff ORDER BY id LIMIT :limit)'
+    )
+    deleted = 0
+    while True:
+        result = db.session.execute(stmt, {'cutoff': cutoff, 'limit': batch_size})
+        db.session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def apply_retention(table: str, cutoff: datetime, batch_size: int = 5000) -> Dict:
+    """
+    Remove rows older than cutoff
+
+    Whole partitions are dropped where possible; the partly expired boundary
+    partition (or an unpartitioned table) is trimmed with chunked deletes.
+
+    Returns:
+        Dict with dropped partition names and chunk-deleted row count
+    """
+    dropped = []
+    if is_partitioned(table):
+        dropped = drop_partitions_before(table, cutoff)
+    deleted = chunked_delete(table, cutoff, batch_size)
+
+    current_app.logger.info(
+        f"[PARTITIONS] {table}: dropped {len(dropped)} partitions, deleted {deleted} rows"
+    )
+    return {'dropped_partitions': dropped, 'deleted_rows': deleted}
+
+
+def maintain_partitions(months_ahead: int = 3) -> Dict[str, List[str]]:
+    """Create upcoming monthly partitions for every partitioned table"""
+    created = {}
+    for table in PARTITIONED_TABLES:
+        created[table] = ensure_partitions(table, months_ahead=months_ahead)
+        if created[table]:
+            current_app.logger.info(f"[PARTITIONS] {table}: created {', '.join(created[table])}")
+    return created
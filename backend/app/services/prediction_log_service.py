@@ -0,0 +1,203 @@
+"""
+Buffered ModelPredictionLog writer
+Queues prediction log events in memory and flushes them from a background
+thread as multi-row inserts, so logging never adds a commit to request latency
+"""
+
+import os
+import queue
+import random
+import threading
+import atexit
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from flask import current_app
+
+from app.models import db, ModelPredictionLog
+
+
+class PredictionLogService:
+    """Background sink for ModelPredictionLog rows"""
+
+    def __init__(self, batch_size: int = 200, flush_seconds: float = 2.0,
+                 queue_size: int = 10000, sample_rates: Optional[Dict[str, float]] = None):
+        self.app = None
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.sample_rates: Dict[str, float] = dict(sample_rates or {})
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+        self.dropped = 0
+        self.written = 0
+        # Web processes; Celery prefork children flush on worker_process_shutdown
+        # (app/tasks/celery_app.py) since they exit without running atexit
+        atexit.register(self.shutdown)
+
+    def init_app(self, app):
+        """Bind to a Flask app and read sink settings from its config"""
+        self.app = app
+        self.batch_size = int(app.config.get('PREDICTION_LOG_BATCH_SIZE', self.batch_size))
+        self.flush_seconds = float(app.config.get('PREDICTION_LOG_FLUSH_SECONDS', self.flush_seconds))
+        self.sample_rates = dict(app.config.get('PREDICTION_LOG_SAMPLE_RATES') or {})
+        queue_size = int(app.config.get('PREDICTION_LOG_QUEUE_SIZE', self._queue.maxsize))
+        if queue_size != self._queue.maxsize and self._queue.empty():
+            self._queue = queue.Queue(maxsize=queue_size)
+
+    def _sample_rate(self, endpoint: Optional[str]) -> float:
+        """Sampling rate for an endpoint (longest configured prefix wins)"""
+        if not endpoint or not self.sample_rates:
+            return 1.0
+        if endpoint in self.sample_rates:
+            return self.sample_rates[endpoint]
+        best = None
+        for prefix in self.sample_rates:
+            if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.sample_rates[best] if best is not None else 1.0
+
+    def _ensure_worker(self):
+        """Start the flush thread lazily (and again after a fork)"""
+        pid = os.getpid()
+        if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+                return
+            if self._worker_pid is not None and self._worker_pid != pid:
+                # Forked child: the parent's queued rows belong to the parent
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._worker_pid = pid
+            self._worker = threading.Thread(
+                target=self._run, name='prediction-log-writer', daemon=True
+            )
+            self._worker.start()
+
+    def log(self, model_name: str, endpoint: Optional[str] = None,
+            input_data: Any = None, prediction_output: Any = None,
+            inference_time_ms: Optional[float] = None, model_version: Optional[str] = '1.0.0',
+            success: bool = True, error_message: Optional[str] = None) -> bool:
+        """
+        Queue a prediction log event
+
+        Failed predictions are always kept; successful ones are sampled per endpoint.
+
+        Returns:
+            True if the event was queued, False if sampled out or dropped
+        """
+        if success and random.random() >= self._sample_rate(endpoint):
+            return False
+
+        if self.app is None:
+            try:
+                self.app = current_app._get_current_object()
+            except RuntimeError:
+                return False
+
+        row = {
+            'model_name': model_name,
+            'model_version': model_version,
+            'endpoint': endpoint,
+            'input_data': input_data,
+            'prediction_output': prediction_output,
+            'inference_time_ms': inference_time_ms,
+            'success': success,
+            'error_message': error_message,
+            'created_at': datetime.utcnow()
+        }
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            # Never block the caller on logging; count and move on
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        """Worker loop: collect rows until the batch is full or the interval elapses"""
+        while True:
+            batch: List[Dict[str, Any]] = []
+            deadline = time.monotonic() + self.flush_seconds
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self._write(batch)
+            if stop:
+                # Drain whatever is left before exiting
+                remaining = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        remaining.append(item)
+                for start in range(0, len(remaining), self.batch_size):
+                    self._write(remaining[start:start + self.batch_size])
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        """Insert a batch with a single executemany INSERT"""
+        app = self.app
+        if app is None:
+            return
+        with app.app_context():
+            try:
+                db.session.execute(ModelPredictionLog.__table__.insert(), batch)
+                db.session.commit()
+                self.written += len(batch)
+            except Exception as e:
+                db.session.rollback()
+                self.dropped += len(batch)
+                app.logger.error(f"[PREDICTION LOG] Failed to write {len(batch)} log rows: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def flush(self, timeout: float = 10.0):
+        """Write everything queued so far (the next log() starts a fresh worker)"""
+        self.shutdown(timeout)
+        self._worker = None
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop the worker after it flushes pending rows"""
+        worker = self._worker
+        if worker is None or not worker.is_alive() or self._worker_pid != os.getpid():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        worker.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Sink counters for monitoring"""
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+
+# Global instance
+prediction_log_service = PredictionLogService()
+
+
+def log_prediction(model_name: str, endpoint: Optional[str] = None, **kwargs) -> bool:
+    """Queue a ModelPredictionLog row on the global sink"""
+    return prediction_log_service.log(model_name, endpoint=endpoint, **kwargs)
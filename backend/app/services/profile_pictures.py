@@ -0,0 +1,240 @@
+"""
+Profile picture uploads: capped streaming, content-addressed storage, thumbnails
+
+save_upload() copies the upload to disk in PROFILE_PICTURE_CHUNK_BYTES
+chunks, hashing as it goes and aborting past PROFILE_PICTURE_MAX_BYTES.
+Unless MAX_CONTENT_LENGTH is configured, init_app sets it from the same
+limit, so Werkzeug refuses larger bodies (chunked ones included) with 413
+before spooling them.
+The file is stored as <sha256>.<ext> under UPLOAD_FOLDER, so identical
+pictures are stored once and their URLs never change (served immutable).
+
+Thumbnails (<sha256>_<size>.<webp|jpg>) are made by a background thread
+pool after the upload returns. A thumbnail requested before it exists is
+made on demand by resolve_thumbnail(). Dashboards and lists use
+thumbnail_url() instead of the full picture.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+URL_PREFIX = '/api/donors/profile-pictures/'
+# Multipart boundaries and part headers on top of the picture itself
+MULTIPART_OVERHEAD = 64 * 1024
+THUMBNAIL_SIZES = {'small': 96, 'medium': 256}
+
+# Leading bytes -> stored extension (sniffed, not taken from the client filename)
+_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+_ORIGINAL_RE = re.compile(r'^([0-9a-f]{64})\.(jpg|png|gif|webp)$')
+_THUMBNAIL_RE = re.compile(r'^([0-9a-f]{64})_(\d+)\.(webp|jpg)$')
+
+
+class UploadTooLarge(ValueError):
+    """Upload exceeded PROFILE_PICTURE_MAX_BYTES"""
+
+
+def _sniff(head: bytes) -> Optional[str]:
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    for signature, ext in _SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+class ProfilePictureService:
+    """Stores profile pictures by content hash and builds their thumbnails"""
+
+    def __init__(self):
+        self.app = None
+        self.upload_folder = os.path.abspath('uploads/profile_pictures')
+        self.max_bytes = 5 * 1024 * 1024
+        self.chunk_bytes = 64 * 1024
+        self.max_pixels = 40_000_000
+        self.thumbnail_format = 'webp'
+        self.workers = 1
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.upload_folder = os.path.abspath(app.config.get('UPLOAD_FOLDER', 'uploads/profile_pictures'))
+        self.max_bytes = int(app.config.get('PROFILE_PICTURE_MAX_BYTES', self.max_bytes))
+        self.chunk_bytes = int(app.config.get('PROFILE_PICTURE_CHUNK_BYTES', self.chunk_bytes))
+        self.thumbnail_format = app.config.get('PROFILE_PICTURE_THUMB_FORMAT', self.thumbnail_format).lower()
+        self.workers = int(app.config.get('PROFILE_PICTURE_WORKERS', self.workers))
+        if app.config.get('MAX_CONTENT_LENGTH') is None:
+            app.config['MAX_CONTENT_LENGTH'] = self.max_bytes + MULTIPART_OVERHEAD
+
+    @property
+    def _log(self):
+        return self.app.logger if self.app is not None else logger
+
+    @property
+    def max_size_text(self) -> str:
+        if self.max_bytes >= 1024 * 1024:
+            return f"{self.max_bytes / (1024 * 1024):g} MB"
+        return f"{self.max_bytes / 1024:g} KB"
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Executor created on first use (and again after a fork)"""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._executor_lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='profile-pictures'
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+    def save_upload(self, stream) -> str:
+        """
+        Store an uploaded picture and queue its thumbnails
+
+        Args:
+            stream: Readable binary stream (e.g. FileStorage.stream)
+
+        Returns:
+            Stored filename (<sha256>.<ext>)
+
+        Raises:
+            UploadTooLarge: More than max_bytes were sent
+            ValueError: Not a JPEG, PNG, GIF or WebP image
+        """
+        os.makedirs(self.upload_folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.upload_folder, prefix='.upload-')
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            ext = None
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = stream.read(self.chunk_bytes)
+                    if not chunk:
+                        break
+                    if ext is None:
+                        ext = _sniff(chunk[:16])
+                        if ext is None:
+                            raise ValueError("Unsupported image type (use JPEG, PNG, GIF or WebP)")
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge(f"Picture exceeds {self.max_size_text}")
+                    digest.update(chunk)
+                    out.write(chunk)
+            if ext is None:
+                raise ValueError("Empty file")
+
+            filename = f"{digest.hexdigest()}.{ext}"
+            path = os.path.join(self.upload_folder, filename)
+            if os.path.exists(path):
+                os.unlink(tmp_path)  # same picture already stored
+            else:
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._pool().submit(self._make_thumbnails, filename)
+        return filename
+
+    def _make_thumbnails(self, filename: str):
+        for size in THUMBNAIL_SIZES.values():
+            try:
+                self.ensure_thumbnail(filename, size)
+            except Exception as e:
+                self._log.warning(f"[PROFILE_PIC] Thumbnail {size}px for {filename} failed: {e}")
+
+    def thumbnail_name(self, filename: str, size: int) -> str:
+        digest = filename.split('.', 1)[0]
+        ext = 'webp' if self.thumbnail_format == 'webp' else 'jpg'
+        return f"{digest}_{size}.{ext}"
+
+    def ensure_thumbnail(self, filename: str, size: int) -> str:
+        """Create one thumbnail if it does not exist yet; returns its filename"""
+        name = self.thumbnail_name(filename, size)
+        path = os.path.join(self.upload_folder, name)
+        if os.path.exists(path):
+            return name
+
+        from PIL import Image, ImageOps
+
+        with Image.open(os.path.join(self.upload_folder, filename)) as img:
+            if img.width * img.height > self.max_pixels:
+                raise ValueError(f"Image too large to resize ({img.width}x{img.height})")
+            img.draft('RGB', (size * 2, size * 2))  # JPEG: decode at reduced scale
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            fd, tmp_path = tempfile.mkstemp(dir=self.upload_folder, prefix='.thumb-')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    if name.endswith('.webp'):
+                        if img.mode not in ('RGB', 'RGBA'):
+                            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+                        img.save(out, 'WEBP', quality=80, method=4)
+                    else:
+                        img.convert('RGB').save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        return name
+
+    def resolve_thumbnail(self, name: str) -> Optional[str]:
+        """
+        Make a requested thumbnail that is not on disk yet
+
+        Returns:
+            The thumbnail filename, or None if name is not a thumbnail of a stored picture
+        """
+        match = _THUMBNAIL_RE.match(name)
+        if not match or int(match.group(2)) not in THUMBNAIL_SIZES.values():
+            return None
+        digest, size = match.group(1), int(match.group(2))
+        for ext in ('jpg', 'png', 'webp', 'gif'):
+            original = f"{digest}.{ext}"
+            if os.path.exists(os.path.join(self.upload_folder, original)):
+                if self.thumbnail_name(original, size) != name:
+                    return None
+                return self.ensure_thumbnail(original, size)
+        return None
+
+    @staticmethod
+    def is_content_addressed(name: str) -> bool:
+        """Stored names that never change content (served immutable)"""
+        return bool(_ORIGINAL_RE.match(name) or _THUMBNAIL_RE.match(name))
+
+    @staticmethod
+    def url_for(filename: str) -> str:
+        return f"{URL_PREFIX}{filename}"
+
+    def thumbnail_url(self, profile_pic_url: Optional[str], size: str = 'small') -> Optional[str]:
+        """Thumbnail URL for a stored profile_pic_url (other values are returned unchanged)"""
+        if not profile_pic_url or not profile_pic_url.startswith(URL_PREFIX):
+            return profile_pic_url
+        filename = profile_pic_url[len(URL_PREFIX):]
+        if not _ORIGINAL_RE.match(filename):
+            return profile_pic_url  # uploaded before content-addressed storage
+        return self.url_for(self.thumbnail_name(filename, THUMBNAIL_SIZES[size]))
+
+
+# Global instance
+profile_pictures = ProfilePictureService()
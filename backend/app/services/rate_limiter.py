@@ -0,0 +1,314 @@
+"""
+Request rate limiting for public and authentication endpoints
+
+Policies are named (login, otp_send, public, ...) and applied with
+@rate_limiter.limit(name). Each check runs before the view body, so a
+rejected request never touches the database pool.
+
+Algorithms (both O(1) state per key):
+- token_bucket: `limit` requests of burst, refilled evenly over `period`
+- sliding_window: counter for the current and previous fixed windows,
+  weighted by how far into the current window we are
+
+Backends: per-process memory (LRU-bounded) or Redis (atomic Lua scripts)
+for multi-worker deployments, selected by RATE_LIMIT_STORAGE_URL.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import current_app, g, jsonify, request
+
+from app.services.metrics import metrics
+
+TOKEN_BUCKET = 'token_bucket'
+SLIDING_WINDOW = 'sliding_window'
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """`limit` requests per `period` seconds for one key"""
+    limit: int
+    period: float
+    algorithm: str = TOKEN_BUCKET
+
+
+# Defaults; RATE_LIMIT_OVERRIDES ("login=20/60,public=300/60") adjusts limit/period
+DEFAULT_POLICIES: Dict[str, RateLimitPolicy] = {
+    # Per client IP
+    'login': RateLimitPolicy(10, 60),
+    'otp_send': RateLimitPolicy(5, 300, SLIDING_WINDOW),
+    'otp_verify': RateLimitPolicy(10, 300, SLIDING_WINDOW),
+    'password_reset': RateLimitPolicy(5, 900, SLIDING_WINDOW),
+    'registration': RateLimitPolicy(10, 3600, SLIDING_WINDOW),
+    'availability': RateLimitPolicy(30, 60),
+    'public': RateLimitPolicy(120, 60),
+    # Per account identifier, across IPs (credential stuffing, OTP flooding)
+    'login_identity': RateLimitPolicy(10, 300, SLIDING_WINDOW),
+    'otp_identity': RateLimitPolicy(3, 300, SLIDING_WINDOW),
+}
+
+RATE_LIMITED = metrics.counter(
+    'smartblood_rate_limited_total', 'Requests rejected by the rate limiter', ('policy',)
+)
+
+
+def sliding_window_retry_after(limit: int, period: float, elapsed: float,
+                               current: int, previous: int) -> float:
+    """Seconds until the weighted count leaves room for one more request"""
+    remaining_window = period - elapsed
+    if current + 1 > limit or previous <= 0:
+        return remaining_window
+    # previous * (1 - (elapsed + t) / period) + current + 1 <= limit
+    wait = (previous * (1 - elapsed / period) + current + 1 - limit) * period / previous
+    return min(max(wait, 0.0), remaining_window)
+
+
+class MemoryRateLimitBackend:
+    """Per-process state, one small list per key, oldest keys evicted first"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._state: 'OrderedDict[str, list]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str, default: list) -> list:
+        entry = self._state.get(key)
+        if entry is None:
+            entry = self._state[key] = default
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+        return entry
+
+    def hit(self, key: str, policy: RateLimitPolicy, now: float) -> Tuple[bool, int, float]:
+        """
+        Count one request
+
+        Returns:
+            (allowed, remaining, retry_after_seconds)
+        """
+        with self._lock:
+            if policy.algorithm == SLIDING_WINDOW:
+                window = int(now // policy.period)
+                entry = self._entry(key, [window, 0, 0])  # window, current, previous
+                if entry[0] != window:
+                    entry[2] = entry[1] if entry[0] == window - 1 else 0
+                    entry[0], entry[1] = window, 0
+                elapsed = now - window * policy.period
+                estimate = entry[2] * (1 - elapsed / policy.period) + entry[1]
+                if estimate + 1 > policy.limit:
+                    return False, 0, sliding_window_retry_after(
+                        policy.limit, policy.period, elapsed, entry[1], entry[2])
+                entry[1] += 1
+                return True, int(policy.limit - estimate - 1), 0.0
+
+            rate = policy.limit / policy.period
+            entry = self._entry(key, [float(policy.limit), now])  # tokens, updated_at
+            tokens = min(policy.limit, entry[0] + (now - entry[1]) * rate)
+            entry[1] = now
+            if tokens < 1:
+                entry[0] = tokens
+                return False, 0, (1 - tokens) / rate
+            entry[0] = tokens - 1
+            return True, int(entry[0]), 0.0
+
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl_ms = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ttl_ms)
+return {allowed, tostring(tokens)}
+"""
+
+_SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimate = previous * (1 - elapsed / period) + current
+if estimate + 1 > limit then
+  return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+  redis.call('EXPIRE', KEYS[1], math.ceil(period * 2))
+end
+return {1, current, previous}
+"""
+
+
+class RedisRateLimitBackend:
+    """Shared state for all workers; each check is one atomic script call"""
+
+    def __init__(self, url: str, prefix: str = 'smartblood:ratelimit'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._token_bucket = self._redis.register_script(_TOKEN_BUCKET_LUA)
+        self._sliding_window = self._redis.register_script(_SLIDING_WINDOW_LUA)
+
+    def hit(self, key: str, policy: RateLimitPolicy, now: float) -> Tuple[bool, int, float]:
+        if policy.algorithm == SLIDING_WINDOW:
+            window = int(now // policy.period)
+            elapsed = now - window * policy.period
+            allowed, current, previous = self._sliding_window(
+                keys=[f"{self._prefix}:{key}:{window}", f"{self._prefix}:{key}:{window - 1}"],
+                args=[policy.limit, policy.period, elapsed]
+            )
+            if not allowed:
+                return False, 0, sliding_window_retry_after(
+                    policy.limit, policy.period, elapsed, int(current), int(previous))
+            estimate = int(previous) * (1 - elapsed / policy.period) + int(current)
+            return True, max(0, int(policy.limit - estimate)), 0.0
+
+        rate = policy.limit / policy.period
+        allowed, tokens = self._token_bucket(
+            keys=[f"{self._prefix}:{key}"],
+            args=[policy.limit, rate, now, int(policy.period * 1000) + 1000]
+        )
+        tokens = float(tokens)
+        if not allowed:
+            return False, 0, (1 - tokens) / rate
+        return True, int(tokens), 0.0
+
+
+def client_ip() -> str:
+    """Default key: the client address (forwarded one behind TRUSTED_PROXY_COUNT proxies)"""
+    return request.remote_addr or 'unknown'
+
+
+def json_field(*names: str) -> Callable[[], Optional[str]]:
+    """
+    Key on the first present JSON body field (e.g. the account being logged into)
+
+    Requests without any of the fields are not counted by that policy.
+    """
+    def key():
+        data = request.get_json(silent=True) or {}
+        for name in names:
+            value = data.get(name)
+            if value not in (None, ''):
+                return str(value).strip().lower()
+        return None
+    return key
+
+
+class RateLimiter:
+    """Named rate-limit policies applied as route decorators"""
+
+    def __init__(self):
+        self.enabled = True
+        self.policies: Dict[str, RateLimitPolicy] = dict(DEFAULT_POLICIES)
+        self.backend = MemoryRateLimitBackend()
+
+    def init_app(self, app):
+        """Pick the backend and apply overrides from config"""
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        for name, (limit, period) in (app.config.get('RATE_LIMIT_OVERRIDES') or {}).items():
+            base = self.policies.get(name, RateLimitPolicy(limit, period))
+            self.policies[name] = replace(base, limit=limit, period=period)
+
+        url = app.config.get('RATE_LIMIT_STORAGE_URL') or 'memory://'
+        if url.startswith(('redis://', 'rediss://', 'unix://')):
+            self.backend = RedisRateLimitBackend(url)
+        else:
+            self.backend = MemoryRateLimitBackend(app.config.get('RATE_LIMIT_MAX_KEYS', 100000))
+
+        @app.after_request
+        def _rate_limit_headers(response):
+            # A rejection already carries the headers of the policy that rejected it
+            state = g.get('rate_limit')
+            if state and not g.get('rate_limited'):
+                response.headers['X-RateLimit-Limit'] = str(state[0])
+                response.headers['X-RateLimit-Remaining'] = str(state[1])
+            return response
+
+    def check(self, name: str, key: str) -> Tuple[bool, int, float]:
+        """
+        Count one request for key under the named policy
+
+        Backend errors fail open so a Redis outage does not lock users out.
+
+        Returns:
+            (allowed, remaining, retry_after_seconds)
+        """
+        policy = self.policies[name]
+        try:
+            return self.backend.hit(f"{name}:{key}", policy, time.time())
+        except Exception as e:
+            current_app.logger.warning(f"[RATE LIMIT] Backend error, allowing request: {e}")
+            return True, policy.limit, 0.0
+
+    def limit(self, name: str, key: Callable[[], Optional[str]] = client_ip):
+        """
+        Decorator: reject with 429 and Retry-After once the policy is exhausted
+
+        Args:
+            name: Policy name (see DEFAULT_POLICIES)
+            key: Callable returning the identity to count (None skips the check)
+        """
+        if name not in self.policies:
+            raise KeyError(f"Unknown rate limit policy: {name}")
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method == 'OPTIONS':
+                    return fn(*args, **kwargs)
+                identity = key()
+                if identity is None:
+                    return fn(*args, **kwargs)
+
+                allowed, remaining, retry_after = self.check(name, identity)
+                policy = self.policies[name]
+                if not allowed:
+                    RATE_LIMITED.inc(policy=name)
+                    g.rate_limited = True
+                    retry_after = max(1, math.ceil(retry_after))
+                    response = jsonify({
+                        "error": "Too many requests",
+                        "message": f"Rate limit exceeded, retry in {retry_after} seconds",
+                        "retry_after": retry_after
+                    })
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(retry_after)
+                    response.headers['X-RateLimit-Limit'] = str(policy.limit)
+                    response.headers['X-RateLimit-Remaining'] = '0'
+                    return response
+
+                # Report the tightest policy applied to this request
+                current = g.get('rate_limit')
+                if current is None or remaining < current[1]:
+                    g.rate_limit = (policy.limit, remaining)
+                return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def ad_hoc(self, max_requests: int, window_seconds: float) -> str:
+        """Register (or reuse) an anonymous policy; used by security.rate_limit"""
+        name = f"adhoc_{max_requests}_{int(window_seconds)}"
+        self.policies.setdefault(name, RateLimitPolicy(max_requests, window_seconds))
+        return name
+
+
+rate_limiter = RateLimiter()
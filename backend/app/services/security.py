@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify, current_app
 from cryptography.fernet import Fernet
+from app.services.rate_limiter import rate_limiter
 import os
 import json
 
@@ -195,20 +196,8 @@ def api_key_required(required_level='homepage_read'):
     return decorator
 
 def rate_limit(max_requests=100, window_seconds=3600):
-    """Decorator to implement rate limiting"""
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            # Simple in-memory rate limiting (in production, use Redis)
-            client_ip = request.remote_addr
-            current_time = datetime.utcnow()
-            
-            # Check rate limit (simplified implementation)
-            # In production, implement proper rate limiting with Redis
-            return f(*args, **kwargs)
-        
-        return decorated_function
-    return decorator
+    """Decorator to implement rate limiting (per client IP, token bucket)"""
+    return rate_limiter.limit(rate_limiter.ad_hoc(max_requests, window_seconds))
 
 def validate_input(schema):
     """Decorator to validate input data"""
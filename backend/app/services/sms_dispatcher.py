@@ -0,0 +1,273 @@
+"""
+Concurrent SMS dispatch with rate control, de-duplication and retries
+
+send_batch() fans a list of messages out over a thread pool capped at
+SMS_MAX_IN_FLIGHT concurrent provider calls, so notifying K donors takes
+roughly one provider round trip instead of K. Every call first takes a
+token from a shared bucket (SMS_RATE_PER_SECOND) to stay inside the
+provider's account limit.
+
+The same body to the same number within SMS_DEDUP_SECONDS is sent once;
+later copies report deduplicated=True. Transient failures (HTTP 429/5xx,
+network errors) are retried with exponential backoff.
+
+Transports: 'twilio' (default) and 'fake', which records messages in
+memory with a configurable latency for local runs and tests.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from app.services.metrics import metrics, SMS_SEND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SMS_DISPATCHED = metrics.counter(
+    'sms_dispatched_total', 'SMS messages by final outcome', ['outcome']
+)
+
+
+class SMSTransportError(Exception):
+    """Provider call failed; `transient` says whether a retry may help"""
+
+    def __init__(self, message: str, transient: bool = True):
+        super().__init__(message)
+        self.transient = transient
+
+
+@dataclass
+class SMSResult:
+    to: str
+    ok: bool
+    sid: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    deduplicated: bool = False
+
+
+class TwilioTransport:
+    """Sends through the Twilio client owned by sms_service"""
+
+    name = 'twilio'
+
+    def __init__(self, service):
+        self.service = service
+
+    def configured(self) -> bool:
+        return bool(self.service.client and self.service.from_number)
+
+    def send(self, to: str, body: str) -> str:
+        try:
+            msg = self.service.client.messages.create(
+                body=body,
+                from_=self.service._normalize_e164(self.service.from_number),
+                to=to
+            )
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            # No HTTP status means the request never completed (network error)
+            transient = status is None or status == 429 or status >= 500
+            raise SMSTransportError(str(e), transient=transient) from e
+        return msg.sid
+
+
+class FakeSMSTransport:
+    """In-memory provider for local runs and tests"""
+
+    name = 'fake'
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent: List[Tuple[str, str]] = []
+        self._failures: List[bool] = []
+        self._lock = threading.Lock()
+
+    def configured(self) -> bool:
+        return True
+
+    def fail_next(self, count: int = 1, transient: bool = True):
+        """Make the next `count` sends raise"""
+        with self._lock:
+            self._failures.extend([transient] * count)
+
+    def send(self, to: str, body: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self._failures:
+                raise SMSTransportError('fake transport failure', transient=self._failures.pop(0))
+            self.sent.append((to, body))
+            sid = f"FAKE{len(self.sent):06d}"
+        logger.info(f"[FAKE SMS] {sid} to {to}: {body}")
+        return sid
+
+
+class _TokenBucket:
+    """Blocking token bucket shared by all dispatch threads"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SMSDispatcher:
+    """Bounded-concurrency, rate-limited SMS sender"""
+
+    def __init__(self):
+        self.app = None
+        self.transport = None
+        self.max_in_flight = 8
+        self.max_retries = 2
+        self.backoff_seconds = 0.5
+        self.dedup_seconds = 300.0
+        self.dedup_max_keys = 50000
+        self._bucket = _TokenBucket(10.0)
+        self._recent: 'OrderedDict[str, float]' = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    def init_app(self, app, service=None):
+        """Read limits and choose the transport from config"""
+        self.app = app
+        self.max_in_flight = int(app.config.get('SMS_MAX_IN_FLIGHT', self.max_in_flight))
+        self.max_retries = int(app.config.get('SMS_MAX_RETRIES', self.max_retries))
+        self.backoff_seconds = float(app.config.get('SMS_RETRY_BACKOFF_SECONDS', self.backoff_seconds))
+        self.dedup_seconds = float(app.config.get('SMS_DEDUP_SECONDS', self.dedup_seconds))
+        self._bucket = _TokenBucket(float(app.config.get('SMS_RATE_PER_SECOND', 10.0)))
+        if app.config.get('SMS_TRANSPORT', 'twilio') == 'fake':
+            self.transport = FakeSMSTransport(float(app.config.get('SMS_FAKE_LATENCY_SECONDS', 0.0)))
+        elif service is not None:
+            self.transport = TwilioTransport(service)
+
+    @property
+    def _log(self):
+        return self.app.logger if self.app is not None else logger
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Executor created on first use (and again after a fork)"""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._executor_lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_in_flight, thread_name_prefix='sms-dispatch'
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+    def _claim(self, to: str, body: str) -> Optional[str]:
+        """
+        Reserve (to, body) for the dedup window
+
+        Returns:
+            The dedup key, or None if an identical message was sent recently
+        """
+        if self.dedup_seconds <= 0:
+            return ''
+        key = f"{to}:{hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+        now = time.monotonic()
+        with self._recent_lock:
+            expires = self._recent.get(key)
+            if expires is not None and expires > now:
+                return None
+            self._recent[key] = now + self.dedup_seconds
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.dedup_max_keys:
+                self._recent.popitem(last=False)
+        return key
+
+    def _release(self, key: str):
+        """Forget a failed message so a later retry by the caller is not swallowed"""
+        if key:
+            with self._recent_lock:
+                self._recent.pop(key, None)
+
+    def _deliver(self, to: str, body: str) -> SMSResult:
+        key = self._claim(to, body)
+        if key is None:
+            SMS_DISPATCHED.inc(outcome='deduplicated')
+            return SMSResult(to=to, ok=True, deduplicated=True)
+
+        attempts = 0
+        while True:
+            attempts += 1
+            self._bucket.acquire()
+            start = time.perf_counter()
+            try:
+                sid = self.transport.send(to, body)
+            except SMSTransportError as e:
+                SMS_SEND_SECONDS.observe(time.perf_counter() - start, provider=self.transport.name, outcome='failure')
+                if e.transient and attempts <= self.max_retries:
+                    delay = self.backoff_seconds * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+                    self._log.warning(f"[SMS] Send to {to} failed ({e}); retry {attempts}/{self.max_retries} in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                self._release(key)
+                SMS_DISPATCHED.inc(outcome='failed')
+                self._log.error(f"[SMS] Send to {to} failed after {attempts} attempts: {e}")
+                return SMSResult(to=to, ok=False, error=str(e), attempts=attempts)
+            SMS_SEND_SECONDS.observe(time.perf_counter() - start, provider=self.transport.name, outcome='success')
+            SMS_DISPATCHED.inc(outcome='sent')
+            return SMSResult(to=to, ok=True, sid=sid, attempts=attempts)
+
+    def send(self, to: str, body: str) -> SMSResult:
+        """Send one message on the calling thread (rate limit, dedup and retries apply)"""
+        return self._deliver(to, body)
+
+    def send_batch(self, messages: Iterable[Tuple[str, str]], timeout: Optional[float] = None) -> List[SMSResult]:
+        """
+        Send many messages concurrently
+
+        Args:
+            messages: (to, body) pairs; numbers should already be E.164
+            timeout: Seconds to wait for the whole batch (None waits for all)
+
+        Returns:
+            One SMSResult per message, in input order
+        """
+        messages = list(messages)
+        if not messages:
+            return []
+        if len(messages) == 1:
+            return [self._deliver(*messages[0])]
+
+        pool = self._pool()
+        futures = [pool.submit(self._deliver, to, body) for to, body in messages]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = []
+        for (to, _), future in zip(messages, futures):
+            try:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                results.append(future.result(timeout=remaining))
+            except Exception as e:
+                results.append(SMSResult(to=to, ok=False, error=f"{type(e).__name__}: {e}"))
+        return results
+
+
+# Global instance
+sms_dispatcher = SMSDispatcher()
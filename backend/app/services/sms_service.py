@@ -1,11 +1,7 @@
 import os
-import os
+from typing import List, Tuple
 from flask import current_app
-
-try:
-    from twilio.rest import Client
-except Exception:  # Twilio not installed yet
-    Client = None
+from app.services.sms_dispatcher import sms_dispatcher, SMSResult, TwilioTransport
 
 class SMSService:
     def __init__(self):
@@ -13,15 +9,26 @@ class SMSService:
         self.auth_token = os.environ.get("TWILIO_AUTH_TOKEN")
         self.from_number = os.environ.get("TWILIO_FROM")
         self.default_country_code = os.environ.get("DEFAULT_COUNTRY_CODE", "+91")
-        self.client = None
-        if Client and self.account_sid and self.auth_token:
+        self._client = None
+        self._client_attempted = False
+
+    @property
+    def client(self):
+        """Twilio client, created on first use (twilio is slow to import)"""
+        if not self._client_attempted and self.account_sid and self.auth_token:
+            self._client_attempted = True
+            try:
+                from twilio.rest import Client
+            except Exception:  # Twilio not installed yet
+                return None
             try:
-                self.client = Client(self.account_sid, self.auth_token)
+                self._client = Client(self.account_sid, self.auth_token)
             except Exception as e:
                 try:
                     current_app.logger.error(f"Failed to init Twilio client: {e}")
                 except Exception:
                     pass
+        return self._client
 
     def _normalize_e164(self, number: str) -> str:
         """Normalize a phone number to E.164. If it already starts with '+', assume valid.
@@ -41,39 +48,47 @@ class SMSService:
             return f"+{digits}"
         return n
 
+    def _dispatcher(self):
+        """Shared dispatcher; falls back to Twilio if create_app did not configure it"""
+        if sms_dispatcher.transport is None:
+            sms_dispatcher.transport = TwilioTransport(self)
+        return sms_dispatcher
+
+    def _dev_fallback(self, to_number: str, body: str) -> bool:
+        """Twilio not configured: log and report success in DEBUG to unblock flows"""
+        if current_app.config.get('DEBUG', False):
+            current_app.logger.info(f"[DEV SMS] Would send to {to_number}: {body}")
+            return True
+        current_app.logger.error("Twilio not configured. Set TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM")
+        return False
+
     def send_sms(self, to_number: str, body: str) -> bool:
         """Send SMS using Twilio; returns True if queued/sent, False otherwise."""
-        # Dev fallback: if Twilio not configured, log and return True in DEBUG to unblock flows
-        if not self.client or not self.from_number:
-            try:
-                if current_app and current_app.config.get('DEBUG', False):
-                    current_app.logger.info(f"[DEV SMS] Would send to {to_number}: {body}")
-                    return True
-                if current_app:
-                    current_app.logger.error("Twilio not configured. Set TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM")
-            finally:
-                pass
-            return False
-        try:
-            to_e164 = self._normalize_e164(to_number)
-            from_e164 = self._normalize_e164(self.from_number)
-            msg = self.client.messages.create(
-                body=body,
-                from_=from_e164,
-                to=to_e164
-            )
-            try:
-                current_app.logger.info(f"Twilio SMS sent id={msg.sid} to={to_e164}")
-            finally:
-                pass
-            return True
-        except Exception as e:
-            try:
-                if current_app:
-                    current_app.logger.error(f"Twilio SMS error to {to_number}: {e}")
-            finally:
-                pass
-            return False
+        dispatcher = self._dispatcher()
+        if not dispatcher.transport.configured():
+            return self._dev_fallback(to_number, body)
+        result = dispatcher.send(self._normalize_e164(to_number), body)
+        if result.ok and result.sid:
+            current_app.logger.info(f"SMS sent id={result.sid} to={result.to}")
+        return result.ok
+
+    def send_bulk(self, messages: List[Tuple[str, str]]) -> List[SMSResult]:
+        """
+        Send many SMS concurrently (bounded in-flight, rate-limited, deduplicated)
+
+        Args:
+            messages: (to_number, body) pairs
+
+        Returns:
+            One SMSResult per message, in input order
+        """
+        dispatcher = self._dispatcher()
+        if not dispatcher.transport.configured():
+            return [SMSResult(to=to_number, ok=self._dev_fallback(to_number, body))
+                    for to_number, body in messages]
+        return dispatcher.send_batch(
+            [(self._normalize_e164(to_number), body) for to_number, body in messages]
+        )
 
 sms_service = SMSService()
 
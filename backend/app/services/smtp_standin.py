@@ -0,0 +1,150 @@
+"""
+Local SMTP stand-in for development and tests
+
+smtpd is gone from the standard library (3.12) and aiosmtpd is not a
+dependency, so this is a small threaded server speaking just enough SMTP
+for smtplib: EHLO/HELO, AUTH (accepts anything), MAIL, RCPT, DATA, RSET,
+NOOP and QUIT. Received messages are kept in memory.
+
+    with SMTPStandIn() as server:          # picks a free port
+        # SMTP_SERVER=127.0.0.1 SMTP_PORT=server.port SMTP_USE_TLS=false
+        ...
+        server.messages[0]['rcpt']
+
+fail_next(code, count) makes the next RCPT replies fail, for exercising
+retries (4xx) and permanent failures (5xx).
+"""
+
+import socketserver
+import threading
+import time
+from typing import Dict, List
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    timeout = 30
+
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server: 'SMTPStandIn' = self.server.standin
+        server.connections += 1
+        mail_from, rcpt = None, []
+        self._reply(f"220 {server.hostname} SmartBlood SMTP stand-in")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            verb = line.split(' ', 1)[0].upper()
+            arg = line[len(verb):].strip()
+
+            if verb == 'EHLO':
+                self.wfile.write(f"250-{server.hostname}\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n".encode())
+            elif verb == 'HELO':
+                self._reply(f"250 {server.hostname}")
+            elif verb == 'AUTH':
+                mechanism = arg.split(' ')
+                if mechanism[0].upper() == 'LOGIN':
+                    # Username and password prompts (smtplib may send the username inline)
+                    if len(mechanism) < 2:
+                        self._reply("334 VXNlcm5hbWU6")
+                        self.rfile.readline()
+                    self._reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                elif len(mechanism) < 2:
+                    self._reply("334 ")
+                    self.rfile.readline()
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == 'MAIL':
+                mail_from, rcpt = arg.split(':', 1)[-1].strip().strip('<>'), []
+                self._reply("250 OK")
+            elif verb == 'RCPT':
+                failure = server._take_failure()
+                if failure:
+                    self._reply(f"{failure} Recipient rejected by stand-in")
+                else:
+                    rcpt.append(arg.split(':', 1)[-1].strip().strip('<>'))
+                    self._reply("250 OK")
+            elif verb == 'DATA':
+                if not rcpt:
+                    self._reply("503 Need RCPT")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data[1:] if data.startswith(b'..') else data)
+                server._store(mail_from, rcpt, b''.join(lines))
+                mail_from, rcpt = None, []
+                self._reply("250 OK queued")
+            elif verb == 'RSET':
+                mail_from, rcpt = None, []
+                self._reply("250 OK")
+            elif verb == 'NOOP':
+                self._reply("250 OK")
+            elif verb == 'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _ThreadedServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPStandIn:
+    """In-process SMTP server collecting messages instead of delivering them"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, hostname: str = 'localhost'):
+        self.hostname = hostname
+        self.messages: List[Dict] = []
+        self.connections = 0
+        self._failures: List[int] = []
+        self._lock = threading.Lock()
+        self._server = _ThreadedServer((host, port), _SMTPHandler)
+        self._server.standin = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='smtp-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def fail_next(self, code: int = 451, count: int = 1):
+        """Reject the next `count` recipients with `code`"""
+        with self._lock:
+            self._failures.extend([code] * count)
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        """Block until at least `count` messages arrived"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if len(self.messages) >= count:
+                return True
+            time.sleep(0.01)
+        return len(self.messages) >= count
+
+    def _take_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _store(self, mail_from: str, rcpt: List[str], data: bytes):
+        with self._lock:
+            self.messages.append({'from': mail_from, 'rcpt': rcpt, 'data': data})
@@ -0,0 +1,211 @@
+"""
+SQL diagnostics
+Counts and times every statement issued during a Flask request or Celery
+task, keeps the slowest ones, flags repeated statements (N+1 patterns) and
+reports the totals through a Server-Timing header and /api/debug/sql
+"""
+
+import re
+import time
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from flask import request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar('sql_query_stats', default=None)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PLACEHOLDER_LIST_RE = re.compile(r'\(\s*(%\([^)]*\)s|\?|\$\d+|:\w+)(\s*,\s*(%\([^)]*\)s|\?|\$\d+|:\w+))*\s*\)')
+_NUMBER_RE = re.compile(r'\b\d+(\.\d+)?\b')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape so repeats with different parameters compare equal"""
+    normalized = _STRING_RE.sub('?', statement)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST_RE.sub('(?)', normalized)
+    return _WHITESPACE_RE.sub(' ', normalized).strip()
+
+
+class QueryStats:
+    """Statements recorded for one request or task"""
+
+    def __init__(self, label: str, keep_slowest: int = 5):
+        self.label = label
+        self.keep_slowest = keep_slowest
+        self.count = 0
+        self.total_ms = 0.0
+        self.started = time.perf_counter()
+        self.by_statement: Counter = Counter()
+        self.slowest: List[Dict] = []
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.by_statement[normalize_statement(statement)] += 1
+        if len(self.slowest) < self.keep_slowest or elapsed_ms > self.slowest[-1]['ms']:
+            self.slowest.append({'ms': round(elapsed_ms, 3), 'statement': statement[:500]})
+            self.slowest.sort(key=lambda s: s['ms'], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+    def repeated(self, threshold: int) -> List[Dict]:
+        """Normalized statements that ran more than threshold times"""
+        return [
+            {'count': n, 'statement': stmt[:500]}
+            for stmt, n in self.by_statement.most_common()
+            if n > threshold
+        ]
+
+    def summary(self, threshold: int) -> Dict:
+        return {
+            'label': self.label,
+            'statements': self.count,
+            'db_ms': round(self.total_ms, 3),
+            'elapsed_ms': round((time.perf_counter() - self.started) * 1000.0, 3),
+            'slowest': self.slowest,
+            'n_plus_one': self.repeated(threshold),
+            'recorded_at': time.time()
+        }
+
+
+class SQLDiagnostics:
+    """Per-request / per-task SQL instrumentation"""
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.threshold = 10
+        self.keep_slowest = 5
+        self.recent = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._listening = False
+        self._celery_connected = False
+
+    def init_app(self, app):
+        """Hook engine events, request lifecycle and Celery task signals"""
+        self.app = app
+        self.enabled = bool(app.config.get('SQL_DIAGNOSTICS_ENABLED', app.debug))
+        self.threshold = int(app.config.get('SQL_N_PLUS_ONE_THRESHOLD', self.threshold))
+        self.keep_slowest = int(app.config.get('SQL_SLOWEST_STATEMENTS', self.keep_slowest))
+        self.recent = deque(self.recent, maxlen=int(app.config.get('SQL_DIAGNOSTICS_HISTORY', 100)))
+        if not self.enabled:
+            return
+
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_execute)
+            self._listening = True
+
+        app.before_request(self._start_request)
+        app.after_request(self._add_server_timing)
+        app.teardown_request(self._finish_request)
+        self._connect_celery()
+
+    # ------------------------------------------------------------------
+    # Engine events
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault('sql_diagnostics_start', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        starts = conn.info.get('sql_diagnostics_start')
+        if stats is None or not starts:
+            return
+        stats.record(statement, (time.perf_counter() - starts.pop()) * 1000.0)
+
+    # ------------------------------------------------------------------
+    # Units of work
+    # ------------------------------------------------------------------
+
+    def start(self, label: str):
+        """Begin recording for the current request/task; returns a reset token"""
+        return _current.set(QueryStats(label, self.keep_slowest))
+
+    def current(self) -> Optional[QueryStats]:
+        return _current.get()
+
+    def finish(self, token=None, logger=None) -> Optional[Dict]:
+        """Stop recording, warn about N+1 patterns and keep the summary"""
+        stats = _current.get()
+        try:
+            if token is None:
+                raise ValueError
+            _current.reset(token)
+        except ValueError:
+            # No token, or it was created in another context
+            _current.set(None)
+        if stats is None:
+            return None
+
+        summary = stats.summary(self.threshold)
+        logger = logger or (self.app.logger if self.app else None)
+        if logger:
+            for repeat in summary['n_plus_one']:
+                logger.warning(
+                    f"[SQL] Possible N+1 in {stats.label}: {repeat['count']}x {repeat['statement']}"
+                )
+        with self._lock:
+            self.recent.append(summary)
+        return summary
+
+    def recent_summaries(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            return list(self.recent)[-limit:][::-1]
+
+    # ------------------------------------------------------------------
+    # Flask hooks
+    # ------------------------------------------------------------------
+
+    def _start_request(self):
+        request.environ['sql_diagnostics.token'] = self.start(f"{request.method} {request.path}")
+
+    def _add_server_timing(self, response):
+        stats = _current.get()
+        if stats is not None:
+            timing = f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+            existing = response.headers.get('Server-Timing')
+            response.headers['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+        return response
+
+    def _finish_request(self, exc=None):
+        token = request.environ.pop('sql_diagnostics.token', None)
+        if token is not None:
+            self.finish(token, current_app.logger)
+
+    # ------------------------------------------------------------------
+    # Celery hooks
+    # ------------------------------------------------------------------
+
+    def _connect_celery(self):
+        if self._celery_connected:
+            return
+        try:
+            from celery.signals import task_prerun, task_postrun
+        except ImportError:
+            return
+
+        tokens = {}
+
+        @task_prerun.connect(weak=False)
+        def _task_started(task_id=None, task=None, **kwargs):
+            tokens[task_id] = self.start(f"task {getattr(task, 'name', task_id)}")
+
+        @task_postrun.connect(weak=False)
+        def _task_finished(task_id=None, **kwargs):
+            self.finish(tokens.pop(task_id, None))
+
+        self._celery_connected = True
+
+
+# Global instance
+sql_diagnostics = SQLDiagnostics()
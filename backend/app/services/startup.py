@@ -0,0 +1,90 @@
+"""
+Startup helpers: create_app phase timing and deferred initialization
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Times create_app phases when STARTUP_PROFILE is enabled"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []
+        self._modules_before = set(sys.modules) if enabled else set()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the wall time of the enclosed block under name"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, app):
+        """
+        Print the phase breakdown and keep it on app.extensions['startup_profile']
+
+        Args:
+            app: Flask application that just finished create_app
+        """
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self.started
+        imported = sorted(set(sys.modules) - self._modules_before)
+        app.extensions['startup_profile'] = {
+            'total_ms': round(total * 1000, 1),
+            'modules_imported': len(imported),
+            'phases': [
+                {'name': name, 'ms': round(seconds * 1000, 1)}
+                for name, seconds in self.phases
+            ]
+        }
+
+        print("\n[STARTUP] create_app phases:")
+        print("-" * 50)
+        for name, seconds in sorted(self.phases, key=lambda p: p[1], reverse=True):
+            print(f"{seconds * 1000:10.1f}ms  {name}")
+        print("-" * 50)
+        print(f"{total * 1000:10.1f}ms  total ({len(imported)} modules imported)\n")
+
+
+def run_deferred(app, name: str, func, background: bool = True):
+    """
+    Run func(app) inside an app context, on a daemon thread when background
+
+    Failures are logged and never stop the app from serving requests.
+
+    Args:
+        app: Flask application
+        name: Label used in log lines and the thread name
+        func: Callable taking the app
+        background: False runs func before returning (workers that fork)
+
+    Returns:
+        The started thread, or None when run inline
+    """
+    def _target():
+        start = time.perf_counter()
+        with app.app_context():
+            try:
+                func(app)
+            except Exception as e:
+                app.logger.error(f"[STARTUP] Deferred {name} failed: {e}")
+                return
+        print(f"[STARTUP] {name} finished in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    if not background:
+        _target()
+        return None
+
+    thread = threading.Thread(target=_target, name=f"startup-{name}", daemon=True)
+    thread.start()
+    return thread
@@ -2,12 +2,84 @@
 Celery Application Instance
 """
 
-from celery import Celery
+import os
+from celery import Celery, Task
+from celery.signals import worker_process_init, worker_process_shutdown
+from flask import has_app_context
 from app.config.celery_config import CeleryConfig
 
+
+# Flask app owned by this worker process (built once, see get_worker_app)
+_flask_app = None
+_flask_app_pid = None
+
+
+def get_worker_app():
+    """
+    Flask app for the current process
+
+    Built on first use and then reused by every task, so tasks share one
+    pooled engine and one warmed ModelClient instead of calling create_app().
+    """
+    global _flask_app, _flask_app_pid
+    if _flask_app is None:
+        from app import create_app
+        _flask_app = create_app(background_init=False)
+        _flask_app_pid = os.getpid()
+    return _flask_app
+
+
+def set_worker_app(app):
+    """Use an already created app (e.g. the one celery_worker.py builds)"""
+    global _flask_app, _flask_app_pid
+    _flask_app = app
+    _flask_app_pid = os.getpid()
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Prepare the app in each prefork child before it takes tasks"""
+    global _flask_app_pid
+    if _flask_app is not None and _flask_app_pid != os.getpid():
+        # Inherited from the parent: keep the loaded models, but never share
+        # the parent's pooled DB sockets across the fork
+        from app.models import db
+        with _flask_app.app_context():
+            db.engine.dispose(close=False)
+        _flask_app_pid = os.getpid()
+    get_worker_app()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    """Flush buffered prediction logs; prefork children exit via os._exit, skipping atexit"""
+    from app.services.prediction_log_service import prediction_log_service
+    prediction_log_service.shutdown()
+
+
+class FlaskTask(Task):
+    """Runs every task inside an app context of the process-wide app"""
+
+    def __call__(self, *args, **kwargs):
+        if has_app_context():
+            return super().__call__(*args, **kwargs)
+
+        from app.models import db
+        with get_worker_app().app_context():
+            try:
+                return super().__call__(*args, **kwargs)
+            finally:
+                db.session.remove()
+
+
+# Task modules imported by every worker (autodiscover_tasks would only look
+# for an app.tasks.tasks module)
+TASK_MODULES = [
+    'app.tasks.donor_matching',
+    'app.tasks.email_tasks',
+    'app.tasks.ml_tasks',
+]
+
 # Create Celery instance
-celery_app = Celery('smartblood')
+celery_app = Celery('smartblood', task_cls=FlaskTask, include=TASK_MODULES)
 celery_app.config_from_object(CeleryConfig)
-
-# Auto-discover tasks
-celery_app.autodiscover_tasks(['app.tasks'])
@@ -9,7 +9,7 @@ from typing import List
 from flask import current_app
 from app.tasks.celery_app import celery_app as celery
 from app.models import (
-    db, Request, Donor, MatchPrediction, ModelPredictionLog,
+    db, Request, Donor, MatchPrediction,
     Match, Notification, User
 )
 from app.services.donor_matcher import (
@@ -23,7 +23,10 @@ from app.services.ml_service import (
     load_model
 )
 from app.services.sms_service import sms_service
+from app.services.prediction_log_service import log_prediction
 from app.services.email_service import EmailService
+from app.services.email_renderer import email_renderer
+from app.services.match_events import match_events
 import secrets
 
 # Initialize email service
@@ -70,12 +73,16 @@ def _match_donors_for_request_impl(request_id: int, radius_km: float = 20.0, top
                 f"(blood group: {request.blood_group}, urgency: {request.urgency})"
             )
             
+            match_events.publish(request_id, 'search_started', {'radius_km': radius_km})
+            
             # 2. Select candidate donors
             start_time = time.time()
             candidates = select_candidate_donors(request, radius_km)
+            match_events.publish(request_id, 'candidates_found', {'count': len(candidates), 'radius_km': radius_km})
             
             if not candidates:
                 current_app.logger.warning(f"No eligible donors found for request {request_id}")
+                match_events.publish(request_id, 'search_completed', {'matched': 0, 'notified': 0, 'radius_km': radius_km})
                 return {"matched": 0, "notified": 0, "message": "No eligible donors found"}
             
             # 3. Extract features and predict scores for each candidate
@@ -156,34 +163,46 @@ def _match_donors_for_request_impl(request_id: int, radius_km: float = 20.0, top
                 mp.rank = rank
             
             db.session.commit()
+            match_events.publish(request_id, 'scored', {
+                'count': len(match_predictions),
+                'top_scores': [round(mp.match_score, 3) for mp in match_predictions[:5]]
+            })
             
-            # 7. Select top-K donors and enqueue notifications
+            # 7. Select top-K donors and notify them in one batch
+            # (SMS go out concurrently, so K donors take about one provider round trip)
             top_matches = match_predictions[:top_k]
             notified_count = 0
             
-            for mp in top_matches:
+            if top_matches:
+                top_ids = [mp.id for mp in top_matches]
                 try:
                     # Enqueue notification task or run synchronously
                     try:
-                        notify_donor_task.delay(mp.id, request_id)
+                        notify_donors_task.delay(top_ids, request_id)
                     except Exception as e:
                         current_app.logger.warning(f"Celery not available, running notification synchronously: {str(e)}")
                         # Run synchronously as fallback
-                        notify_donor_task(mp.id, request_id)
+                        notify_donors_task(top_ids, request_id)
                     
-                    mp.notified = True
-                    notified_count += 1
+                    for mp in top_matches:
+                        mp.notified = True
+                    notified_count = len(top_matches)
                 except Exception as e:
                     current_app.logger.error(
-                        f"Failed to notify donor {mp.donor_id}: {str(e)}"
+                        f"Failed to notify donors for request {request_id}: {str(e)}"
                     )
             
             db.session.commit()
+            if notified_count:
+                match_events.publish(request_id, 'donor_notified', {
+                    'count': notified_count,
+                    'donor_ids': [mp.donor_id for mp in top_matches]
+                })
             
             # 8. Log model prediction for monitoring
             elapsed_time = (time.time() - start_time) * 1000.0  # ms
-            log = ModelPredictionLog(
-                model_name='donor_matcher',
+            log_prediction(
+                'donor_matcher',
                 model_version=model_version,
                 endpoint=f'/tasks/match_donors/{request_id}',
                 input_data={
@@ -199,16 +218,18 @@ def _match_donors_for_request_impl(request_id: int, radius_km: float = 20.0, top
                     'top_scores': [mp.match_score for mp in top_matches]
                 },
                 inference_time_ms=elapsed_time,
-                success=True,
-                created_at=datetime.utcnow()
+                success=True
             )
-            db.session.add(log)
-            db.session.commit()
             
             current_app.logger.info(
                 f"Donor matching complete for request {request_id}: "
                 f"{len(predictions)} scored, {notified_count} notified in {elapsed_time:.2f}ms"
             )
+            match_events.publish(request_id, 'search_completed', {
+                'matched': len(predictions),
+                'notified': notified_count,
+                'radius_km': radius_km
+            })
             
             return {
                 "matched": len(predictions),
@@ -219,6 +240,7 @@ def _match_donors_for_request_impl(request_id: int, radius_km: float = 20.0, top
             
     except Exception as e:
         current_app.logger.error(f"Error in donor matching task: {str(e)}", exc_info=True)
+        match_events.publish(request_id, 'search_failed', {'error': str(e)})
         # For direct calls, just raise the exception
         # For Celery tasks, retry with exponential backoff
         raise e
@@ -248,81 +270,138 @@ def _notify_donor_task_impl(match_prediction_id: int, request_id: int):
     Returns:
         Dictionary with notification status
     """
+    results = _notify_donors_impl([match_prediction_id], request_id)
+    if isinstance(results, dict):
+        return results
+    return results[0]
+
+@celery.task(bind=True, max_retries=3)
+def notify_donors_task(self, match_prediction_ids: List[int], request_id: int):
+    """
+    Notify a batch of matched donors about a blood request
+    
+    Args:
+        match_prediction_ids: IDs of the MatchPrediction records
+        request_id: ID of the blood request
+    
+    Returns:
+        List with one notification status dictionary per donor
+    """
+    return _notify_donors_impl(match_prediction_ids, request_id)
+
+def _notify_donors_impl(match_prediction_ids: List[int], request_id: int):
+    """
+    Create notification records for all donors in one commit, then send the
+    SMS concurrently and queue the emails
+    
+    Args:
+        match_prediction_ids: IDs of the MatchPrediction records
+        request_id: ID of the blood request
+    
+    Returns:
+        List with one status dictionary per donor (or an error dictionary)
+    """
     try:
         with current_app.app_context():
-            # Fetch match prediction
-            mp = MatchPrediction.query.get(match_prediction_id)
-            if not mp:
-                return {"error": "MatchPrediction not found"}
-            
-            # Fetch donor and user
-            donor = Donor.query.get(mp.donor_id)
-            if not donor:
-                return {"error": "Donor not found"}
-            
-            user = User.query.get(donor.user_id)
-            if not user:
-                return {"error": "User not found"}
-            
             # Fetch request
             req = Request.query.get(request_id)
             if not req:
                 return {"error": "Request not found"}
             
-            # Update match prediction as notified
-            mp.notified = True
-            mp.updated_at = datetime.utcnow()
-            db.session.commit()
+            # Fetch match predictions, donors and users in three queries
+            predictions = {
+                mp.id: mp for mp in
+                MatchPrediction.query.filter(MatchPrediction.id.in_(match_prediction_ids)).all()
+            }
+            donors = {
+                d.id: d for d in
+                Donor.query.filter(Donor.id.in_({mp.donor_id for mp in predictions.values()})).all()
+            }
+            users = {
+                u.id: u for u in
+                User.query.filter(User.id.in_({d.user_id for d in donors.values()})).all()
+            }
             
-            # Create notification record
-            notification = Notification(
-                user_id=user.id,
-                type="blood_request",
-                title="Blood Donation Request",
-                message=f"A patient needs {req.blood_group} blood. Would you like to help?",
-                data={
-                    "request_id": request_id,
-                    "match_prediction_id": match_prediction_id,
-                    "blood_group": req.blood_group,
-                    "urgency": req.urgency
-                },
-                created_at=datetime.utcnow()
-            )
-            db.session.add(notification)
+            results = []
+            recipients = []
+            now = datetime.utcnow()
+            for mp_id in match_prediction_ids:
+                mp = predictions.get(mp_id)
+                if not mp:
+                    results.append({"error": "MatchPrediction not found"})
+                    continue
+                donor = donors.get(mp.donor_id)
+                if not donor:
+                    results.append({"error": "Donor not found"})
+                    continue
+                user = users.get(donor.user_id)
+                if not user:
+                    results.append({"error": "User not found"})
+                    continue
+                
+                # Update match prediction as notified
+                mp.notified = True
+                mp.updated_at = now
+                
+                # Create notification record
+                notification = Notification(
+                    user_id=user.id,
+                    type="blood_request",
+                    title="Blood Donation Request",
+                    message=f"A patient needs {req.blood_group} blood. Would you like to help?",
+                    data={
+                        "request_id": request_id,
+                        "match_prediction_id": mp_id,
+                        "blood_group": req.blood_group,
+                        "urgency": req.urgency
+                    },
+                    created_at=now
+                )
+                db.session.add(notification)
+                recipients.append((user, notification))
+                results.append(None)
             db.session.commit()
             
-            # Send SMS notification
-            message = (
-                f"Hi {user.first_name}, a patient needs {req.blood_group} blood urgently. "
-                f"Check your notifications for details. - SmartBlood Connect"
+            # Render every donor's message in one pass (SMS uses the text variant)
+            rendered = email_renderer.render_batch(
+                'donor_request',
+                [{'first_name': user.first_name} for user, _ in recipients],
+                common={'blood_group': req.blood_group}
             )
+            messages = {user.id: r for (user, _), r in zip(recipients, rendered)}
             
+            # Send SMS notifications concurrently
+            sms_targets = [user for user, _ in recipients if user.phone]
             try:
-                sms_service.send_sms(user.phone, message)
-                current_app.logger.info(f"SMS sent to donor {user.id} for request {request_id}")
+                sms_results = sms_service.send_bulk([(user.phone, messages[user.id].text.strip()) for user in sms_targets])
+                sent = sum(1 for r in sms_results if r.ok)
+                current_app.logger.info(f"SMS sent to {sent}/{len(sms_targets)} donors for request {request_id}")
             except Exception as sms_error:
-                current_app.logger.warning(f"Failed to send SMS to donor {user.id}: {str(sms_error)}")
+                current_app.logger.warning(f"Failed to send SMS to donors for request {request_id}: {str(sms_error)}")
             
-            # Send email notification (optional)
-            try:
-                if user.email and user.is_email_verified:
-                    # Use the correct email service method
-                    email_service.send_email(
-                        to=user.email,
-                        subject="Blood Donation Request - SmartBlood Connect",
-                        html=f"<p>{message}</p>",
-                        text=message
-                    )
-                    current_app.logger.info(f"Email sent to donor {user.id} for request {request_id}")
-            except Exception as email_error:
-                current_app.logger.warning(f"Failed to send email to donor {user.id}: {str(email_error)}")
+            # Queue email notifications (optional)
+            for user, _ in recipients:
+                try:
+                    if user.email and user.is_email_verified:
+                        email_service.send_email(
+                            to=user.email,
+                            subject="Blood Donation Request - SmartBlood Connect",
+                            html=messages[user.id].html,
+                            text=messages[user.id].text
+                        )
+                except Exception as email_error:
+                    current_app.logger.warning(f"Failed to send email to donor {user.id}: {str(email_error)}")
             
-            return {
-                "status": "success",
-                "notification_id": notification.id,
-                "donor_id": user.id,
-                "request_id": request_id
-            }
+            statuses = iter(
+                {
+                    "status": "success",
+                    "notification_id": notification.id,
+                    "donor_id": user.id,
+                    "request_id": request_id
+                }
+                for user, notification in recipients
+            )
+            return [r if r is not None else next(statuses) for r in results]
             
     except Exception as e:
         current_app.logger.error(f"Error in donor notification task: {str(e)}", exc_info=True)
@@ -0,0 +1,17 @@
+"""
+Celery tasks for outgoing email fan-out (routed to email_queue)
+"""
+from app.tasks.celery_app import celery_app as celery
+
+
+@celery.task(name='app.tasks.email_tasks.broadcast_emergency')
+def broadcast_emergency(broadcast_id: str):
+    """
+    Send an emergency broadcast to its target hospitals
+
+    Args:
+        broadcast_id: ID returned by the notify-emergency endpoint
+    """
+    from app.services.emergency_broadcast import emergency_broadcast
+    emergency_broadcast.run(broadcast_id)
+    return emergency_broadcast.get(broadcast_id)
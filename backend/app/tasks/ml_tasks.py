@@ -1,227 +1,167 @@
 """
 ML Background Tasks
 Scheduled tasks for model retraining, reliability updates, and forecasting
+Tasks run inside the worker's long-lived app context (FlaskTask in celery_app.py)
 """
 
 from celery import shared_task
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 from flask import current_app
-import pandas as pd
 
-from app import create_app
-from app.models import (
-    db, Donor, DonationHistory, MatchPrediction,
-    DemandForecast, ModelPredictionLog
-)
-from app.ml.model_client import model_client
-from app.ml.feature_builder import FeatureBuilder
+from app.models import db
+from app.services.partitioning import apply_retention, maintain_partitions as create_upcoming_partitions
 
 
 @shared_task(name='app.tasks.ml_tasks.update_donor_reliability_scores')
-def update_donor_reliability_scores():
+def update_donor_reliability_scores(chunk_size=None, workers=None):
     """
     Nightly task to update donor reliability scores
-    Uses the donor_reliability_model to compute scores
-    """
-    app = create_app()
+    Uses the donor_reliability_model to compute scores, one chunk of donors
+    per aggregate query, predict call and bulk UPDATE
     
-    with app.app_context():
-        try:
-            current_app.logger.info("[TASK] Starting donor reliability score update")
-            
-            donors = Donor.query.all()
-            updated_count = 0
-            
-            for donor in donors:
-                try:
-                    # Get donation history
-                    donation_history = DonationHistory.query.filter_by(
-                        donor_id=donor.id
-                    ).all()
-                    
-                    # Build features
-                    features = FeatureBuilder.build_reliability_features(
-                        donor, donation_history
-                    )
-                    features_df = FeatureBuilder.features_to_dataframe(features)
-                    
-                    # Predict reliability score
-                    prediction, _ = model_client.predict('donor_reliability', features_df)
-                    new_score = float(prediction[0])
-                    
-                    # Update donor
-                    donor.reliability_score = round(new_score, 3)
-                    updated_count += 1
-                    
-                except Exception as e:
-                    current_app.logger.error(
-                        f"Failed to update reliability for donor {donor.id}: {str(e)}"
-                    )
-                    continue
-            
-            db.session.commit()
-            
-            current_app.logger.info(
-                f"[TASK] Updated reliability scores for {updated_count}/{len(donors)} donors"
-            )
-            
-            return {
-                'status': 'success',
-                'updated': updated_count,
-                'total': len(donors)
-            }
-            
-        except Exception as e:
-            db.session.rollback()
-            current_app.logger.error(f"[TASK] Reliability update failed: {str(e)}")
-            return {'status': 'error', 'message': str(e)}
+    Args:
+        chunk_size: Donors per chunk (default: RELIABILITY_SCORING_CHUNK_SIZE)
+        workers: Scoring processes (default: RELIABILITY_SCORING_WORKERS)
+    """
+    try:
+        chunk_size = chunk_size or current_app.config.get('RELIABILITY_SCORING_CHUNK_SIZE', 5000)
+        if workers is None:
+            workers = current_app.config.get('RELIABILITY_SCORING_WORKERS', 0)
+        
+        current_app.logger.info(
+            f"[TASK] Starting donor reliability score update "
+            f"(chunk_size={chunk_size}, workers={workers})"
+        )
+        
+        # pandas/numpy are only needed by these nightly jobs, not at worker boot
+        from app.ml.batch_scoring import run_reliability_scoring
+        totals = run_reliability_scoring(chunk_size=chunk_size, workers=workers)
+        
+        current_app.logger.info(
+            f"[TASK] Updated reliability scores for {totals['updated']}/{totals['total']} donors "
+            f"in {totals['chunks']} chunks"
+        )
+        
+        return {
+            'status': 'success',
+            'updated': totals['updated'],
+            'failed': totals['failed'],
+            'total': totals['total']
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"[TASK] Reliability update failed: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
 
 
 @shared_task(name='app.tasks.ml_tasks.generate_demand_forecasts')
 def generate_demand_forecasts(days_ahead=30):
     """
     Weekly task to generate blood demand forecasts
-    Uses the kerala_demand_forecast_stacked_optuna model
+    Uses the kerala_demand_forecast_stacked_optuna model, scoring the whole
+    district x blood group x date grid in one batch
     
     Args:
         days_ahead: Number of days to forecast (default: 30)
     """
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            current_app.logger.info(f"[TASK] Generating demand forecasts for {days_ahead} days")
-            
-            # Kerala districts
-            districts = [
-                'Thiruvananthapuram', 'Kollam', 'Pathanamthitta', 'Alappuzha',
-                'Kottayam', 'Idukki', 'Ernakulam', 'Thrissur', 'Palakkad',
-                'Malappuram', 'Kozhikode', 'Wayanad', 'Kannur', 'Kasaragod'
-            ]
-            
-            blood_groups = ['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']
-            
-            forecasts_created = 0
-            
-            for district in districts:
-                for blood_group in blood_groups:
-                    try:
-                        # Get historical data (simplified - would query actual data)
-                        historical_data = pd.DataFrame({
-                            'demand': [10, 12, 11, 13, 15, 14, 12]  # Placeholder
-                        })
-                        
-                        # Generate forecasts for next N days
-                        for day_offset in range(days_ahead):
-                            forecast_date = date.today() + timedelta(days=day_offset)
-                            
-                            # Build features
-                            features_df = FeatureBuilder.build_demand_forecast_features(
-                                district, blood_group, forecast_date, historical_data
-                            )
-                            
-                            # Predict
-                            prediction, _ = model_client.predict('demand_forecast', features_df)
-                            predicted_demand = float(prediction[0])
-                            
-                            # Calculate confidence intervals (simplified)
-                            confidence_lower = predicted_demand * 0.8
-                            confidence_upper = predicted_demand * 1.2
-                            
-                            # Check if forecast already exists
-                            existing = DemandForecast.query.filter_by(
-                                district=district,
-                                blood_group=blood_group,
-                                forecast_date=forecast_date
-                            ).first()
-                            
-                            if existing:
-                                # Update existing forecast
-                                existing.predicted_demand = predicted_demand
-                                existing.confidence_lower = confidence_lower
-                                existing.confidence_upper = confidence_upper
-                                existing.model_version = '1.0.0'
-                            else:
-                                # Create new forecast
-                                forecast = DemandForecast(
-                                    district=district,
-                                    blood_group=blood_group,
-                                    forecast_date=forecast_date,
-                                    predicted_demand=predicted_demand,
-                                    confidence_lower=confidence_lower,
-                                    confidence_upper=confidence_upper,
-                                    model_version='1.0.0'
-                                )
-                                db.session.add(forecast)
-                            
-                            forecasts_created += 1
-                        
-                    except Exception as e:
-                        current_app.logger.error(
-                            f"Failed to forecast for {district}/{blood_group}: {str(e)}"
-                        )
-                        continue
-            
-            db.session.commit()
-            
-            current_app.logger.info(
-                f"[TASK] Generated {forecasts_created} demand forecasts"
-            )
-            
-            return {
-                'status': 'success',
-                'forecasts_created': forecasts_created
-            }
-            
-        except Exception as e:
-            db.session.rollback()
-            current_app.logger.error(f"[TASK] Demand forecast failed: {str(e)}")
-            return {'status': 'error', 'message': str(e)}
+    try:
+        current_app.logger.info(f"[TASK] Generating demand forecasts for {days_ahead} days")
+        
+        from app.ml.demand_forecast import generate_forecasts
+        forecasts_created = generate_forecasts(days_ahead=days_ahead)
+        
+        current_app.logger.info(
+            f"[TASK] Generated {forecasts_created} demand forecasts"
+        )
+        
+        return {
+            'status': 'success',
+            'forecasts_created': forecasts_created
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"[TASK] Demand forecast failed: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
 
 
 @shared_task(name='app.tasks.ml_tasks.cleanup_old_predictions')
-def cleanup_old_predictions(days_to_keep=30):
+def cleanup_old_predictions(days_to_keep=30, batch_size=5000):
     """
     Clean up old prediction records to save database space
+    Drops whole monthly partitions where the tables are partitioned and
+    deletes the remainder in batches
     
     Args:
         days_to_keep: Number of days of predictions to retain (default: 30)
+        batch_size: Rows per delete transaction (default: 5000)
     """
-    app = create_app()
+    try:
+        current_app.logger.info(f"[TASK] Cleaning up predictions older than {days_to_keep} days")
+        
+        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        
+        # Delete old match predictions
+        matches = apply_retention('match_predictions', cutoff_date, batch_size)
+        
+        # Delete old prediction logs
+        logs = apply_retention('model_prediction_logs', cutoff_date, batch_size)
+        
+        current_app.logger.info(
+            f"[TASK] Cleaned up {matches['deleted_rows']} match predictions "
+            f"and {logs['deleted_rows']} prediction logs "
+            f"({len(matches['dropped_partitions']) + len(logs['dropped_partitions'])} partitions dropped)"
+        )
+        
+        return {
+            'status': 'success',
+            'deleted_matches': matches['deleted_rows'],
+            'deleted_logs': logs['deleted_rows'],
+            'dropped_partitions': matches['dropped_partitions'] + logs['dropped_partitions']
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"[TASK] Cleanup failed: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+
+@shared_task(name='app.tasks.ml_tasks.archive_read_notifications')
+def archive_read_notifications(days_to_keep=None, batch_size=None):
+    """
+    Move read notifications older than N days to notifications_archive
+    so the inbox table only holds what feeds can still show
+    
+    Args:
+        days_to_keep: Days read notifications stay in the inbox (default: NOTIFICATION_ARCHIVE_DAYS)
+        batch_size: Rows per transaction (default: NOTIFICATION_ARCHIVE_BATCH_SIZE)
+    """
+    try:
+        from app.services.notification_inbox import notification_inbox
+        archived = notification_inbox.archive_read(days_to_keep, batch_size)
+        return {'status': 'success', 'archived': archived}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"[TASK] Notification archival failed: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+
+@shared_task(name='app.tasks.ml_tasks.maintain_partitions')
+def maintain_partitions(months_ahead=3):
+    """
+    Create upcoming monthly partitions so inserts never land in the default partition
     
-    with app.app_context():
-        try:
-            current_app.logger.info(f"[TASK] Cleaning up predictions older than {days_to_keep} days")
-            
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            
-            # Delete old match predictions
-            deleted_matches = MatchPrediction.query.filter(
-                MatchPrediction.created_at < cutoff_date
-            ).delete()
-            
-            # Delete old prediction logs
-            deleted_logs = ModelPredictionLog.query.filter(
-                ModelPredictionLog.created_at < cutoff_date
-            ).delete()
-            
-            db.session.commit()
-            
-            current_app.logger.info(
-                f"[TASK] Cleaned up {deleted_matches} match predictions "
-                f"and {deleted_logs} prediction logs"
-            )
-            
-            return {
-                'status': 'success',
-                'deleted_matches': deleted_matches,
-                'deleted_logs': deleted_logs
-            }
-            
-        except Exception as e:
-            db.session.rollback()
-            current_app.logger.error(f"[TASK] Cleanup failed: {str(e)}")
-            return {'status': 'error', 'message': str(e)}
+    Args:
+        months_ahead: Months of partitions to keep ready (default: 3)
+    """
+    try:
+        created = create_upcoming_partitions(months_ahead=months_ahead)
+        return {'status': 'success', 'created': created}
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"[TASK] Partition maintenance failed: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
 
 
 @shared_task(name='app.tasks.ml_tasks.retrain_model')
@@ -233,21 +173,18 @@ def retrain_model(model_key: str):
     Args:
         model_key: Model identifier to retrain
     """
-    app = create_app()
+    current_app.logger.info(f"[TASK] Model retraining requested for: {model_key}")
     
-    with app.app_context():
-        current_app.logger.info(f"[TASK] Model retraining requested for: {model_key}")
-        
-        # This is a placeholder - actual implementation would:
-        # 1. Fetch training data from database
-        # 2. Preprocess and split data
-        # 3. Train new model
-        # 4. Evaluate performance
-        # 5. Save new model artifact
-        # 6. Update ModelArtifact table
-        # 7. Hot-reload the model
-        
-        return {
-            'status': 'not_implemented',
-            'message': 'Model retraining not yet implemented'
-        }
+    # This is a placeholder - actual implementation would:
+    # 1. Fetch training data from database
+    # 2. Preprocess and split data
+    # 3. Train new model
+    # 4. Evaluate performance
+    # 5. Save new model artifact
+    # 6. Update ModelArtifact table
+    # 7. Hot-reload the model
+    
+    return {
+        'status': 'not_implemented',
+        'message': 'Model retraining not yet implemented'
+    }
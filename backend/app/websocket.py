@@ -0,0 +1,93 @@
+"""
+Socket.IO channel (Flask-SocketIO)
+
+Clients connect with auth={token: <access token>} (see frontend
+services/socket.js), then emit "match:subscribe" {request_id, after} to join
+the request's room. They receive the recorded events after `after`, then
+every new "match:progress" event as it happens.
+
+Each process forwards events from the match event hub (which spans all
+processes through the shared store) to its own connected clients, so no
+separate Socket.IO message queue is needed.
+"""
+
+from flask import current_app, request
+from flask_jwt_extended import decode_token
+from flask_socketio import SocketIO, emit, join_room, leave_room
+
+from app.models import Request, User
+from app.services.match_events import match_events
+
+socketio = SocketIO()
+
+# Socket.IO session id -> user id, for connections in this process
+_users = {}
+
+
+def _room(request_id) -> str:
+    return f"request:{request_id}"
+
+
+def can_follow_request(user: User, blood_request: Request) -> bool:
+    """Same rule as the match-status endpoint: admins, or the seeker who created it"""
+    return user.role == 'admin' or blood_request.seeker_id == user.id
+
+
+def init_socketio(app):
+    """Attach Socket.IO to the app and forward match events to request rooms"""
+    socketio.init_app(
+        app,
+        cors_allowed_origins=app.config.get('SOCKETIO_CORS_ORIGINS', '*'),
+        async_mode=app.config.get('SOCKETIO_ASYNC_MODE') or None
+    )
+    match_events.add_emitter(
+        lambda request_id, entry: socketio.emit('match:progress', {'request_id': request_id, **entry},
+                                                to=_room(request_id))
+    )
+
+
+@socketio.on('connect')
+def on_connect(auth=None):
+    token = (auth or {}).get('token')
+    if not token:
+        return False
+    try:
+        user_id = int(decode_token(token)['sub'])
+    except Exception:
+        return False
+    _users[request.sid] = user_id
+
+
+@socketio.on('disconnect')
+def on_disconnect():
+    _users.pop(request.sid, None)
+
+
+@socketio.on('match:subscribe')
+def on_match_subscribe(data):
+    user_id = _users.get(request.sid)
+    try:
+        request_id = int((data or {}).get('request_id'))
+        after = int((data or {}).get('after') or 0)
+    except (TypeError, ValueError):
+        emit('match:error', {'error': 'request_id is required'})
+        return
+
+    user = User.query.get(user_id) if user_id else None
+    blood_request = Request.query.get(request_id)
+    if not user or not blood_request or not can_follow_request(user, blood_request):
+        emit('match:error', {'request_id': request_id, 'error': 'Unauthorized access to this request'})
+        return
+
+    join_room(_room(request_id))
+    for entry in match_events.history(request_id, after=after):
+        emit('match:progress', {'request_id': request_id, **entry})
+    current_app.logger.debug(f"[SOCKET] {request.sid} following request {request_id}")
+
+
+@socketio.on('match:unsubscribe')
+def on_match_unsubscribe(data):
+    try:
+        leave_room(_room(int((data or {}).get('request_id'))))
+    except (TypeError, ValueError):
+        pass
@@ -0,0 +1,12 @@
+"""
+Endpoint benchmarks for SmartBlood
+
+Drives the Flask test client against a seeded local database (see
+scripts/generate_synthetic_data.py), records latency percentiles and SQL
+statement counts per scenario, and compares them with stored baselines.
+
+Usage (from backend/):
+    python -m benchmarks.run                    # compare against baselines.json
+    python -m benchmarks.run --update-baseline  # record new baselines
+    python -m benchmarks.run --only ml_match --iterations 100
+"""
@@ -0,0 +1,110 @@
+"""
+Email render throughput for bulk donor notifications
+
+Renders the donor_request email (HTML + text) for a batch of recipients:
+- fstring:   the previous inline f-string formatting
+- uncached:  Jinja2 template compiled on every render
+- render:    compiled template, one render() call per recipient
+- batch:     compiled template, render_batch() for the whole list
+
+Also reports one render of the large staff_invitation template.
+
+Usage: python -m benchmarks.email_render [--recipients 1000] [--seconds 2] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add backend directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from app.services.email_renderer import EmailRenderer, email_renderer
+
+BLOOD_GROUP = 'O-'
+
+
+def throughput(call, seconds: float, items: int) -> dict:
+    """Run call repeatedly for about `seconds`; report items/sec and mean latency per call"""
+    call()  # warm up (compiles templates on first use)
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        call()
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    elapsed = now - start
+    return {
+        'items_per_sec': round(count * items / elapsed, 1),
+        'mean_ms': round(elapsed / count * 1000, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Email render throughput')
+    parser.add_argument('--recipients', type=int, default=1000, help='Recipients per batch')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Duration of each measurement')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    # Repeating first names, like a real donor list
+    names = [f"Donor{i % 250}" for i in range(args.recipients)]
+    recipients = [{'first_name': name} for name in names]
+    common = {'blood_group': BLOOD_GROUP}
+
+    def fstring():
+        out = []
+        for name in names:
+            message = (
+                f"Hi {name}, a patient needs {BLOOD_GROUP} blood urgently. "
+                f"Check your notifications for details. - SmartBlood Connect"
+            )
+            out.append((f"<p>{message}</p>", message))
+        return out
+
+    def uncached():
+        return [EmailRenderer().render('donor_request', blood_group=BLOOD_GROUP, **r) for r in recipients[:50]]
+
+    def render():
+        return [email_renderer.render('donor_request', blood_group=BLOOD_GROUP, **r) for r in recipients]
+
+    def batch():
+        return email_renderer.render_batch('donor_request', recipients, common=common)
+
+    invitation = dict(staff_name='Asha', hospital_name='General Hospital', email='asha@example.org',
+                      temp_password='Tmp-12345', accept_url='https://example.org/a', reject_url='https://example.org/r')
+
+    results = {
+        'fstring': throughput(fstring, args.seconds, args.recipients),
+        'uncached': throughput(uncached, args.seconds, 50),
+        'render': throughput(render, args.seconds, args.recipients),
+        'batch': throughput(batch, args.seconds, args.recipients),
+        'staff_invitation': throughput(
+            lambda: email_renderer.render('staff_invitation', **invitation), args.seconds, 1),
+    }
+    results['speedup_batch_vs_uncached'] = round(
+        results['batch']['items_per_sec'] / results['uncached']['items_per_sec'], 1
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    print(f"Email render throughput ({args.recipients} recipients, HTML + text)")
+    print("-" * 64)
+    print(f"{'mode':<18}{'emails/sec':>16}{'mean per call':>18}")
+    for name in ('fstring', 'uncached', 'render', 'batch', 'staff_invitation'):
+        r = results[name]
+        print(f"{name:<18}{r['items_per_sec']:>16,.1f}{r['mean_ms']:>16,.3f}ms")
+    print("-" * 64)
+    print(f"batch vs uncached: x{results['speedup_batch_vs_uncached']:,}")
+
+
+if __name__ == '__main__':
+    main()
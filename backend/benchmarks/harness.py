@@ -0,0 +1,154 @@
+"""
+Measurement and baseline comparison helpers
+"""
+
+import math
+import statistics
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import event
+
+
+# Allowed regression before a metric fails (relative, plus absolute slack for tiny timings)
+LATENCY_TOLERANCE = {'p50_ms': 0.20, 'p95_ms': 0.25, 'p99_ms': 0.50}
+LATENCY_SLACK_MS = 2.0
+SQL_TOLERANCE = 0  # extra statements per call allowed over the baseline
+
+
+class SQLCounter:
+    """Counts statements executed by the measuring thread on an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self._thread_id = None
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Background writers (e.g. the prediction log sink) share the engine; ignore them
+        if threading.get_ident() == self._thread_id:
+            self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        self._thread_id = threading.get_ident()
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+
+@dataclass
+class Result:
+    """Measurements for one scenario"""
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    sql_statements: int
+    errors: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def measure(name: str, call: Callable[[], bool], engine,
+            iterations: int = 50, warmup: int = 5) -> Result:
+    """
+    Time a scenario callable and count the SQL it issues
+
+    Args:
+        name: Scenario name
+        call: Runs one iteration; returns False on a failed call
+        engine: SQLAlchemy engine to count statements on
+        iterations: Measured iterations
+        warmup: Unmeasured iterations run first (caches, lazy imports)
+
+    Returns:
+        Result with latency percentiles and median statements per call
+    """
+    for _ in range(warmup):
+        call()
+
+    timings, statements = [], []
+    errors = 0
+    for _ in range(iterations):
+        with SQLCounter(engine) as counter:
+            started = time.perf_counter()
+            ok = call()
+            elapsed = (time.perf_counter() - started) * 1000.0
+        timings.append(elapsed)
+        statements.append(counter.count)
+        if ok is False:
+            errors += 1
+
+    return Result(
+        name=name,
+        iterations=iterations,
+        p50_ms=round(percentile(timings, 50), 3),
+        p95_ms=round(percentile(timings, 95), 3),
+        p99_ms=round(percentile(timings, 99), 3),
+        mean_ms=round(statistics.fmean(timings), 3),
+        sql_statements=int(statistics.median(statements)),
+        errors=errors
+    )
+
+
+@dataclass
+class Regression:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    limit: float
+
+    def __str__(self):
+        return (f"{self.scenario}.{self.metric}: {self.current} > {round(self.limit, 3)} "
+                f"(baseline {self.baseline})")
+
+
+def compare(result: Result, baseline: Optional[Dict],
+            latency_tolerance: Optional[Dict[str, float]] = None,
+            sql_tolerance: int = SQL_TOLERANCE) -> List[Regression]:
+    """
+    Regressions of a result against its baseline entry
+
+    Latency fails past baseline * (1 + tolerance) + LATENCY_SLACK_MS;
+    SQL counts fail past baseline + sql_tolerance. Errors always fail.
+    """
+    regressions = []
+    if result.errors:
+        regressions.append(Regression(result.name, 'errors', 0, result.errors, 0))
+    if not baseline:
+        return regressions
+
+    tolerance = dict(LATENCY_TOLERANCE, **(latency_tolerance or {}))
+    for metric, allowed in tolerance.items():
+        if metric not in baseline:
+            continue
+        limit = baseline[metric] * (1 + allowed) + LATENCY_SLACK_MS
+        current = getattr(result, metric)
+        if current > limit:
+            regressions.append(Regression(result.name, metric, baseline[metric], current, limit))
+
+    if 'sql_statements' in baseline:
+        limit = baseline['sql_statements'] + sql_tolerance
+        if result.sql_statements > limit:
+            regressions.append(Regression(
+                result.name, 'sql_statements', baseline['sql_statements'], result.sql_statements, limit
+            ))
+    return regressions
@@ -0,0 +1,80 @@
+"""
+OTP hashing throughput per core: PBKDF2/scrypt (werkzeug) vs keyed HMAC-SHA256
+
+Measures the work done on an OTP send (hash the code) and an OTP verify
+(check a submitted code) in a single thread, so the numbers are per core.
+
+Usage: python -m benchmarks.otp [--seconds 2] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add backend directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.auth.utils import generate_otp, otp_hash, verify_otp
+
+SECRET = 'benchmark-otp-secret'
+CONTEXT = '42:phone:+919800000000'
+
+
+def throughput(call, seconds: float) -> dict:
+    """Run call repeatedly for about `seconds`; report ops/sec and mean latency"""
+    call()  # warm up
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        call()
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    elapsed = now - start
+    return {'ops_per_sec': round(count / elapsed, 1), 'mean_us': round(elapsed / count * 1e6, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OTP hashing throughput per core')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Duration of each measurement')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    otp = generate_otp()
+    wrong = str((int(otp) + 1) % 1000000).zfill(6)
+    legacy_hash = generate_password_hash(otp)
+    hmac_hash = otp_hash(otp, CONTEXT, SECRET)
+
+    results = {
+        'legacy_send': throughput(lambda: generate_password_hash(otp), args.seconds),
+        'legacy_verify': throughput(lambda: check_password_hash(legacy_hash, wrong), args.seconds),
+        'hmac_send': throughput(lambda: otp_hash(otp, CONTEXT, SECRET), args.seconds),
+        'hmac_verify': throughput(lambda: verify_otp(wrong, hmac_hash, CONTEXT, SECRET), args.seconds),
+    }
+    for op in ('send', 'verify'):
+        results[f'speedup_{op}'] = round(
+            results[f'hmac_{op}']['ops_per_sec'] / results[f'legacy_{op}']['ops_per_sec'], 1
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+
+    print(f"OTP throughput per core (werkzeug default: {legacy_hash.split('$', 1)[0]})")
+    print("-" * 64)
+    print(f"{'operation':<16}{'ops/sec':>14}{'mean':>14}")
+    for name in ('legacy_send', 'legacy_verify', 'hmac_send', 'hmac_verify'):
+        r = results[name]
+        print(f"{name:<16}{r['ops_per_sec']:>14,.1f}{r['mean_us']:>12,.1f}us")
+    print("-" * 64)
+    print(f"speedup: send x{results['speedup_send']:,}, verify x{results['speedup_verify']:,}")
+
+
+if __name__ == '__main__':
+    main()
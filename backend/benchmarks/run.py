@@ -0,0 +1,105 @@
+"""
+Run the endpoint benchmarks and check them against the stored baselines
+
+Exits with status 1 when any scenario regresses past its threshold.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add backend directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from app import create_app
+from app.models import db
+from benchmarks.harness import measure, compare
+from benchmarks.scenarios import Fixtures, SCENARIOS
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results', 'latest.json')
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark hot endpoints against baselines')
+    parser.add_argument('--only', nargs='*', choices=sorted(SCENARIOS),
+                        help='Run only these scenarios')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store this run as the new baseline instead of comparing')
+    parser.add_argument('--latency-tolerance', type=float,
+                        help='Override the relative latency tolerance for every percentile')
+    parser.add_argument('--sql-tolerance', type=int, default=0,
+                        help='Extra SQL statements per call allowed over the baseline')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Preload models inline so a startup thread doesn't overlap the timings
+    app = create_app(background_init=False)
+    app.config['TESTING'] = True
+    client = app.test_client()
+    fixtures = Fixtures(app)
+
+    baselines = load_baselines(args.baseline)
+    tolerance = None
+    if args.latency_tolerance is not None:
+        tolerance = {m: args.latency_tolerance for m in ('p50_ms', 'p95_ms', 'p99_ms')}
+
+    names = args.only or list(SCENARIOS)
+    results, regressions = {}, []
+    print(f"{'scenario':<22}{'p50':>10}{'p95':>10}{'p99':>10}{'sql':>6}  status")
+    for name in names:
+        call = SCENARIOS[name](app, client, fixtures)
+        with app.app_context():
+            result = measure(name, call, db.engine, iterations=args.iterations, warmup=args.warmup)
+        results[name] = result.to_dict()
+
+        found = [] if args.update_baseline else compare(
+            result, baselines.get(name), tolerance, args.sql_tolerance
+        )
+        regressions.extend(found)
+        status = 'REGRESSED' if found else ('new' if name not in baselines else 'ok')
+        print(f"{name:<22}{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}{result.p99_ms:>10.1f}"
+              f"{result.sql_statements:>6}  {status}")
+
+    write_json(args.output, {'recorded_at': datetime.utcnow().isoformat(), 'results': results})
+
+    if args.update_baseline:
+        baselines.update(results)
+        write_json(args.baseline, baselines)
+        print(f"\nBaselines written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark scenarios for the hot endpoints
+
+Each scenario factory receives the app, a test client and the shared
+fixtures, and returns a zero-argument callable that runs one iteration.
+"""
+
+from unittest import mock
+from flask_jwt_extended import create_access_token
+
+from app.models import db, User, Donor, Request
+
+
+class Fixtures:
+    """Ids and tokens picked from the seeded database"""
+
+    def __init__(self, app):
+        with app.app_context():
+            admin = User.query.filter_by(role='admin').order_by(User.id).first()
+            donor_row = (
+                db.session.query(User, Donor)
+                .join(Donor, Donor.user_id == User.id)
+                .filter(User.role == 'donor', User.status == 'active')
+                .filter(Donor.location_lat.isnot(None))
+                .order_by(Donor.id)
+                .first()
+            )
+            blood_request = (
+                Request.query.filter(Request.hospital_id.isnot(None))
+                .order_by(Request.created_at.desc())
+                .first()
+            )
+            if not (admin and donor_row and blood_request):
+                raise RuntimeError(
+                    "Benchmarks need a seeded database with an admin, an active donor "
+                    "and a hospital request (see scripts/generate_synthetic_data.py)"
+                )
+
+            donor_user, donor = donor_row
+            self.admin_token = create_access_token(identity=str(admin.id))
+            self.donor_token = create_access_token(identity=str(donor_user.id))
+            self.lat = float(donor.location_lat)
+            self.lng = float(donor.location_lng)
+            self.request_id = blood_request.id
+
+
+def _ok(response):
+    return response.status_code < 400
+
+
+def _auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def ml_match(app, client, fx):
+    body = {'request_id': fx.request_id, 'top_k': 10, 'save_predictions': False}
+    return lambda: _ok(client.post('/api/ml/match', json=body, headers=_auth(fx.admin_token)))
+
+
+def requests_nearby(app, client, fx):
+    url = f'/api/requests/nearby?lat={fx.lat}&lng={fx.lng}&radius=50'
+    return lambda: _ok(client.get(url, headers=_auth(fx.donor_token)))
+
+
+def leaderboard_kerala(app, client, fx):
+    return lambda: _ok(client.get('/api/leaderboard/kerala?limit=100'))
+
+
+def admin_dashboard(app, client, fx):
+    return lambda: _ok(client.get('/api/admin/dashboard/', headers=_auth(fx.admin_token)))
+
+
+def donor_dashboard(app, client, fx):
+    return lambda: _ok(client.get('/api/donors/dashboard', headers=_auth(fx.donor_token)))
+
+
+def homepage_stats(app, client, fx):
+    return lambda: _ok(client.get('/api/homepage/stats'))
+
+
+def match_donors_task(app, client, fx):
+    """
+    The matching task body, called directly
+
+    Notification dispatch is stubbed so the run measures matching rather
+    than SMS/email delivery or a missing Celery broker. The task still writes
+    match_predictions rows, so run it against a scratch database.
+    """
+    from app.tasks import donor_matching
+
+    def run():
+        with app.app_context(), mock.patch.object(donor_matching.notify_donors_task, 'delay'):
+            try:
+                result = donor_matching._match_donors_for_request_impl(fx.request_id)
+            finally:
+                db.session.remove()
+        return 'error' not in result
+
+    return run
+
+
+SCENARIOS = {
+    'ml_match': ml_match,
+    'requests_nearby': requests_nearby,
+    'leaderboard_kerala': leaderboard_kerala,
+    'admin_dashboard': admin_dashboard,
+    'donor_dashboard': donor_dashboard,
+    'homepage_stats': homepage_stats,
+    'match_donors_task': match_donors_task,
+}
@@ -8,22 +8,17 @@ Or: celery -A celery_worker.celery_app worker --loglevel=info
 import os
 from dotenv import load_dotenv
 from app import create_app
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, set_worker_app
 
 # Load environment variables
 load_dotenv()
 
-# Create Flask app for context
-flask_app = create_app()
-
-# Configure Celery with Flask app context
-class ContextTask(celery_app.Task):
-    """Make celery tasks work with Flask app context"""
-    def __call__(self, *args, **kwargs):
-        with flask_app.app_context():
-            return self.run(*args, **kwargs)
-
-celery_app.Task = ContextTask
+# Create the Flask app once in the parent; prefork children inherit it (and its
+# loaded models) and only reopen DB connections at worker_process_init.
+# Tasks run in its app context via FlaskTask (app/tasks/celery_app.py).
+# Models are preloaded inline (no startup thread) so the fork copies them.
+flask_app = create_app(background_init=False)
+set_worker_app(flask_app)
 
 if __name__ == '__main__':
     # Start worker
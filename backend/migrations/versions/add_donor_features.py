@@ -0,0 +1,85 @@
+"""add donor_features table
+
+Revision ID: add_donor_features
+Revises: a001_add_fields_to_donation_history, add_notifications, add_password_needs_change
+Create Date: 2025-11-03 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+# Also merges the open heads so the backfill below can read notifications.
+revision = 'add_donor_features'
+down_revision = ('a001_add_fields_to_donation_history', 'add_notifications', 'add_password_needs_change')
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('donor_features',
+        sa.Column('donor_id', sa.Integer(), nullable=False),
+        sa.Column('total_donations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cancelled_donations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_donation_at', sa.DateTime(), nullable=True),
+        sa.Column('total_matches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('accepted_matches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_matches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('declined_matches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cancelled_matches', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('response_time_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('response_time_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('recent_notifications', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('recent_notifications_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['donor_id'], ['donors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('donor_id')
+    )
+
+    # Backfill aggregates for existing donors
+    op.execute("""
+        INSERT INTO donor_features (
+            donor_id, total_donations, cancelled_donations, last_donation_at,
+            total_matches, accepted_matches, completed_matches, declined_matches, cancelled_matches,
+            response_time_sum, response_time_count,
+            recent_notifications, recent_notifications_at, updated_at
+        )
+        SELECT d.id,
+               COALESCE(dh.total, 0), COALESCE(dh.cancelled, 0), dh.last_at,
+               COALESCE(m.total, 0), COALESCE(m.accepted, 0), COALESCE(m.completed, 0),
+               COALESCE(m.declined, 0), COALESCE(m.cancelled, 0),
+               COALESCE(mp.rt_sum, 0), COALESCE(mp.rt_count, 0),
+               COALESCE(n.recent, 0), now(), now()
+        FROM donors d
+        LEFT JOIN (
+            SELECT donor_id, COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled,
+                   MAX(donation_date) AS last_at
+            FROM donation_history GROUP BY donor_id
+        ) dh ON dh.donor_id = d.id
+        LEFT JOIN (
+            SELECT donor_id, COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status = 'accepted') AS accepted,
+                   COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+                   COUNT(*) FILTER (WHERE status IN ('declined', 'rejected')) AS declined,
+                   COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+            FROM matches GROUP BY donor_id
+        ) m ON m.donor_id = d.id
+        LEFT JOIN (
+            SELECT donor_id, SUM(actual_response_time) AS rt_sum,
+                   COUNT(actual_response_time) AS rt_count
+            FROM match_predictions WHERE actual_response_time IS NOT NULL
+            GROUP BY donor_id
+        ) mp ON mp.donor_id = d.id
+        LEFT JOIN (
+            SELECT user_id, COUNT(*) AS recent
+            FROM notifications
+            WHERE type = 'blood_request' AND created_at >= now() - interval '7 days'
+            GROUP BY user_id
+        ) n ON n.user_id = d.user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('donor_features')
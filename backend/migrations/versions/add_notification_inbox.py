@@ -0,0 +1,99 @@
+"""notification inbox: unread counters, feed indexes, archive table
+
+Revision ID: add_notification_inbox
+Revises: partition_prediction_tables
+Create Date: 2025-11-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_notification_inbox'
+down_revision = 'partition_prediction_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    op.create_table('notifications_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notifications_archive_user_id', 'notifications_archive', ['user_id'])
+
+    # The feed index covers user_id lookups; is_read alone is too unselective to help
+    op.create_index('ix_notifications_user_feed', 'notifications', ['user_id', 'created_at', 'id'])
+    op.create_index(
+        'ix_notifications_user_unread', 'notifications', ['user_id', 'created_at'],
+        postgresql_where=sa.text('is_read = false')
+    )
+    op.drop_index('ix_notifications_user_id', 'notifications')
+    op.drop_index('ix_notifications_is_read', 'notifications')
+
+    # The donor feed used to list pending matches; give each one an inbox entry
+    op.execute("""
+        INSERT INTO notifications (user_id, type, title, message, data, is_read, created_at)
+        SELECT d.user_id, 'blood_request', 'New Blood Request Match',
+               'You''ve been matched to a ' || r.blood_group || ' request at ' || COALESCE(h.name, 'a hospital'),
+               json_build_object('match_id', m.id, 'request_id', r.id, 'blood_group', r.blood_group,
+                                 'urgency', r.urgency, 'hospital_name', h.name),
+               false, COALESCE(m.matched_at, now())
+        FROM matches m
+        JOIN donors d ON d.id = m.donor_id
+        JOIN blood_requests r ON r.id = m.request_id
+        LEFT JOIN hospitals h ON h.id = r.hospital_id
+        WHERE m.status = 'pending'
+    """)
+
+    # Backfill counters from existing unread notifications
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread_count, updated_at)
+        SELECT user_id, COUNT(*), now()
+        FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+    """)
+
+
+def downgrade():
+    op.create_index('ix_notifications_is_read', 'notifications', ['is_read'])
+    op.create_index('ix_notifications_user_id', 'notifications', ['user_id'])
+    op.drop_index('ix_notifications_user_unread', 'notifications')
+    op.drop_index('ix_notifications_user_feed', 'notifications')
+
+    # Archived rows go back so no notification is lost
+    op.execute("""
+        INSERT INTO notifications (id, user_id, type, title, message, data, is_read, read_at, created_at)
+        SELECT id, user_id, type, title, message, data, true, read_at, created_at
+        FROM notifications_archive
+    """)
+    # Match entries (the backfill above and any added since) go: the old donor
+    # feed lists pending matches itself and would show them twice
+    op.execute("""
+        DELETE FROM notifications
+        WHERE type = 'blood_request'
+          AND title = 'New Blood Request Match'
+          AND data->>'match_id' IS NOT NULL
+    """)
+    op.drop_index('ix_notifications_archive_user_id', 'notifications_archive')
+    op.drop_table('notifications_archive')
+    op.drop_table('notification_counters')
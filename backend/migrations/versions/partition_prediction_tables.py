@@ -0,0 +1,123 @@
+"""partition model_prediction_logs, match_predictions and notifications by month
+
+Revision ID: partition_prediction_tables
+Revises: add_donor_features
+Create Date: 2025-11-05 12:00:00.000000
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_prediction_tables'
+down_revision = 'add_donor_features'
+branch_labels = None
+depends_on = None
+
+
+# Months of partitions to create ahead of today (kept topped up by
+# app.tasks.ml_tasks.maintain_partitions)
+MONTHS_AHEAD = 3
+
+TABLES = {
+    'model_prediction_logs': {
+        'foreign_keys': [],
+        'indexes': [('idx_prediction_logs_model', ['model_name'])],
+    },
+    'match_predictions': {
+        'foreign_keys': [
+            ('request_id', 'blood_requests'),
+            ('donor_id', 'donors'),
+        ],
+        'indexes': [
+            ('idx_match_predictions_request', ['request_id']),
+            ('idx_match_predictions_donor', ['donor_id']),
+        ],
+    },
+    'notifications': {
+        'foreign_keys': [('user_id', 'users')],
+        'indexes': [
+            ('ix_notifications_user_id', ['user_id']),
+            ('ix_notifications_is_read', ['is_read']),
+            ('ix_notifications_type', ['type']),
+            ('ix_notifications_created_at', ['created_at']),
+        ],
+    },
+}
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _restore_constraints(table, spec, primary_key):
+    op.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY ({primary_key})')
+    for column, referenced in spec['foreign_keys']:
+        op.create_foreign_key(
+            f'{table}_{column}_fkey', table, referenced, [column], ['id'], ondelete='CASCADE'
+        )
+    for name, columns in spec['indexes']:
+        op.create_index(name, table, columns)
+
+
+def _partition_table(conn, table, spec):
+    legacy = f'{table}_legacy'
+    sequence = conn.execute(sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {'t': table}).scalar()
+
+    op.execute(f'UPDATE "{table}" SET created_at = now() WHERE created_at IS NULL')
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    op.execute(
+        f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    op.execute(f'ALTER TABLE "{table}" ALTER COLUMN created_at SET NOT NULL')
+
+    oldest = conn.execute(sa.text(f'SELECT min(created_at) FROM "{legacy}"')).scalar()
+    this_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    last = _add_months(this_month, MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f'CREATE TABLE "{table}_p{month.year:04d}{month.month:02d}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    # Safety net for rows outside the monthly ranges
+    op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    op.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{table}".id')
+    op.execute(f'DROP TABLE "{legacy}"')
+
+    # The partition key has to be part of the primary key
+    _restore_constraints(table, spec, 'id, created_at')
+
+
+def _unpartition_table(conn, table, spec):
+    partitioned = f'{table}_partitioned'
+    sequence = conn.execute(sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {'t': table}).scalar()
+
+    op.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+    op.execute(f'CREATE TABLE "{table}" (LIKE "{partitioned}" INCLUDING DEFAULTS)')
+    op.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{table}".id')
+    op.execute(f'DROP TABLE "{partitioned}" CASCADE')
+
+    _restore_constraints(table, spec, 'id')
+
+
+def upgrade():
+    conn = op.get_bind()
+    for table, spec in TABLES.items():
+        _partition_table(conn, table, spec)
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table, spec in TABLES.items():
+        _unpartition_table(conn, table, spec)
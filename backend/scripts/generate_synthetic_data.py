@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+"""
+Generate a synthetic Kerala-scale dataset for performance work
+
+Creates donor and staff users, donors spread around their district centre
+with Indian blood-group frequencies, hospitals, blood requests, matches,
+donation history and notifications. Rows are streamed into PostgreSQL with
+COPY (or executemany) in batches, so millions of rows load in minutes.
+
+Meant for local databases only: ids continue after the current maximum, so
+existing rows are left alone, but nothing here is cleaned up afterwards.
+
+Usage:
+    python scripts/generate_synthetic_data.py --donors 500000 --requests 50000
+    python scripts/generate_synthetic_data.py --method executemany --donors 20000
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add parent directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.models import db
+from app.services.donor_matcher import get_district_coordinates
+from app.services.partitioning import ensure_partitions
+from app.ml.feature_store import feature_store
+from app.services.notification_inbox import notification_inbox
+
+
+# District population (2011 census, millions) - drives where donors and hospitals live
+DISTRICT_POPULATION = {
+    'Thiruvananthapuram': 3.30, 'Kollam': 2.64, 'Pathanamthitta': 1.20,
+    'Alappuzha': 2.13, 'Kottayam': 1.97, 'Idukki': 1.11, 'Ernakulam': 3.28,
+    'Thrissur': 3.12, 'Palakkad': 2.81, 'Malappuram': 4.11, 'Kozhikode': 3.09,
+    'Wayanad': 0.82, 'Kannur': 2.52, 'Kasaragod': 1.31
+}
+
+# Approximate ABO/Rh frequencies for South India
+BLOOD_GROUP_FREQUENCY = {
+    'O+': 0.37, 'B+': 0.30, 'A+': 0.22, 'AB+': 0.06,
+    'O-': 0.02, 'B-': 0.015, 'A-': 0.01, 'AB-': 0.005
+}
+
+MATCH_STATUSES = {'pending': 0.30, 'accepted': 0.25, 'completed': 0.20, 'declined': 0.20, 'cancelled': 0.05}
+REQUEST_STATUSES = {'pending': 0.35, 'matched': 0.25, 'completed': 0.30, 'cancelled': 0.10}
+URGENCIES = {'low': 0.25, 'medium': 0.45, 'high': 0.20, 'critical': 0.10}
+
+FIRST_NAMES = ['Arjun', 'Anjali', 'Rahul', 'Lakshmi', 'Vishnu', 'Meera', 'Akhil', 'Divya',
+               'Joseph', 'Mariam', 'Mohammed', 'Fathima', 'Sreejith', 'Aswathy', 'Nikhil', 'Reshma']
+LAST_NAMES = ['Nair', 'Menon', 'Pillai', 'Thomas', 'Varghese', 'Kurian', 'Ahmed', 'Rahman',
+              'Krishnan', 'Das', 'Joseph', 'George', 'Namboothiri', 'Panicker']
+
+# Standard deviation (degrees) of donor locations around the district centre
+LOCATION_SPREAD = 0.12
+
+DISTRICTS = list(DISTRICT_POPULATION)
+DISTRICT_P = np.array([DISTRICT_POPULATION[d] for d in DISTRICTS])
+DISTRICT_P = DISTRICT_P / DISTRICT_P.sum()
+DISTRICT_CENTRES = np.array([get_district_coordinates(d) for d in DISTRICTS])
+BLOOD_GROUPS = list(BLOOD_GROUP_FREQUENCY)
+BLOOD_GROUP_P = np.array(list(BLOOD_GROUP_FREQUENCY.values()))
+BLOOD_GROUP_P = BLOOD_GROUP_P / BLOOD_GROUP_P.sum()
+
+
+def _choice(rng, weights, size):
+    keys = list(weights)
+    p = np.array(list(weights.values()))
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size=size, p=p / p.sum())]
+
+
+class BulkLoader:
+    """Streams row tuples into a table with COPY or executemany"""
+
+    def __init__(self, method='copy', batch_size=50000):
+        self.method = method
+        self.batch_size = batch_size
+        self.connection = db.engine.raw_connection()
+
+    def next_id(self, table):
+        """First free id in a table"""
+        with self.connection.cursor() as cur:
+            cur.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM "{table}"')
+            return cur.fetchone()[0]
+
+    def load(self, table, columns, rows):
+        """Load an iterable of tuples; returns the number of rows written"""
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._write(table, columns, batch)
+                batch = []
+        if batch:
+            total += self._write(table, columns, batch)
+        if 'id' in columns:
+            self._sync_sequence(table)
+        return total
+
+    def _write(self, table, columns, batch):
+        column_list = ', '.join(columns)
+        with self.connection.cursor() as cur:
+            if self.method == 'copy':
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(batch)
+                buffer.seek(0)
+                cur.copy_expert(f'COPY "{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+            else:
+                placeholders = ', '.join(['%s'] * len(columns))
+                cur.executemany(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', batch)
+        self.connection.commit()
+        return len(batch)
+
+    def _sync_sequence(self, table):
+        with self.connection.cursor() as cur:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f'(SELECT COALESCE(MAX(id), 1) FROM "{table}"))'
+            )
+        self.connection.commit()
+
+    def analyze(self, tables):
+        with self.connection.cursor() as cur:
+            for table in tables:
+                cur.execute(f'ANALYZE "{table}"')
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+class SyntheticDataset:
+    """Generates related rows for every table, keeping ids consistent across tables"""
+
+    def __init__(self, loader, args):
+        self.loader = loader
+        self.args = args
+        self.rng = np.random.default_rng(args.seed)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.start = self.now - timedelta(days=args.days)
+        # One hash for every synthetic account; hashing per user would dominate the run
+        self.password_hash = generate_password_hash(args.password)
+
+    def _timestamps(self, size, start=None, end=None):
+        start = start or self.start
+        end = end or self.now
+        seconds = self.rng.integers(0, max(int((end - start).total_seconds()), 1), size=size)
+        return [start + timedelta(seconds=int(s)) for s in seconds]
+
+    def _log(self, label, count, started):
+        print(f"  {label:<18} {count:>10,} rows  {time.time() - started:6.1f}s")
+
+    # ------------------------------------------------------------------
+    # Users and donors
+    # ------------------------------------------------------------------
+
+    def _user_row(self, user_id, role, district, created_at):
+        first = FIRST_NAMES[user_id % len(FIRST_NAMES)]
+        last = LAST_NAMES[(user_id // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return (
+            user_id, first, last, f"synthetic{user_id}@example.com", f"9{user_id:09d}",
+            self.password_hash, role, 'active', True, True, district, district, 'Kerala',
+            created_at
+        )
+
+    USER_COLUMNS = ['id', 'first_name', 'last_name', 'email', 'phone', 'password_hash', 'role',
+                    'status', 'is_phone_verified', 'is_email_verified', 'district', 'city',
+                    'state', 'created_at']
+
+    def generate_donors(self):
+        args, rng = self.args, self.rng
+        n = args.donors
+        first_user = self.loader.next_id('users')
+        first_donor = self.loader.next_id('donors')
+
+        district_idx = rng.choice(len(DISTRICTS), size=n, p=DISTRICT_P)
+        group_idx = rng.choice(len(BLOOD_GROUPS), size=n, p=BLOOD_GROUP_P)
+        lat = DISTRICT_CENTRES[district_idx, 0] + rng.normal(0, LOCATION_SPREAD, n)
+        lng = DISTRICT_CENTRES[district_idx, 1] + rng.normal(0, LOCATION_SPREAD, n)
+        created = self._timestamps(n, start=self.now - timedelta(days=3 * 365))
+        age_days = rng.integers(18 * 365, 60 * 365, size=n)
+        has_donated = rng.random(n) < 0.4
+        last_donation = rng.integers(1, 365, size=n)
+        available = rng.random(n) < 0.8
+        reliability = rng.beta(5, 2, size=n)
+        genders = _choice(rng, {'male': 0.55, 'female': 0.45}, n)
+
+        self.donor_ids = np.arange(first_donor, first_donor + n)
+        self.donor_user_ids = np.arange(first_user, first_user + n)
+        self.donor_district = district_idx
+        self.donor_group = group_idx
+
+        started = time.time()
+        users = self.loader.load('users', self.USER_COLUMNS, (
+            self._user_row(int(self.donor_user_ids[i]), 'donor', DISTRICTS[district_idx[i]], created[i])
+            for i in range(n)
+        ))
+        self._log('users (donors)', users, started)
+
+        started = time.time()
+        today = self.now.date()
+        donors = self.loader.load('donors', [
+            'id', 'user_id', 'date_of_birth', 'blood_group', 'gender', 'is_available',
+            'last_donation_date', 'reliability_score', 'location_lat', 'location_lng',
+            'created_at', 'updated_at'
+        ], (
+            (int(self.donor_ids[i]), int(self.donor_user_ids[i]),
+             today - timedelta(days=int(age_days[i])), BLOOD_GROUPS[group_idx[i]], genders[i],
+             bool(available[i]),
+             today - timedelta(days=int(last_donation[i])) if has_donated[i] else None,
+             round(float(reliability[i]), 3), round(float(lat[i]), 6), round(float(lng[i]), 6),
+             created[i], created[i])
+            for i in range(n)
+        ))
+        self._log('donors', donors, started)
+
+        # Donor pools by (district, blood group) for picking realistic matches
+        order = np.lexsort((group_idx, district_idx))
+        self.pools = {}
+        keys = district_idx[order] * len(BLOOD_GROUPS) + group_idx[order]
+        boundaries = np.flatnonzero(np.diff(keys)) + 1
+        for chunk in np.split(order, boundaries):
+            if len(chunk):
+                self.pools[(district_idx[chunk[0]], group_idx[chunk[0]])] = chunk
+
+    # ------------------------------------------------------------------
+    # Hospitals and their staff
+    # ------------------------------------------------------------------
+
+    def generate_hospitals(self):
+        args, rng = self.args, self.rng
+        n = args.hospitals
+        first_hospital = self.loader.next_id('hospitals')
+        first_user = self.loader.next_id('users')
+
+        district_idx = rng.choice(len(DISTRICTS), size=n, p=DISTRICT_P)
+        created = self._timestamps(n, start=self.now - timedelta(days=3 * 365), end=self.start)
+        self.hospital_ids = np.arange(first_hospital, first_hospital + n)
+        self.hospital_district = district_idx
+        self.staff_user_ids = np.arange(first_user, first_user + n)
+
+        started = time.time()
+        hospitals = self.loader.load('hospitals', [
+            'id', 'name', 'email', 'phone', 'address', 'district', 'city', 'state', 'pincode',
+            'license_number', 'is_verified', 'is_active', 'featured', 'created_at', 'updated_at'
+        ], (
+            (int(hid), f"{DISTRICTS[district_idx[i]]} General Hospital {hid}",
+             f"hospital{hid}@example.com", f"04{hid:08d}", f"{hid} Hospital Road",
+             DISTRICTS[district_idx[i]], DISTRICTS[district_idx[i]], 'Kerala',
+             f"{680000 + int(district_idx[i]) * 1000 + i % 1000}", f"SYN-LIC-{hid}",
+             True, True, bool(i % 25 == 0), created[i], created[i])
+            for i, hid in enumerate(self.hospital_ids)
+        ))
+        self._log('hospitals', hospitals, started)
+
+        started = time.time()
+        users = self.loader.load('users', self.USER_COLUMNS, (
+            self._user_row(int(uid), 'staff', DISTRICTS[district_idx[i]], created[i])
+            for i, uid in enumerate(self.staff_user_ids)
+        ))
+        self.loader.load('hospital_staff', ['user_id', 'hospital_id', 'status', 'created_at'], (
+            (int(uid), int(self.hospital_ids[i]), 'active', created[i])
+            for i, uid in enumerate(self.staff_user_ids)
+        ))
+        self._log('users (staff)', users, started)
+
+        self.hospitals_by_district = {
+            d: np.flatnonzero(district_idx == d) for d in range(len(DISTRICTS))
+        }
+
+    # ------------------------------------------------------------------
+    # Requests, matches, donations and notifications
+    # ------------------------------------------------------------------
+
+    def generate_requests(self):
+        args, rng = self.args, self.rng
+        n = args.requests
+        first_request = self.loader.next_id('blood_requests')
+
+        hospital_idx = rng.integers(0, len(self.hospital_ids), size=n)
+        group_idx = rng.choice(len(BLOOD_GROUPS), size=n, p=BLOOD_GROUP_P)
+        created = self._timestamps(n)
+        units = rng.integers(1, 5, size=n)
+        statuses = _choice(rng, REQUEST_STATUSES, n)
+        urgencies = _choice(rng, URGENCIES, n)
+
+        self.request_ids = np.arange(first_request, first_request + n)
+        self.request_hospital = hospital_idx
+        self.request_group = group_idx
+        self.request_created = created
+
+        started = time.time()
+        requests = self.loader.load('blood_requests', [
+            'id', 'seeker_id', 'hospital_id', 'patient_name', 'blood_group', 'units_required',
+            'urgency', 'status', 'contact_person', 'contact_phone', 'required_by',
+            'created_at', 'updated_at'
+        ], (
+            (int(rid), int(self.staff_user_ids[hospital_idx[i]]), int(self.hospital_ids[hospital_idx[i]]),
+             f"Patient {rid}", BLOOD_GROUPS[group_idx[i]], int(units[i]), urgencies[i], statuses[i],
+             f"Staff {hospital_idx[i]}", f"04{int(self.hospital_ids[hospital_idx[i]]):08d}",
+             created[i] + timedelta(days=2), created[i], created[i])
+            for i, rid in enumerate(self.request_ids)
+        ))
+        self._log('blood_requests', requests, started)
+
+    def generate_matches(self):
+        args, rng = self.args, self.rng
+        first_match = self.loader.next_id('matches')
+        first_donation = self.loader.next_id('donation_history')
+
+        matches, donations, notifications = [], [], []
+        match_id = first_match
+        donation_id = first_donation
+        for i, request_id in enumerate(self.request_ids):
+            district = self.hospital_district[self.request_hospital[i]]
+            group = self.request_group[i]
+            pool = self.pools.get((district, group))
+            if pool is None or not len(pool):
+                continue
+            k = min(len(pool), int(rng.poisson(args.matches_per_request)) or 1)
+            picked = rng.choice(pool, size=k, replace=False)
+            statuses = _choice(rng, MATCH_STATUSES, k)
+            hospital_id = int(self.hospital_ids[self.request_hospital[i]])
+            requested_at = self.request_created[i]
+
+            for donor_idx, status in zip(picked, statuses):
+                matched_at = requested_at + timedelta(minutes=int(rng.integers(1, 120)))
+                confirmed_at = matched_at + timedelta(hours=float(rng.exponential(6))) \
+                    if status in ('accepted', 'completed') else None
+                completed_at = confirmed_at + timedelta(hours=float(rng.exponential(24))) \
+                    if status == 'completed' and confirmed_at is not None else None
+                matches.append((match_id, int(request_id), int(self.donor_ids[donor_idx]), status,
+                                matched_at, confirmed_at, completed_at))
+
+                is_read = bool(rng.random() < 0.6)
+                notifications.append((
+                    int(self.donor_user_ids[donor_idx]), 'blood_request',
+                    f"Urgent: {BLOOD_GROUPS[group]} blood needed",
+                    f"A hospital in {DISTRICTS[district]} needs {BLOOD_GROUPS[group]} blood.",
+                    json.dumps({'request_id': int(request_id), 'match_id': match_id}),
+                    is_read, matched_at + timedelta(hours=1) if is_read else None, matched_at
+                ))
+
+                if completed_at:
+                    donations.append((donation_id, int(self.donor_ids[donor_idx]), int(request_id),
+                                      hospital_id, 1, completed_at, 'completed',
+                                      f"{DISTRICTS[district]}", completed_at, completed_at))
+                    donation_id += 1
+                match_id += 1
+
+        started = time.time()
+        count = self.loader.load('matches', [
+            'id', 'request_id', 'donor_id', 'status', 'matched_at', 'confirmed_at', 'completed_at'
+        ], matches)
+        self._log('matches', count, started)
+
+        # Extra donations outside the platform's requests, so history is not empty
+        extra = rng.poisson(args.history_per_donor, size=len(self.donor_ids))
+        for donor_idx in np.flatnonzero(extra):
+            district = self.donor_district[donor_idx]
+            hospitals = self.hospitals_by_district.get(district)
+            if hospitals is None or not len(hospitals):
+                hospitals = np.arange(len(self.hospital_ids))
+            for donated_at in self._timestamps(int(extra[donor_idx]), start=self.now - timedelta(days=3 * 365)):
+                status = 'cancelled' if rng.random() < 0.05 else 'completed'
+                donations.append((donation_id, int(self.donor_ids[donor_idx]), None,
+                                  int(self.hospital_ids[rng.choice(hospitals)]), 1, donated_at,
+                                  status, DISTRICTS[district], donated_at, donated_at))
+                donation_id += 1
+
+        started = time.time()
+        count = self.loader.load('donation_history', [
+            'id', 'donor_id', 'request_id', 'hospital_id', 'units', 'donation_date', 'status',
+            'location', 'created_at', 'updated_at'
+        ], donations)
+        self._log('donation_history', count, started)
+
+        # Partitions must exist for the whole window or rows fall into the default partition
+        ensure_partitions('notifications', months_ahead=self.args.days // 28 + 2, start=self.start)
+        started = time.time()
+        count = self.loader.load('notifications', [
+            'user_id', 'type', 'title', 'message', 'data', 'is_read', 'read_at', 'created_at'
+        ], notifications)
+        self._log('notifications', count, started)
+
+    def run(self):
+        self.generate_donors()
+        self.generate_hospitals()
+        self.generate_requests()
+        self.generate_matches()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Load a synthetic Kerala-scale dataset')
+    parser.add_argument('--donors', type=int, default=100000)
+    parser.add_argument('--hospitals', type=int, default=300)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--matches-per-request', type=float, default=5.0,
+                        help='Mean matches per request (Poisson)')
+    parser.add_argument('--history-per-donor', type=float, default=1.5,
+                        help='Mean extra past donations per donor (Poisson)')
+    parser.add_argument('--days', type=int, default=365,
+                        help='Spread requests and notifications over this many past days')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--method', choices=['copy', 'executemany'], default='copy')
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--password', default='Synthetic@123',
+                        help='Password shared by every synthetic account')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    app = create_app()
+    with app.app_context():
+        print(f"Generating synthetic data ({args.method}, seed {args.seed})")
+        started = time.time()
+        loader = BulkLoader(method=args.method, batch_size=args.batch_size)
+        try:
+            SyntheticDataset(loader, args).run()
+
+            # COPY bypasses the ORM listeners that maintain donor_features
+            step = time.time()
+            rows = feature_store.rebuild()
+            print(f"  {'donor_features':<18} {rows:>10,} rows  {time.time() - step:6.1f}s")
+
+            # ...and the ones that maintain the unread notification counters
+            step = time.time()
+            rows = notification_inbox.rebuild_counters()
+            print(f"  {'notification_counters':<18} {rows:>10,} rows  {time.time() - step:6.1f}s")
+
+            loader.analyze(['users', 'donors', 'hospitals', 'blood_requests', 'matches',
+                            'donation_history', 'notifications', 'donor_features',
+                            'notification_counters'])
+        finally:
+            loader.close()
+        print(f"Done in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
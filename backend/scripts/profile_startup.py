@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Report where application startup time goes
+
+Runs create_app() in a fresh interpreter under `python -X importtime` with
+STARTUP_PROFILE=1, then prints the slowest modules (cumulative and self
+import time), import time per top-level package, and the create_app phase
+breakdown.
+
+Usage: python scripts/profile_startup.py [--top 25] [--import-only] [--background]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        List of (module, self_us, cumulative_us) in import order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def print_table(title, rows, top):
+    print(f"\n{title}")
+    print("-" * 70)
+    for name, value_us in rows[:top]:
+        print(f"{value_us / 1000:10.1f}ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=25, help='Rows per table')
+    parser.add_argument('--import-only', action='store_true',
+                        help='Only import the app package, skip create_app()')
+    parser.add_argument('--background', action='store_true',
+                        help='Keep model preload on its startup thread (default: inline, so it is counted)')
+    args = parser.parse_args()
+
+    if args.import_only:
+        code = "import app"
+    else:
+        code = f"from app import create_app; create_app(background_init={args.background})"
+
+    env = dict(os.environ, STARTUP_PROFILE='1')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PARENT_DIR, env=env, capture_output=True, text=True
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        print(proc.stdout)
+        print("\n".join(l for l in proc.stderr.splitlines() if not l.startswith('import time:')))
+        sys.exit(proc.returncode)
+
+    # create_app prints its own phase table when STARTUP_PROFILE is set
+    phase_start = proc.stdout.find('[STARTUP] create_app phases:')
+    if phase_start != -1:
+        print(proc.stdout[phase_start:].rstrip())
+
+    by_package = defaultdict(int)
+    for module, self_us, _ in rows:
+        by_package[module.split('.')[0]] += self_us
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"\n{len(rows)} modules imported in {total_us / 1000:.1f}ms")
+
+    print_table("Slowest modules (cumulative, includes their imports)",
+                sorted(((m, c) for m, _, c in rows), key=lambda r: r[1], reverse=True), args.top)
+    print_table("Slowest modules (self)",
+                sorted(((m, s) for m, s, _ in rows), key=lambda r: r[1], reverse=True), args.top)
+    print_table("Import time per top-level package",
+                sorted(by_package.items(), key=lambda r: r[1], reverse=True), args.top)
+
+
+if __name__ == '__main__':
+    main()
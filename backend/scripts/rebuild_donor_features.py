@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""
+Rebuild the donor_features table from source tables
+
+Normally the table is maintained incrementally; run this after bulk imports
+or manual SQL edits that bypass the ORM.
+
+Usage: python scripts/rebuild_donor_features.py [donor_id ...]
+"""
+import sys
+import os
+
+# Add parent directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from app import create_app
+from app.ml.feature_store import feature_store
+
+
+def main():
+    donor_ids = [int(arg) for arg in sys.argv[1:]] or None
+    app = create_app()
+    with app.app_context():
+        rows = feature_store.rebuild(donor_ids)
+        print(f"Rebuilt feature rows for {rows} donors")
+
+
+if __name__ == '__main__':
+    main()
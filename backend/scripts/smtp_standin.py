@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Run the local SMTP stand-in and print each message it receives
+
+Point the backend at it instead of a real mail server:
+    SMTP_SERVER=127.0.0.1 SMTP_PORT=1025 SMTP_USE_TLS=false SMTP_USE_SSL=false
+
+Usage: python scripts/smtp_standin.py [--host 127.0.0.1] [--port 1025]
+"""
+import argparse
+import os
+import sys
+import time
+from email import message_from_bytes
+
+# Add backend directory to sys.path
+PARENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PARENT_DIR)
+
+from app.services.smtp_standin import SMTPStandIn
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SMTP stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+
+    server = SMTPStandIn(args.host, args.port).start()
+    print(f"📭 SMTP stand-in listening on {server.host}:{server.port} (Ctrl+C to stop)")
+    seen = 0
+    try:
+        while True:
+            while seen < len(server.messages):
+                received = server.messages[seen]
+                parsed = message_from_bytes(received['data'])
+                print(f"📨 #{seen + 1} {received['from']} -> {', '.join(received['rcpt'])}: {parsed['Subject']}")
+                seen += 1
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"\n{seen} messages received over {server.connections} connections")
+
+
+if __name__ == '__main__':
+    main()
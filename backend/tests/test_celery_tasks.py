@@ -0,0 +1,11 @@
+"""Every task module is registered with the Celery app a worker starts"""
+from app.tasks.celery_app import celery_app
+
+
+def test_task_modules_are_registered():
+    # What a worker does at startup: import the modules listed in `include`
+    celery_app.loader.import_default_modules()
+
+    assert 'app.tasks.email_tasks.broadcast_emergency' in celery_app.tasks
+    assert 'app.tasks.ml_tasks.cleanup_old_predictions' in celery_app.tasks
+    assert 'app.tasks.donor_matching.match_donors_for_request' in celery_app.tasks
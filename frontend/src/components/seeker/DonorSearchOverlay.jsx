@@ -2,6 +2,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Loader, Users, MapPin, CheckCircle, XCircle, RefreshCw, AlertTriangle, Radio } from 'lucide-react';
 import './DonorSearchOverlay.css';
+import { subscribeMatchEvents } from '../../services/matchEvents';
 
 const DonorSearchOverlay = ({ requestId, hospital, onComplete, onClose }) => {
   const [status, setStatus] = useState('running');
@@ -16,6 +17,7 @@ const DonorSearchOverlay = ({ requestId, hospital, onComplete, onClose }) => {
   const searchStartTime = useRef(Date.now());
   
   const POLL_INTERVAL = 2000; // 2 seconds
+  const FALLBACK_POLL_INTERVAL = 15000; // while the event stream is open
   const POLL_TIMEOUT = 60000; // 60 seconds max
   const MAX_SEARCH_TIME = 30000; // 30 seconds before offering options
 
@@ -24,6 +26,8 @@ const DonorSearchOverlay = ({ requestId, hospital, onComplete, onClose }) => {
     let interval = null;
     let timeoutTimer = null;
     let durationTimer = null;
+    let closeEvents = null;
+    let finished = false;
 
     // Update search duration every second
     durationTimer = setInterval(() => {
@@ -103,6 +107,8 @@ const DonorSearchOverlay = ({ requestId, hospital, onComplete, onClose }) => {
         if (data.status === 'done' || data.status === 'none_found' || data.status === 'failed') {
           if (interval) clearInterval(interval);
           if (timeoutTimer) clearTimeout(timeoutTimer);
+          if (closeEvents) closeEvents();
+          finished = true;
           
           // Announce completion
           if (data.status === 'done') {
@@ -134,15 +140,26 @@ const DonorSearchOverlay = ({ requestId, hospital, onComplete, onClose }) => {
       }
     };
 
-    // Start polling immediately
+    const setPollInterval = (ms) => {
+      if (finished || !mounted) return;
+      if (interval) clearInterval(interval);
+      interval = setInterval(poll, ms);
+    };
+
+    // Initial fetch, then one fetch per pushed event; polling is only a fallback
     poll();
-    interval = setInterval(poll, POLL_INTERVAL);
+    setPollInterval(POLL_INTERVAL);
+    closeEvents = subscribeMatchEvents(requestId, () => poll(), {
+      onOpen: () => setPollInterval(FALLBACK_POLL_INTERVAL),
+      onError: () => setPollInterval(POLL_INTERVAL),
+    });
 
     return () => {
       mounted = false;
       if (interval) clearInterval(interval);
       if (timeoutTimer) clearTimeout(timeoutTimer);
       if (durationTimer) clearInterval(durationTimer);
+      if (closeEvents) closeEvents();
     };
   }, [requestId, onComplete]);
 
@@ -1,8 +1,21 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getDonationDetails, generateCertificate } from '../../services/api';
+import { getDonationDetails, generateCertificate, getCertificateJob } from '../../services/api';
 import './donation-details.css';
 
+// The PDF is rendered in the background; poll its job until this donation's file is ready
+async function waitForCertificate(jobId, donationId, attempts = 30) {
+  for (let i = 0; i < attempts; i++) {
+    const { data } = await getCertificateJob(jobId);
+    const certificate = data.certificates.find((c) => String(c.donation_id) === String(donationId));
+    if (certificate?.status === 'failed') {
+      throw new Error(certificate.error || 'Certificate generation failed');
+    }
+    if (!certificate || certificate.status === 'done') return;
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+  }
+}
+
 /**
  * DonationDetails Component
  * 
@@ -43,6 +56,9 @@ export default function DonationDetails() {
         setToast('Generating certificate...');
         
         const response = await generateCertificate(id);
+        if (response.data.job_id) {
+          await waitForCertificate(response.data.job_id, id);
+        }
         
         // Update donation state with new certificate info
         setDonation({
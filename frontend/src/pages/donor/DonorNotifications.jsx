@@ -13,6 +13,9 @@ const DonorNotifications = () => {
   const [notifications, setNotifications] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
+  const [unreadCount, setUnreadCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadNotifications();
@@ -38,6 +41,7 @@ const DonorNotifications = () => {
             is_read: false,
             icon: payload.type === 'badge' ? '🏆' : payload.type === 'certificate' ? '📜' : '🩸'
           }, ...prev]);
+          setUnreadCount((count) => count + 1);
         } catch (error) {
           console.warn('[DonorNotifications] Error handling new notification:', error);
         }
@@ -75,23 +79,26 @@ const DonorNotifications = () => {
     };
   }, []);
 
+  // Normalize fields
+  const normalize = (n) => ({
+    id: n.id,
+    type: n.type || 'request',
+    title: n.title || (n.type === 'request' ? 'New Donation Request' : 'Notification'),
+    message: n.message || 'You have a new update.',
+    time: n.created_at ? new Date(n.created_at).toLocaleString() : '',
+    is_read: !!n.read,
+    icon: n.type === 'badge' ? '🏆' : n.type === 'certificate' ? '📜' : '🩸'
+  });
+
   async function loadNotifications() {
     setLoading(true);
     setError("");
     try {
       const res = await getDonorNotifications();
       const list = res?.data?.notifications || [];
-      // Normalize fields
-      const mapped = list.map(n => ({
-        id: n.id,
-        type: n.type || 'request',
-        title: n.title || (n.type === 'request' ? 'New Donation Request' : 'Notification'),
-        message: n.message || 'You have a new update.',
-        time: n.created_at ? new Date(n.created_at).toLocaleString() : '',
-        is_read: !!n.read,
-        icon: n.type === 'badge' ? '🏆' : n.type === 'certificate' ? '📜' : '🩸'
-      }));
-      setNotifications(mapped);
+      setNotifications(list.map(normalize));
+      setUnreadCount(res?.data?.unread_count || 0);
+      setNextCursor(res?.data?.next_cursor || null);
     } catch (e) {
       console.error('Failed to load notifications', e);
       setError('Failed to load notifications. Please try again later.');
@@ -100,12 +107,29 @@ const DonorNotifications = () => {
     }
   }
 
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await getDonorNotifications({ cursor: nextCursor });
+      const list = res?.data?.notifications || [];
+      setNotifications((prev) => [...prev, ...list.map(normalize)]);
+      setUnreadCount(res?.data?.unread_count || 0);
+      setNextCursor(res?.data?.next_cursor || null);
+    } catch (e) {
+      console.warn('Failed to load more notifications', e);
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   async function markAsRead(id) {
     try {
-      await markNotificationRead(id);
+      const res = await markNotificationRead(id);
       setNotifications(notifications.map(n => 
         n.id === id ? { ...n, is_read: true } : n
       ));
+      if (typeof res?.data?.unread_count === 'number') setUnreadCount(res.data.unread_count);
     } catch (e) {
       console.warn('Failed to mark as read');
     }
@@ -115,8 +139,6 @@ const DonorNotifications = () => {
     setNotifications(notifications.filter(n => n.id !== id));
   }
 
-  const unreadCount = notifications.filter(n => !n.is_read).length;
-
   return (
     <div className="donor-notifications">
       <header className="page-header">
@@ -199,6 +221,13 @@ const DonorNotifications = () => {
                 </button>
               </div>
             )}
+            {nextCursor && (
+              <div className="notif-footer-actions">
+                <button className="btn-mark-all" onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load older notifications'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
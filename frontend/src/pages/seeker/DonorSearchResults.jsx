@@ -12,6 +12,7 @@ import SeekerSidebar from '../../components/seeker/SeekerSidebar';
 import 'leaflet/dist/leaflet.css';
 import L from 'leaflet';
 import './DonorSearchResults.css';
+import { subscribeMatchEvents } from '../../services/matchEvents';
 
 // Fix Leaflet default marker icon
 delete L.Icon.Default.prototype._getIconUrl;
@@ -39,6 +40,7 @@ const DonorSearchResults = () => {
   const mapRef = useRef(null);
   
   const POLL_INTERVAL = 2000;
+  const FALLBACK_POLL_INTERVAL = 15000; // while the event stream is open
   const POLL_TIMEOUT = 60000;
 
   useEffect(() => {
@@ -46,6 +48,8 @@ const DonorSearchResults = () => {
     let interval = null;
     let timeoutTimer = null;
     let durationTimer = null;
+    let closeEvents = null;
+    let finished = false;
     let currentController = null;
 
     // Update search duration
@@ -135,6 +139,8 @@ const DonorSearchResults = () => {
         if (data.status === 'done' || data.status === 'none_found' || data.status === 'failed') {
           if (interval) clearInterval(interval);
           if (timeoutTimer) clearTimeout(timeoutTimer);
+          if (closeEvents) closeEvents();
+          finished = true;
           
           if (data.status === 'done') {
             announceToScreenReader(`Search complete. Found ${data.found_count} compatible donors.`);
@@ -155,9 +161,19 @@ const DonorSearchResults = () => {
       }
     };
 
-    // Start polling
+    const setPollInterval = (ms) => {
+      if (finished || !mounted) return;
+      if (interval) clearInterval(interval);
+      interval = setInterval(poll, ms);
+    };
+
+    // Initial fetch, then one fetch per pushed event; polling is only a fallback
     poll();
-    interval = setInterval(poll, POLL_INTERVAL);
+    setPollInterval(POLL_INTERVAL);
+    closeEvents = subscribeMatchEvents(requestId, () => poll(), {
+      onOpen: () => setPollInterval(FALLBACK_POLL_INTERVAL),
+      onError: () => setPollInterval(POLL_INTERVAL),
+    });
 
     // Cleanup function
     return () => {
@@ -172,6 +188,7 @@ const DonorSearchResults = () => {
       if (interval) clearInterval(interval);
       if (timeoutTimer) clearTimeout(timeoutTimer);
       if (durationTimer) clearInterval(durationTimer);
+      if (closeEvents) closeEvents();
     };
   }, [requestId]);
 
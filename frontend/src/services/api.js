@@ -301,6 +301,10 @@ export async function generateCertificate(donationId) {
   return api.post(`/api/donors/donations/${donationId}/certificate`);
 }
 
+export async function getCertificateJob(jobId) {
+  return api.get(`/api/donors/certificates/jobs/${jobId}`);
+}
+
 export async function respondToMatch(matchId, action) {
   return api.post("/api/donors/respond", { match_id: matchId, action });
 }
@@ -313,8 +317,13 @@ export async function getDonorDonations() {
   return api.get("/api/donors/donations");
 }
 
-export async function getDonorNotifications() {
-  return api.get("/api/donors/notifications");
+export async function getDonorNotifications(params = {}) {
+  // params: { limit, cursor, unread } - pass the previous page's next_cursor to load more
+  return api.get("/api/donors/notifications", { params });
+}
+
+export async function getUnreadNotificationCount() {
+  return api.get("/api/donors/notifications/unread-count");
 }
 
 export async function markNotificationRead(notificationId) {
@@ -0,0 +1,57 @@
+// Live donor-matching progress over Server-Sent Events
+// The server pushes an event whenever the search moves on (candidates found,
+// scored, donors notified, search completed/expanded, donor responses), so
+// pages fetch match-status once per event instead of polling every 2 seconds.
+
+const EVENT_NAMES = [
+  'search_started',
+  'candidates_found',
+  'scored',
+  'donor_notified',
+  'search_completed',
+  'search_failed',
+  'search_expanded',
+  'donor_accepted',
+  'donor_declined',
+];
+
+/**
+ * Subscribe to match events for a blood request.
+ * EventSource reconnects by itself and resumes after the last event id.
+ *
+ * @param {number|string} requestId
+ * @param {(event: {id, event, data, at}) => void} onEvent
+ * @param {{onOpen?: Function, onError?: Function}} options
+ * @returns {Function|null} close function, or null if SSE is unavailable
+ */
+export function subscribeMatchEvents(requestId, onEvent, { onOpen, onError } = {}) {
+  if (typeof window === 'undefined' || typeof window.EventSource === 'undefined') return null;
+
+  // EventSource cannot send an Authorization header; the endpoint accepts ?jwt=
+  const token = localStorage.getItem('seeker_token') || localStorage.getItem('access_token');
+  const qs = token ? `?jwt=${encodeURIComponent(token)}` : '';
+
+  let source;
+  try {
+    source = new EventSource(`/api/requests/${requestId}/match-events${qs}`);
+  } catch (error) {
+    console.warn('[match-events] EventSource unavailable:', error);
+    return null;
+  }
+
+  const handle = (message) => {
+    try {
+      onEvent(JSON.parse(message.data));
+    } catch (error) {
+      console.warn('[match-events] Bad event payload:', error);
+    }
+  };
+  EVENT_NAMES.forEach((name) => source.addEventListener(name, handle));
+  source.onopen = () => onOpen && onOpen();
+  source.onerror = () => onError && onError(source.readyState === EventSource.CLOSED);
+
+  return () => {
+    EVENT_NAMES.forEach((name) => source.removeEventListener(name, handle));
+    source.close();
+  };
+}